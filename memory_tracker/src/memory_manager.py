@@ -1,10 +1,31 @@
+import functools
+import threading
+
+
+def synchronized(method):
+    """Runs method while holding the instance's re-entrant lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _moved_units(moves):
+    return sum(block['size'] for block, _ in moves)
+
+
 class MemoryManager:
     def __init__(self, total_memory):
+        self.lock = threading.RLock()  # Simulation threads mutate while the GUI reads
         self.total_memory = total_memory
         self.used_memory = 0
         self.memory_blocks = []  # List of memory segments
         self.processes = {}      # Dictionary to track processes and their memory segments
+        self.auto_compact = False  # Compact and retry once when an allocation fails
+        self.compaction_threshold = None  # Compact after a free leaves fragmentation above this %
 
+    @synchronized
     def allocate_memory(self, process_id, size):
         """
         Allocates memory for a process using best-fit algorithm
@@ -25,6 +46,9 @@ class MemoryManager:
                     best_block_size = block['size']
                     best_block_index = i
 
+        if best_block is None and self.auto_compact and self.compact(target=size):
+            return self.allocate_memory(process_id, size)
+
         if best_block is None:
             # No suitable block found, create new if possible
             if not self.memory_blocks:
@@ -60,6 +84,7 @@ class MemoryManager:
         self.used_memory += size
         return best_block
 
+    @synchronized
     def free_memory(self, process_id):
         """
         Frees all memory segments allocated to a process
@@ -79,6 +104,9 @@ class MemoryManager:
         
         # Merge adjacent free blocks
         self._merge_free_blocks()
+        if (self.compaction_threshold is not None and
+                self.get_fragmentation_info()['fragmentation_percentage'] > self.compaction_threshold):
+            self.compact()
         return freed_memory
 
     def _merge_free_blocks(self):
@@ -94,6 +122,120 @@ class MemoryManager:
             else:
                 i += 1
 
+    @synchronized
+    def compact(self, mode='auto', target=None):
+        """
+        Relocates used blocks to reduce external fragmentation
+        'slide' packs every used block towards the start of memory, 'fill'
+        opens a single free block of target units (default: all free memory)
+        by moving the cheapest run of blocks into other free blocks, and
+        'auto' picks whichever of the two moves fewer units
+        Returns the number of memory units moved
+        """
+        if mode not in ('slide', 'fill', 'auto'):
+            raise ValueError(f"Unknown compaction mode: {mode}")
+        plans = []
+        if mode in ('slide', 'auto'):
+            plans.append(self._plan_slide())
+        if mode in ('fill', 'auto'):
+            free_sizes = [block['size'] for block in self.memory_blocks if not block['used']]
+            if target is None:
+                target = sum(free_sizes)
+            moves = self._plan_fill(target) if max(free_sizes, default=0) < target else []
+            if moves is not None:
+                plans.append(moves)
+        if not plans:
+            return 0
+        # Ties go to the slide, which also gathers every free block into one
+        return self._apply_moves(min(plans, key=_moved_units))
+
+    def _plan_slide(self):
+        """(block, new_start) moves packing every used block towards address 0"""
+        moves = []
+        cursor = 0
+        for block in self.memory_blocks:
+            if not block['used']:
+                continue
+            if block['start'] != cursor:
+                moves.append((block, cursor))
+            cursor += block['size']
+        return moves
+
+    def _plan_fill(self, target):
+        """
+        (block, new_start) moves that open one free block of target units
+        Each window of target units starting at a free block is scored by the
+        used units inside it; windows are tried cheapest first and the first
+        whose blocks all fit (best fit, largest first) into free space outside
+        it wins. Returns None if no window can be cleared
+        """
+        blocks = self.memory_blocks
+        span = blocks[-1]['start'] + blocks[-1]['size'] if blocks else 0
+        candidates = []
+        for first, hole in enumerate(blocks):
+            if hole['used'] or hole['start'] + target > span:
+                continue
+            window_end = hole['start'] + target
+            last = first
+            cost = 0
+            while last < len(blocks) and blocks[last]['start'] < window_end:
+                if blocks[last]['used']:
+                    cost += blocks[last]['size']
+                last += 1
+            candidates.append((cost, hole['start'], first, last))
+        candidates.sort(key=lambda candidate: candidate[:2])
+
+        for cost, window_start, first, last in candidates:
+            if cost == 0:
+                return []
+            evicted = [block for block in blocks[first:last] if block['used']]
+            window_end = max(window_start + target, evicted[-1]['start'] + evicted[-1]['size'])
+            if window_end > span:
+                continue
+            holes = []
+            for block in blocks:
+                if block['used']:
+                    continue
+                start, end = block['start'], block['start'] + block['size']
+                if start < window_start:
+                    holes.append([start, min(end, window_start) - start])
+                if end > window_end:
+                    holes.append([max(start, window_end), end - max(start, window_end)])
+
+            moves = []
+            for block in sorted(evicted, key=lambda block: -block['size']):
+                fits = [hole for hole in holes if hole[1] >= block['size']]
+                if not fits:
+                    break
+                hole = min(fits, key=lambda hole: hole[1])
+                moves.append((block, hole[0]))
+                hole[0] += block['size']
+                hole[1] -= block['size']
+            else:
+                return moves
+        return None
+
+    def _apply_moves(self, moves):
+        """Moves blocks to their new starts and rebuilds the free blocks between them"""
+        if not moves:
+            return 0
+        span = self.memory_blocks[-1]['start'] + self.memory_blocks[-1]['size']
+        for block, new_start in moves:
+            block['start'] = new_start
+        blocks = []
+        cursor = 0
+        for block in sorted((block for block in self.memory_blocks if block['used']),
+                            key=lambda block: block['start']):
+            if block['start'] > cursor:
+                blocks.append({'start': cursor, 'size': block['start'] - cursor, 'process_id': None, 'used': False})
+            blocks.append(block)
+            cursor = block['start'] + block['size']
+        if cursor < span:
+            blocks.append({'start': cursor, 'size': span - cursor, 'process_id': None, 'used': False})
+        self.memory_blocks = blocks
+        return _moved_units(moves)
+
+    @synchronized
     def get_fragmentation_info(self):
         """
         Returns information about memory fragmentation
@@ -110,8 +252,15 @@ class MemoryManager:
             'fragmentation_percentage': ((total_free - largest_free) / self.total_memory * 100) if total_free > 0 else 0
         }
 
+    @synchronized
+    def reset(self):
+        self.memory_blocks.clear()
+        self.processes.clear()
+        self.used_memory = 0
+
+    @synchronized
     def get_memory_map(self):
         """
-        Returns the current memory map for visualization
+        Returns a consistent copy of the current memory map for visualization
         """
-        return self.memory_blocks
+        return [dict(block) for block in self.memory_blocks]
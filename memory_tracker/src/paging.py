@@ -1,11 +1,16 @@
-from memory_manager import MemoryManager
+import numpy as np
+from memory_manager import MemoryManager, synchronized
 
 class PagingMemoryManager(MemoryManager):
     def __init__(self, total_memory, page_size):
         super().__init__(total_memory)
         self.page_size = page_size
+        # Physical frame table (frame -> owning pid), not a per-process
+        # virtual page table; memory_tracker runs with src/ on sys.path and
+        # cannot import modules.page_table.MultiLevelPageTable from the root
         self.pages = [None] * (total_memory // page_size)
 
+    @synchronized
     def allocate_memory(self, process):
         pages_needed = -(-process.size // self.page_size)
         allocated_pages = []
@@ -23,8 +28,29 @@ class PagingMemoryManager(MemoryManager):
         self.used_memory += process.size
         return allocated_pages
 
+    @synchronized
     def free_memory(self, process):
         for i in range(len(self.pages)):
             if self.pages[i] == process.pid:
                 self.pages[i] = None
         self.used_memory -= process.size
+
+    @synchronized
+    def page_table(self, pid):
+        """Frame numbers backing each virtual page of a process, in page order"""
+        return [frame for frame, owner in enumerate(self.pages) if owner == pid]
+
+    @synchronized
+    def translate(self, addresses, pid):
+        """
+        Translates a batch of virtual addresses of a process
+        Returns (physical addresses, fault mask); faulting addresses map to -1
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        frames = np.array(self.page_table(pid), dtype=np.int64)
+        pages, offsets = np.divmod(addresses, self.page_size)
+        faults = (addresses < 0) | (pages >= len(frames))
+        if not len(frames):
+            return np.full(len(addresses), -1, dtype=np.int64), faults
+        physical = frames[np.where(faults, 0, pages)] * self.page_size + offsets
+        return np.where(faults, -1, physical), faults
@@ -1,19 +1,50 @@
-from memory_manager import MemoryManager
+import numpy as np
+from memory_manager import MemoryManager, synchronized
 
 class SegmentationMemoryManager(MemoryManager):
     def __init__(self, total_memory):
         super().__init__(total_memory)
         self.segments = []
 
+    def _find_base(self, size):
+        """Lowest address with size contiguous free units, or None"""
+        cursor = 0
+        for segment in sorted(self.segments, key=lambda s: s['base']):
+            if segment['base'] - cursor >= size:
+                return cursor
+            cursor = max(cursor, segment['base'] + segment['size'])
+        return cursor if self.total_memory - cursor >= size else None
+
+    @synchronized
     def allocate_memory(self, process):
         if self.used_memory + process.size > self.total_memory:
             return False  # Not enough memory
 
-        segment = {'pid': process.pid, 'size': process.size}
+        base = self._find_base(process.size)
+        if base is None:
+            return False  # No hole large enough
+
+        segment = {'pid': process.pid, 'size': process.size, 'base': base}
         self.segments.append(segment)
         self.used_memory += process.size
         return segment
 
+    @synchronized
     def free_memory(self, process):
         self.segments = [s for s in self.segments if s['pid'] != process.pid]
         self.used_memory -= process.size
+
+    @synchronized
+    def translate(self, addresses, pid, segment=0):
+        """
+        Translates a batch of offsets into one of a process's segments
+        (numbered in allocation order) using its base and limit
+        Returns (physical addresses, fault mask); faulting addresses map to -1
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        owned = [s for s in self.segments if s['pid'] == pid]
+        if segment >= len(owned):
+            return np.full(len(addresses), -1, dtype=np.int64), np.ones(len(addresses), dtype=bool)
+        base, limit = owned[segment]['base'], owned[segment]['size']
+        faults = (addresses < 0) | (addresses >= limit)
+        return np.where(faults, -1, addresses + base), faults
@@ -135,9 +135,7 @@ class MemoryVisualizerGUI:
         
     def _clear_simulation(self):
         # Reset memory manager state
-        self.memory_manager.memory_blocks.clear()
-        self.memory_manager.processes.clear()
-        self.memory_manager.used_memory = 0
+        self.memory_manager.reset()
         
     def update_visualization(self):
         if self.simulation_running:
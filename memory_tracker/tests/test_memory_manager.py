@@ -1,3 +1,4 @@
+import threading
 import unittest
 from src.memory_manager import MemoryManager
 class TestMemoryManager(unittest.TestCase):
@@ -30,6 +31,71 @@ class TestMemoryManager(unittest.TestCase):
         # frag_info = manager.get_fragmentation_info()
         # self.assertGreater(frag_info['fragmentation_percentage'], 0)  # Now fragmentation should exist
 
+    def test_compact(self):
+        manager = MemoryManager(100)
+        manager.allocate_memory("P1", 60)
+        manager.free_memory("P1")
+        manager.allocate_memory("P2", 20)
+        manager.allocate_memory("P3", 30)
+        manager.free_memory("P2")  # Leaves holes at 0-19 and 50-59
+
+        moved = manager.compact()
+        self.assertEqual(moved, 30)
+        self.assertEqual(manager.processes["P3"][0]['start'], 0)
+        mem_map = manager.get_memory_map()
+        self.assertEqual([(b['start'], b['size'], b['used']) for b in mem_map],
+                         [(0, 30, True), (30, 30, False)])
+
+    def test_auto_compact_on_failure(self):
+        manager = MemoryManager(100)
+        manager.auto_compact = True
+        manager.allocate_memory("P1", 60)
+        manager.free_memory("P1")
+        manager.allocate_memory("P2", 20)
+        manager.allocate_memory("P3", 20)
+        manager.free_memory("P2")
+        block = manager.allocate_memory("P4", 30)
+        self.assertIsNotNone(block)
+        self.assertEqual(block['start'], 20)
+
+    def _holey_manager(self):
+        # Free 0-9, A 10-59, free 60-69, B 70-74, free 75-99
+        manager = MemoryManager(100)
+        manager.memory_blocks.append({'start': 0, 'size': 100, 'process_id': None, 'used': False})
+        for process_id, size in [("X", 10), ("A", 50), ("Y", 10), ("B", 5)]:
+            manager.allocate_memory(process_id, size)
+        manager.free_memory("X")
+        return manager
+
+    def test_fill_moves_fewer_units_than_slide(self):
+        manager = self._holey_manager()
+        manager.free_memory("Y")
+        manager.auto_compact = True
+        block = manager.allocate_memory("P", 35)
+        # Sliding would copy A and B (55 units); moving B past the window copies 5
+        self.assertEqual(block['start'], 60)
+        self.assertEqual(manager.processes["B"][0]['start'], 95)
+        self.assertEqual(manager.processes["A"][0]['start'], 10)
+        self.assertEqual(sum(b['size'] for b in manager.get_memory_map()), 100)
+
+    def test_compact_modes(self):
+        manager = self._holey_manager()
+        manager.free_memory("Y")
+        self.assertEqual(manager.compact(mode='fill', target=35), 5)
+        manager = self._holey_manager()
+        manager.free_memory("Y")
+        self.assertEqual(manager.compact(mode='slide'), 55)
+        with self.assertRaises(ValueError):
+            manager.compact(mode='shuffle')
+
+    def test_compaction_threshold(self):
+        manager = self._holey_manager()
+        manager.compaction_threshold = 10
+        manager.free_memory("Y")  # 45 free, largest 25: 20% fragmented
+        info = manager.get_fragmentation_info()
+        self.assertEqual(info['fragmentation_percentage'], 0)
+        self.assertEqual(info['largest_free_block'], 45)
+
     # def test_memory_map(self):
     #     manager = MemoryManager(100)
     #     manager.allocate_memory("P1", 30)
@@ -41,5 +107,24 @@ class TestMemoryManager(unittest.TestCase):
     #     # Now we expect two blocks: one free (30) and one allocated (40)
     #     self.assertEqual(len(mem_map), 2)  
 
+    def test_concurrent_allocate_and_free(self):
+        manager = MemoryManager(10000)
+
+        def worker(prefix):
+            for i in range(200):
+                manager.allocate_memory(f"{prefix}{i}", 5)
+                if i % 2:
+                    manager.free_memory(f"{prefix}{i - 1}")
+                manager.get_memory_map()
+
+        threads = [threading.Thread(target=worker, args=(prefix,)) for prefix in "ABCD"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        used = sum(block['size'] for block in manager.get_memory_map() if block['used'])
+        self.assertEqual(used, manager.used_memory)
+        self.assertEqual(used, 5 * sum(len(blocks) for blocks in manager.processes.values()))
+
 if __name__ == '__main__':
     unittest.main()
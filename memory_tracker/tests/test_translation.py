@@ -0,0 +1,65 @@
+import os
+import sys
+import threading
+import unittest
+# paging.py and segmentation.py import memory_manager as a top-level module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from paging import PagingMemoryManager
+from segmentation import SegmentationMemoryManager
+
+
+class FakeProcess:
+    def __init__(self, pid, size):
+        self.pid = pid
+        self.size = size
+
+
+class TestTranslation(unittest.TestCase):
+    def test_paging_translate(self):
+        manager = PagingMemoryManager(1024, 64)
+        manager.allocate_memory(FakeProcess(1, 64))
+        manager.allocate_memory(FakeProcess(2, 100))
+        physical, faults = manager.translate([0, 70, 127, 128], 2)
+        self.assertEqual(physical.tolist(), [64, 134, 191, -1])
+        self.assertEqual(faults.tolist(), [False, False, False, True])
+        self.assertTrue(manager.translate([0], 3)[1].all())
+
+    def test_segmentation_translate(self):
+        manager = SegmentationMemoryManager(100)
+        first = FakeProcess(1, 30)
+        manager.allocate_memory(first)
+        manager.allocate_memory(FakeProcess(2, 40))
+        manager.free_memory(first)
+        self.assertEqual(manager.allocate_memory(FakeProcess(3, 20))['base'], 0)
+        physical, faults = manager.translate([0, 39, 40], 2)
+        self.assertEqual(physical.tolist(), [30, 69, -1])
+        self.assertEqual(faults.tolist(), [False, False, True])
+        self.assertFalse(manager.allocate_memory(FakeProcess(4, 35)))
+
+    def test_concurrent_paging_keeps_frames_consistent(self):
+        manager = PagingMemoryManager(64 * 500, 64)
+
+        def worker(offset):
+            for i in range(100):
+                manager.allocate_memory(FakeProcess(offset + i, 100))
+                if i % 2:
+                    manager.free_memory(FakeProcess(offset + i - 1, 100))
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(offset,)) for offset in (1000, 2000, 3000, 4000)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        owners = [owner for owner in manager.pages if owner is not None]
+        self.assertEqual(len(owners), 2 * 4 * 50)
+        self.assertTrue(all(owners.count(pid) == 2 for pid in set(owners)))
+        self.assertEqual(manager.used_memory, 100 * 4 * 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import argparse
+import itertools
+import threading
+import time
+import numpy as np
+from .memory_simulator import MemorySimulator, AllocationStrategy
+
+
+class Arena:
+    """A MemorySimulator for one slice of the address space, behind its own lock"""
+
+    def __init__(self, index, base, size, page_size=64, storage="compact"):
+        self.index = index
+        self.base = base
+        self.size = size
+        self.simulator = MemorySimulator(size, page_size, storage=storage)
+        self.lock = threading.Lock()
+        # Only updated while the lock is held
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_time = 0.0
+
+    def __enter__(self):
+        if not self.lock.acquire(blocking=False):
+            started = time.perf_counter()
+            self.lock.acquire()
+            self.wait_time += time.perf_counter() - started
+            self.contended += 1
+        self.acquisitions += 1
+        return self.simulator
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+
+
+class ArenaAllocator:
+    """Thread-safe allocator that splits memory into independently locked arenas.
+
+    Each thread is bound round-robin to a home arena on first use, as
+    per-thread arenas are in malloc implementations; requests that do not fit
+    there spill over to the other arenas in turn. Threads working in
+    different arenas never wait on each other. With num_arenas=1 this is
+    simply a locked MemorySimulator.
+    """
+
+    def __init__(self, total_memory, num_arenas=4, page_size=64,
+                 strategy=AllocationStrategy.FIRST_FIT, storage="compact"):
+        if not 0 < num_arenas <= total_memory:
+            raise ValueError("num_arenas must be between 1 and total_memory")
+        self.total_memory = total_memory
+        self.page_size = page_size
+        arena_size = total_memory // num_arenas
+        self.arenas = []
+        for index in range(num_arenas):
+            base = index * arena_size
+            size = total_memory - base if index == num_arenas - 1 else arena_size
+            arena = Arena(index, base, size, page_size, storage)
+            arena.simulator.set_strategy(strategy)
+            self.arenas.append(arena)
+        self._owners = {}  # process_id -> Arena (or a reservation token)
+        self._local = threading.local()
+        self._next_home = itertools.count()
+
+    def home_arena(self):
+        index = getattr(self._local, 'arena', None)
+        if index is None:
+            index = self._local.arena = next(self._next_home) % len(self.arenas)
+        return self.arenas[index]
+
+    def _allocate(self, process_id, size, paged):
+        # setdefault is atomic, so two threads can't both claim one process id
+        token = object()
+        if self._owners.setdefault(process_id, token) is not token:
+            return False, "Process already exists"
+
+        home = self.home_arena().index
+        message = "No suitable block found"
+        for offset in range(len(self.arenas)):
+            arena = self.arenas[(home + offset) % len(self.arenas)]
+            with arena as simulator:
+                if paged:
+                    success, message = simulator.allocate_pages(process_id, size)
+                else:
+                    success, message = simulator.allocate_segment(process_id, size)
+            if success:
+                self._owners[process_id] = arena
+                return True, f"{message} in arena {arena.index}"
+        del self._owners[process_id]
+        return False, message
+
+    def allocate_segment(self, process_id, size):
+        return self._allocate(process_id, size, paged=False)
+
+    def allocate_pages(self, process_id, size):
+        return self._allocate(process_id, size, paged=True)
+
+    def deallocate(self, process_id):
+        arena = self._owners.get(process_id)
+        if not isinstance(arena, Arena):
+            return False, "Process not found"
+        with arena as simulator:
+            result = simulator.deallocate(process_id)
+        self._owners.pop(process_id, None)
+        return result
+
+    def locate(self, process_id):
+        """(arena index, allocation in global addresses) or None"""
+        arena = self._owners.get(process_id)
+        if not isinstance(arena, Arena):
+            return None
+        with arena.lock:
+            allocation = arena.simulator.processes[process_id]
+        if isinstance(allocation, tuple):
+            return arena.index, (arena.base + allocation[0], allocation[1])
+        return arena.index, [(arena.base + start, size) for start, size in allocation]
+
+    def get_memory_state(self):
+        states = []
+        for arena in self.arenas:
+            with arena.lock:
+                states.append(np.array(arena.simulator.get_memory_state()))
+        return np.concatenate(states)
+
+    def get_utilization(self):
+        return sum(self._used_units(arena) for arena in self.arenas) / self.total_memory * 100
+
+    def _used_units(self, arena):
+        # Reporting takes the lock directly so it doesn't skew the statistics
+        with arena.lock:
+            return arena.simulator.get_utilization() * arena.size / 100
+
+    def contention_report(self):
+        """Per-arena lock statistics plus how evenly work and memory are spread.
+
+        Imbalance figures are max / mean across arenas, so 1.0 is a perfectly
+        even spread and num_arenas means everything landed in one arena.
+        """
+        arenas = []
+        for arena in self.arenas:
+            used = self._used_units(arena)
+            arenas.append({
+                'arena': arena.index,
+                'acquisitions': arena.acquisitions,
+                'contended': arena.contended,
+                'wait_time': arena.wait_time,
+                'used_units': used,
+                'processes': sum(1 for owner in list(self._owners.values()) if owner is arena),
+            })
+
+        def imbalance(key):
+            values = [row[key] for row in arenas]
+            mean = sum(values) / len(values)
+            return max(values) / mean if mean else 1.0
+
+        acquisitions = sum(row['acquisitions'] for row in arenas)
+        contended = sum(row['contended'] for row in arenas)
+        return {
+            'arenas': arenas,
+            'acquisitions': acquisitions,
+            'contended': contended,
+            'contention_rate': (contended / acquisitions * 100) if acquisitions else 0.0,
+            'wait_time': sum(row['wait_time'] for row in arenas),
+            'operation_imbalance': imbalance('acquisitions'),
+            'memory_imbalance': imbalance('used_units'),
+        }
+
+
+def stress(allocator, num_threads, ops_per_thread, max_size=64, seed=None):
+    """Runs num_threads threads of random allocate/free traffic; returns timing plus the contention report"""
+    seeds = np.random.SeedSequence(seed).spawn(num_threads)
+
+    def worker(thread_index):
+        rng = np.random.default_rng(seeds[thread_index])
+        sizes = rng.integers(1, max_size + 1, ops_per_thread).tolist()
+        frees = (rng.random(ops_per_thread) < 0.5).tolist()
+        live = []
+        first_pid = thread_index * ops_per_thread + 1
+        for step in range(ops_per_thread):
+            if frees[step] and live:
+                allocator.deallocate(live.pop(0))
+            else:
+                pid = first_pid + step
+                if allocator.allocate_segment(pid, sizes[step])[0]:
+                    live.append(pid)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(num_threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    report = allocator.contention_report()
+    report['threads'] = num_threads
+    report['elapsed'] = elapsed
+    report['ops_per_second'] = num_threads * ops_per_thread / elapsed if elapsed else 0.0
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure arena lock contention as thread count grows")
+    parser.add_argument('--memory', type=int, default=1 << 20, help="Total memory units")
+    parser.add_argument('--arenas', type=int, default=4)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--ops', type=int, default=20000, help="Operations per thread")
+    parser.add_argument('--max-size', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    print(f"{'threads':>7}  {'ops/s':>10}  {'contended %':>11}  {'wait s':>8}  {'op imbal':>8}  {'mem imbal':>9}")
+    for num_threads in args.threads:
+        allocator = ArenaAllocator(args.memory, args.arenas)
+        report = stress(allocator, num_threads, args.ops, args.max_size, args.seed)
+        print(f"{num_threads:>7}  {report['ops_per_second']:>10.0f}  {report['contention_rate']:>11.2f}  "
+              f"{report['wait_time']:>8.3f}  {report['operation_imbalance']:>8.2f}  {report['memory_imbalance']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
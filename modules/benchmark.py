@@ -0,0 +1,258 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+from .memory_simulator import MemorySimulator, AllocationStrategy
+
+DEFAULT_SIZES = (1_000, 100_000, 10_000_000, 100_000_000)
+DEFAULT_FRAGMENTATION = (0.0, 0.5, 0.9)
+BLOCK_SIZE = 64
+PAGE_SIZE = 64
+# Prefill spans the first PREFILL_FRACTION of memory, leaving the rest as one
+# free region so allocations at fragmentation 0.0 succeed rather than being
+# rejected. Past these block counts the blocks grow instead: 32K owners keep
+# compact storage at 2 bytes per unit (200 MB at 100M units); MemoryManager
+# scans its whole block list per call, so it gets fewer.
+PREFILL_FRACTION = 0.5
+# Metric queries are O(1) reads, so each measurement makes this many times
+# more calls than it makes allocations to reach a stable duration
+QUERY_MULTIPLIER = 100
+MAX_PREFILL_BLOCKS = 1 << 15
+MAX_MANAGER_BLOCKS = 4096
+
+
+def prefill_layout(total_memory, max_blocks=MAX_PREFILL_BLOCKS):
+    """(block count, block size) of a prefill covering PREFILL_FRACTION of memory"""
+    span = int(total_memory * PREFILL_FRACTION)
+    count = max(1, min(span // BLOCK_SIZE, max_blocks))
+    return count, max(span // count, 1)
+
+
+def prefilled_simulator(total_memory, fragmentation, strategy=AllocationStrategy.FIRST_FIT, seed=0):
+    """Simulator filled with blocks end to end, then a fraction freed at random to leave holes.
+
+    Every size uses the default compact storage. The holes are spread over
+    the prefilled span, which grows with memory, and the remainder stays
+    free so there is always room to allocate.
+    """
+    simulator = MemorySimulator(total_memory, PAGE_SIZE)
+    simulator.set_strategy(strategy)
+    count, block_size = prefill_layout(total_memory)
+    pids = np.arange(1, count + 1)
+    simulator.allocate_many(pids, np.full(count, block_size))
+    freed = pids[np.random.default_rng(seed).random(count) < fragmentation]
+    simulator.deallocate_many(freed)
+    return simulator, count + 1
+
+
+def prefilled_manager(total_memory, fragmentation, seed=0):
+    from memory_tracker.src.memory_manager import MemoryManager
+
+    manager = MemoryManager(total_memory)
+    # MemoryManager only carves existing free blocks, so start from one spanning memory
+    manager.memory_blocks.append({'start': 0, 'size': total_memory, 'process_id': None, 'used': False})
+    count, block_size = prefill_layout(total_memory, MAX_MANAGER_BLOCKS)
+    for pid in range(1, count + 1):
+        manager.allocate_memory(pid, block_size)
+    for pid in np.flatnonzero(np.random.default_rng(seed).random(count) < fragmentation).tolist():
+        manager.free_memory(pid + 1)
+    return manager, count + 1
+
+
+# Each benchmark prepares untimed state and returns (timed callable, operation count)
+
+def _allocate_segment(total_memory, fragmentation, ops, strategy, rng):
+    simulator, next_pid = prefilled_simulator(total_memory, fragmentation, strategy)
+    sizes = rng.integers(1, prefill_layout(total_memory)[1] + 1, ops).tolist()
+
+    def run():
+        for offset, size in enumerate(sizes):
+            simulator.allocate_segment(next_pid + offset, size)
+    return run, ops
+
+
+def _allocate_pages(total_memory, fragmentation, ops, strategy, rng):
+    simulator, next_pid = prefilled_simulator(total_memory, fragmentation, strategy)
+    # Up to one prefill block's worth of pages, so requests fit the holes
+    sizes = rng.integers(1, max(prefill_layout(total_memory)[1], PAGE_SIZE) + 1, ops).tolist()
+
+    def run():
+        for offset, size in enumerate(sizes):
+            simulator.allocate_pages(next_pid + offset, size)
+    return run, ops
+
+
+def _deallocate(total_memory, fragmentation, ops, strategy, rng):
+    simulator, _ = prefilled_simulator(total_memory, fragmentation, strategy)
+    pids = list(simulator.processes)
+    pids = [pids[i] for i in rng.permutation(len(pids))[:ops].tolist()]
+
+    def run():
+        for pid in pids:
+            simulator.deallocate(pid)
+    return run, len(pids)
+
+
+def _get_fragmentation(total_memory, fragmentation, ops, strategy, rng):
+    simulator, _ = prefilled_simulator(total_memory, fragmentation, strategy)
+
+    calls = ops * QUERY_MULTIPLIER
+
+    def run():
+        for _ in range(calls):
+            simulator.get_fragmentation()
+    return run, calls
+
+
+def _get_utilization(total_memory, fragmentation, ops, strategy, rng):
+    simulator, _ = prefilled_simulator(total_memory, fragmentation, strategy)
+
+    calls = ops * QUERY_MULTIPLIER
+
+    def run():
+        for _ in range(calls):
+            simulator.get_utilization()
+    return run, calls
+
+
+def _manager_allocate(total_memory, fragmentation, ops, strategy, rng):
+    manager, next_pid = prefilled_manager(total_memory, fragmentation)
+    sizes = rng.integers(1, prefill_layout(total_memory, MAX_MANAGER_BLOCKS)[1] + 1, ops).tolist()
+
+    def run():
+        for offset, size in enumerate(sizes):
+            manager.allocate_memory(next_pid + offset, size)
+    return run, ops
+
+
+def _manager_free(total_memory, fragmentation, ops, strategy, rng):
+    manager, _ = prefilled_manager(total_memory, fragmentation)
+    pids = list(manager.processes)
+    pids = [pids[i] for i in rng.permutation(len(pids))[:ops].tolist()]
+
+    def run():
+        for pid in pids:
+            manager.free_memory(pid)
+    return run, len(pids)
+
+
+BENCHMARKS = {
+    "allocate_segment": _allocate_segment,
+    "allocate_pages": _allocate_pages,
+    "deallocate": _deallocate,
+    "get_fragmentation": _get_fragmentation,
+    "get_utilization": _get_utilization,
+    "manager_allocate_memory": _manager_allocate,
+    "manager_free_memory": _manager_free,
+}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, fragmentation_levels=DEFAULT_FRAGMENTATION, benchmarks=None,
+                   strategy=AllocationStrategy.FIRST_FIT, ops=1000, repeat=3, seed=0):
+    """Times every benchmark at every memory size and fragmentation level.
+
+    Each measurement is the best of repeat runs on freshly prepared state.
+    Returns a list of result dicts with throughput in operations per second.
+    """
+    results = []
+    for name in benchmarks or BENCHMARKS:
+        for total_memory in sizes:
+            for fragmentation in fragmentation_levels:
+                best = None
+                for attempt in range(repeat):
+                    rng = np.random.default_rng([seed, attempt])
+                    run, count = BENCHMARKS[name](total_memory, fragmentation, ops, strategy, rng)
+                    started = time.perf_counter()
+                    run()
+                    elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                results.append({
+                    'benchmark': name,
+                    'memory': total_memory,
+                    'fragmentation': fragmentation,
+                    'strategy': strategy.name,
+                    'ops': count,
+                    'seconds': best,
+                    'ops_per_second': count / best if best else float('inf'),
+                })
+    return results
+
+
+def result_key(result):
+    return result['benchmark'], result['memory'], result['fragmentation'], result['strategy']
+
+
+def find_regressions(results, baseline, tolerance=0.2):
+    """Results whose throughput fell more than tolerance below the matching baseline entry"""
+    previous = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None or not old['ops_per_second']:
+            continue
+        ratio = result['ops_per_second'] / old['ops_per_second']
+        if ratio < 1 - tolerance:
+            regressions.append(dict(result, baseline_ops_per_second=old['ops_per_second'], ratio=ratio))
+    return regressions
+
+
+def save_results(path, results):
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2)
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def format_results(results):
+    lines = [f"{'benchmark':<24}  {'memory':>11}  {'frag':>4}  {'ops/s':>12}"]
+    for result in results:
+        lines.append(f"{result['benchmark']:<24}  {result['memory']:>11,}  {result['fragmentation']:>4.1f}  "
+                     f"{result['ops_per_second']:>12,.0f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark allocator hot paths")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--fragmentation', type=float, nargs='+', default=list(DEFAULT_FRAGMENTATION),
+                        help="Fraction of prefilled blocks freed before timing")
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=None)
+    parser.add_argument('--strategy', default='first_fit',
+                        choices=[strategy.name.lower() for strategy in AllocationStrategy])
+    parser.add_argument('--ops', type=int, default=1000, help="Operations per measurement")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default="benchmark_results.json")
+    parser.add_argument('--baseline', default=None, help="Earlier results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed throughput drop (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.fragmentation, args.benchmarks,
+                             AllocationStrategy[args.strategy.upper()], args.ops, args.repeat)
+    save_results(args.output, results)
+    print(format_results(results))
+    print(f"Saved {len(results)} results to {args.output}")
+
+    if args.baseline:
+        regressions = find_regressions(results, load_results(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']} memory={regression['memory']:,} "
+                  f"frag={regression['fragmentation']}: {regression['ops_per_second']:,.0f} ops/s "
+                  f"vs {regression['baseline_ops_per_second']:,.0f} ({regression['ratio']:.0%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
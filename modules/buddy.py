@@ -0,0 +1,57 @@
+class BuddyAllocator:
+    """Binary buddy system over [0, total_memory).
+
+    Free blocks of size 2**order are kept in one insertion-ordered dict per
+    order, so taking a block, splitting it and merging a freed block with its
+    buddy all cost O(log total_memory). Memory that is not a power of two is
+    covered by several aligned top-level blocks.
+    """
+
+    def __init__(self, total_memory):
+        self.total_memory = total_memory
+        self.max_order = max(total_memory.bit_length() - 1, 0)
+        self.free_lists = [dict() for _ in range(self.max_order + 1)]
+
+    @staticmethod
+    def order_for(size):
+        return max(size - 1, 0).bit_length()
+
+    def free_block_count(self):
+        return sum(len(blocks) for blocks in self.free_lists)
+
+    def alloc(self, size):
+        """Returns (start, order) of a block holding size units, or None"""
+        order = self.order_for(size)
+        if order > self.max_order:
+            return None
+        for k in range(order, self.max_order + 1):
+            if self.free_lists[k]:
+                start, _ = self.free_lists[k].popitem()
+                break
+        else:
+            return None
+
+        # Split down to the requested order, freeing the upper halves
+        while k > order:
+            k -= 1
+            self.free_lists[k][start + (1 << k)] = None
+        return start, order
+
+    def free(self, start, order):
+        """Frees a block and merges it with its buddy while possible"""
+        while order < self.max_order:
+            buddy = start ^ (1 << order)
+            if buddy not in self.free_lists[order]:
+                break
+            del self.free_lists[order][buddy]
+            start = min(start, buddy)
+            order += 1
+        self.free_lists[order][start] = None
+
+    def add_range(self, start, end):
+        """Frees [start, end] as the largest aligned blocks that fit"""
+        while start <= end:
+            order = (start & -start).bit_length() - 1 if start else self.max_order
+            order = min(order, (end - start + 1).bit_length() - 1)
+            self.free(start, order)
+            start += 1 << order
@@ -0,0 +1,85 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from .free_extents import FreeExtents
+
+
+def plan_slide(allocations, total_memory):
+    """Slides every movable allocation down to the lowest free address.
+
+    allocations is a list of (start, size, process_id, movable) sorted by
+    start. Pinned allocations stay put and restart the packing just past
+    themselves. Returns a list of (process_id, old_start, new_start, size).
+    """
+    moves = []
+    cursor = 0
+    for start, size, process_id, movable in allocations:
+        if not movable:
+            cursor = start + size
+            continue
+        if start != cursor:
+            moves.append((process_id, start, cursor, size))
+        cursor += size
+    return moves
+
+
+def plan_evacuation(allocations, free_blocks, total_memory, target):
+    """Opens one hole of at least target units by moving as few units as possible.
+
+    Every window of target units that starts at a hole and contains no
+    pinned allocation is scored by the movable units inside it; windows are
+    tried cheapest first and the first whose segments can all be re-homed
+    (best fit, largest segment first) in holes outside the window wins.
+    Returns the list of moves, or None if no window can be cleared.
+    """
+    starts = [start for start, _, _, _ in allocations]
+    ends = [start + size for start, size, _, _ in allocations]
+    movable_units = list(accumulate((size if movable else 0 for _, size, _, movable in allocations), initial=0))
+    pinned = list(accumulate((0 if movable else 1 for _, _, _, movable in allocations), initial=0))
+
+    candidates = []
+    for hole_start, _ in free_blocks:
+        window_end = hole_start + target
+        if window_end > total_memory:
+            continue
+        # Allocations overlapping [hole_start, window_end) must all leave
+        first = bisect_right(ends, hole_start)
+        last = bisect_left(starts, window_end)
+        if pinned[last] - pinned[first]:
+            continue
+        candidates.append((movable_units[last] - movable_units[first], hole_start, first, last))
+    candidates.sort()
+
+    for cost, hole_start, first, last in candidates:
+        if cost == 0:
+            return []
+        window_start = hole_start
+        window_end = max(hole_start + target, ends[last - 1])
+        if window_end > total_memory:
+            continue
+
+        # Plan in a scratch copy with the window reserved
+        scratch = FreeExtents(total_memory)
+        scratch.take(0, total_memory)
+        for start, end in free_blocks:
+            if end < window_start or start >= window_end:
+                scratch.release(start, end - start + 1)
+            else:
+                if start < window_start:
+                    scratch.release(start, window_start - start)
+                if end >= window_end:
+                    scratch.release(window_end, end - window_end + 1)
+
+        moves = []
+        for start, size, process_id, _ in sorted(allocations[first:last], key=lambda a: -a[1]):
+            new_start = scratch.best_fit(size)
+            if new_start == -1:
+                break
+            scratch.take(new_start, size)
+            moves.append((process_id, start, new_start, size))
+        else:
+            return moves
+    return None
+
+
+def moved_units(moves):
+    return sum(size for _, _, _, size in moves)
@@ -0,0 +1,128 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from .memory_simulator import MemorySimulator, AllocationStrategy, BatchOp
+from .trace_replay import TRACE_DTYPE, read_trace, replay
+
+TABLE_COLUMNS = [
+    ('strategy', 'Strategy', '{}'),
+    ('page_size', 'Page', '{}'),
+    ('utilization', 'Util %', '{:.1f}'),
+    ('peak_utilization', 'Peak %', '{:.1f}'),
+    ('external_fragmentation', 'Ext frag %', '{:.1f}'),
+    ('internal_fragmentation', 'Int frag', '{:.0f}'),
+    ('failure_rate', 'Fail %', '{:.2f}'),
+    ('us_per_op', 'us/op', '{:.2f}'),
+]
+
+
+def _attach(shm_name, length):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    return shm, np.ndarray((length,), dtype=TRACE_DTYPE, buffer=shm.buf)
+
+
+def run_config(records, total_memory, page_size, strategy, storage='compact',
+               sample_every=10000, chunk_size=65536):
+    """Replays a TRACE_DTYPE record array against one configuration"""
+    simulator = MemorySimulator(total_memory, page_size, storage=storage)
+    simulator.set_strategy(strategy)
+    chunks = ((records['op'][i:i+chunk_size], records['pid'][i:i+chunk_size], records['size'][i:i+chunk_size])
+              for i in range(0, len(records), chunk_size))
+
+    started = time.perf_counter()
+    samples = list(replay(simulator, chunks, sample_every))
+    elapsed = time.perf_counter() - started
+
+    allocations = int(np.count_nonzero(records['op'] != BatchOp.DEALLOCATE))
+    failures = samples[-1]['failures'] if samples else 0
+    return {
+        'strategy': strategy.name,
+        'page_size': page_size,
+        'utilization': float(np.mean([s['utilization'] for s in samples])) if samples else 0.0,
+        'peak_utilization': max((s['utilization'] for s in samples), default=0.0),
+        'external_fragmentation': float(np.mean([s['external_fragmentation'] for s in samples])) if samples else 0.0,
+        'internal_fragmentation': float(np.mean([s['internal_fragmentation'] for s in samples])) if samples else 0.0,
+        'failure_rate': (failures / allocations * 100) if allocations else 0.0,
+        'us_per_op': (elapsed / len(records) * 1e6) if len(records) else 0.0,
+    }
+
+
+def run_shared_config(shm_name, length, total_memory, page_size, strategy_name, storage, sample_every):
+    """run_config for a trace held in a named shared memory block"""
+    shm, records = _attach(shm_name, length)
+    try:
+        return run_config(records, total_memory, page_size, AllocationStrategy[strategy_name],
+                          storage, sample_every)
+    finally:
+        del records
+        shm.close()
+
+
+def share_workload(workload):
+    """Copies (ops, pids, sizes) into a new shared memory block of TRACE_DTYPE records"""
+    ops, pids, sizes = workload[:3]
+    shm = shared_memory.SharedMemory(create=True, size=max(len(ops) * TRACE_DTYPE.itemsize, 1))
+    records = np.ndarray((len(ops),), dtype=TRACE_DTYPE, buffer=shm.buf)
+    records['op'], records['pid'], records['size'] = ops, pids, sizes
+    del records
+    return shm
+
+
+def compare_strategies(workload, total_memory, page_sizes=(64,), strategies=None,
+                       storage='compact', sample_every=10000, max_workers=None):
+    """Runs one workload against every strategy/page size pair in parallel.
+
+    The trace is copied once into shared memory and every worker maps it
+    directly instead of receiving a pickled copy. Returns one row per
+    configuration, in grid order.
+    """
+    strategies = list(strategies or AllocationStrategy)
+    length = len(workload[0])
+
+    shm = share_workload(workload)
+    try:
+        grid = [(page_size, strategy) for strategy in strategies for page_size in page_sizes]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run_shared_config, shm.name, length, total_memory, page_size,
+                                       strategy.name, storage, sample_every)
+                       for page_size, strategy in grid]
+            return [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def format_table(rows):
+    headers = [header for _, header, _ in TABLE_COLUMNS]
+    cells = [[fmt.format(row[key]) for key, _, fmt in TABLE_COLUMNS] for row in rows]
+    widths = [max(len(text) for text in column) for column in zip(headers, *cells)]
+    lines = ["  ".join(text.rjust(width) for text, width in zip(headers, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    lines.extend("  ".join(text.rjust(width) for text, width in zip(line, widths)) for line in cells)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare allocation strategies on one trace")
+    parser.add_argument('trace', help="CSV or binary trace file")
+    parser.add_argument('--memory', type=int, default=1 << 20, help="Total memory units")
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[64])
+    parser.add_argument('--strategies', nargs='+', default=None,
+                        choices=[strategy.name.lower() for strategy in AllocationStrategy])
+    parser.add_argument('--storage', default='compact', choices=['compact', 'dense', 'extent'])
+    parser.add_argument('--every', type=int, default=10000, help="Operations between samples")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    chunks = list(read_trace(args.trace))
+    workload = tuple(np.concatenate(parts) for parts in zip(*chunks)) if chunks else ([], [], [])
+    strategies = [AllocationStrategy[name.upper()] for name in args.strategies] if args.strategies else None
+    rows = compare_strategies(workload, args.memory, args.page_sizes, strategies,
+                              args.storage, args.every, args.workers)
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
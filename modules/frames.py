@@ -0,0 +1,59 @@
+import numpy as np
+
+
+class FrameBitmap:
+    """One flag per page frame (True = entirely free) plus a running free count"""
+
+    MAX_SEARCH_CHUNK = 1 << 16
+
+    def __init__(self, total_memory, page_size):
+        self.total_memory = total_memory
+        self.page_size = page_size
+        self.num_frames = -(-total_memory // page_size)
+        self.free = np.ones(self.num_frames, dtype=bool)
+        self.free_count = self.num_frames
+        self._lowest = 0  # No free frame exists below this index
+
+    def mark_used(self, start, size):
+        """Clears every frame overlapping [start, start + size)"""
+        if size <= 0:
+            return
+        first = start // self.page_size
+        last = (start + size - 1) // self.page_size
+        frames = self.free[first:last+1]
+        self.free_count -= int(np.count_nonzero(frames))
+        frames[:] = False
+
+    def mark_free(self, start, end):
+        """Sets every frame lying wholly inside the free extent [start, end]"""
+        first = -(-start // self.page_size)
+        if end >= self.total_memory - 1:
+            stop = self.num_frames
+        else:
+            stop = (end + 1) // self.page_size
+        if stop <= first:
+            return
+        frames = self.free[first:stop]
+        self.free_count += len(frames) - int(np.count_nonzero(frames))
+        frames[:] = True
+        self._lowest = min(self._lowest, first)
+
+    def find(self, count):
+        """Start addresses of the lowest count free frames, or None if too few"""
+        if count > self.free_count:
+            return None
+        # Scan growing chunks so a request satisfied early never touches the tail
+        found = []
+        remaining = count
+        offset = self._lowest
+        chunk = max(2 * count, 64)
+        while remaining > 0 and offset < self.num_frames:
+            hits = np.flatnonzero(self.free[offset:offset+chunk])[:remaining]
+            found.append(hits + offset)
+            remaining -= len(hits)
+            offset += chunk
+            chunk = min(2 * chunk, self.MAX_SEARCH_CHUNK)
+        frames = np.concatenate(found) if found else np.empty(0, dtype=np.intp)
+        if len(frames):
+            self._lowest = int(frames[0])
+        return frames * self.page_size
@@ -0,0 +1,245 @@
+import random
+import numpy as np
+from .ordered_set import OrderedSet
+
+
+class _Node:
+    __slots__ = ("start", "end", "priority", "left", "right", "max_len")
+
+    def __init__(self, start, end, priority):
+        self.start = start
+        self.end = end
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_len = end - start + 1
+
+
+def _update(node):
+    max_len = node.end - node.start + 1
+    if node.left is not None and node.left.max_len > max_len:
+        max_len = node.left.max_len
+    if node.right is not None and node.right.max_len > max_len:
+        max_len = node.right.max_len
+    node.max_len = max_len
+
+
+def _split(node, key):
+    """Splits a treap into (starts < key, starts >= key)"""
+    if node is None:
+        return None, None
+    if node.start < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+class FreeExtents:
+    """Address-ordered set of free extents stored as inclusive (start, end) pairs.
+
+    Allocation splits the extent it carves from and a release only coalesces
+    with its immediate left/right neighbours, so neither ever rescans memory.
+
+    Extents live in a treap keyed by start address whose nodes carry the
+    largest extent length in their subtree, which lets first fit descend
+    straight to the lowest-address hole that is big enough. A second treap
+    of (length, start) pairs answers best and worst fit, so every search and
+    update is O(log n) in the number of holes. The number of free units is kept as a running total.
+
+    visits holds the number of nodes the last first_fit, best_fit or
+    worst_fit examined.
+    """
+
+    def __init__(self, total_memory):
+        self.total_memory = total_memory
+        self._root = None
+        self._count = 0
+        self._random = random.Random(total_memory)
+        self._by_size = OrderedSet(seed=total_memory)
+        self.free_units = max(total_memory, 0)
+        self.visits = 0
+        if total_memory > 0:
+            self._add(0, total_memory - 1)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.start, node.end
+            node = node.right
+
+    def to_list(self):
+        return list(self)
+
+    def _add(self, start, end):
+        left, right = _split(self._root, start)
+        node = _Node(start, end, self._random.random())
+        self._root = _merge(_merge(left, node), right)
+        self._by_size.add((end - start + 1, start))
+        self._count += 1
+
+    def _remove(self, start):
+        left, rest = _split(self._root, start)
+        node, right = _split(rest, start + 1)
+        self._root = _merge(left, right)
+        self._by_size.remove((node.end - start + 1, start))
+        self._count -= 1
+        return node.end
+
+    def _resize(self, node, start, end):
+        """Changes a node's extent in place; neighbours must keep their order"""
+        path = []
+        current = self._root
+        while current is not node:
+            path.append(current)
+            current = current.left if node.start < current.start else current.right
+
+        self._by_size.remove((node.end - node.start + 1, node.start))
+        node.start = start
+        node.end = end
+        self._by_size.add((end - start + 1, start))
+        _update(node)
+        for parent in reversed(path):
+            _update(parent)
+
+    def _floor(self, address):
+        """Returns the node with the greatest start <= address, or None"""
+        node = self._root
+        found = None
+        while node is not None:
+            if node.start <= address:
+                found = node
+                node = node.right
+            else:
+                node = node.left
+        return found
+
+    def find_containing(self, address):
+        """Returns the start of the free extent holding address, or -1"""
+        node = self._floor(address)
+        if node is None or node.end < address:
+            return -1
+        return node.start
+
+    def largest(self):
+        return self._by_size.max()[0] if self._count else 0
+
+    def sizes(self):
+        """Lengths of all extents in ascending order"""
+        return np.fromiter((length for length, _ in self._by_size), dtype=np.int64, count=self._count)
+
+    def first_fit(self, size):
+        """Lowest-address extent with at least size units, or -1"""
+        node = self._root
+        if node is None or node.max_len < size:
+            self.visits = 0 if node is None else 1
+            return -1
+        visits = 1
+        while True:
+            if node.left is not None and node.left.max_len >= size:
+                node = node.left
+            elif node.end - node.start + 1 >= size:
+                self.visits = visits
+                return node.start
+            else:
+                node = node.right
+            visits += 1
+
+    def best_fit(self, size):
+        """Smallest extent with at least size units (lowest address on ties), or -1"""
+        found = self._by_size.ceiling((size, -1))
+        self.visits = self._by_size.visits
+        return -1 if found is None else found[1]
+
+    def worst_fit(self, size):
+        """Largest extent if it holds size units (lowest address on ties), or -1"""
+        if not self._count:
+            self.visits = 0
+            return -1
+        largest = self._by_size.max()[0]
+        visits = self._by_size.visits
+        if largest < size:
+            self.visits = visits
+            return -1
+        # Ties on length are ordered by start, so find the lowest address
+        found = self._by_size.ceiling((largest, -1))
+        self.visits = visits + self._by_size.visits
+        return found[1]
+
+    def take(self, start, size):
+        """Marks [start, start + size) as used; the range must be free"""
+        size = min(size, self.total_memory - start)
+        if size <= 0:
+            return
+        node = self._floor(start)
+        if node is None or node.end < start + size - 1:
+            raise ValueError(f"Range {start}+{size} is not free")
+
+        # Shrink the containing node in place and only add a node for a split
+        block_start, block_end = node.start, node.end
+        if block_start < start:
+            self._resize(node, block_start, start - 1)
+            if start + size <= block_end:
+                self._add(start + size, block_end)
+        elif start + size <= block_end:
+            self._resize(node, start + size, block_end)
+        else:
+            self._remove(block_start)
+        self.free_units -= size
+
+    def release(self, start, size):
+        """Returns [start, start + size) to the free set, merging with neighbours.
+
+        The (start, end) of the resulting merged extent is returned.
+        """
+        size = min(size, self.total_memory - start)
+        if size <= 0:
+            return None
+        end = start + size - 1
+        self.free_units += size
+
+        right = self._floor(end + 1)
+        if right is None or right.start != end + 1:
+            right = None
+        left = self._floor(start - 1) if start > 0 else None
+        if left is None or left.end != start - 1:
+            left = None
+
+        # Grow a neighbour in place where possible
+        if left is not None and right is not None:
+            end = self._remove(right.start)
+            start = left.start
+            self._resize(left, start, end)
+        elif left is not None:
+            start = left.start
+            self._resize(left, start, end)
+        elif right is not None:
+            end = right.end
+            self._resize(right, start, end)
+        else:
+            self._add(start, end)
+        return start, end
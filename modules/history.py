@@ -0,0 +1,193 @@
+import hashlib
+import time
+from enum import IntEnum
+import numpy as np
+
+HISTORY_MAGIC = b"MSHIST01"
+HISTORY_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('op', 'u1'),
+    ('pid', '<i8'),
+    ('start', '<i8'),
+    ('size', '<i8'),
+    ('result', '<i8'),
+])
+
+
+class HistoryOp(IntEnum):
+    RESET = 0
+    ALLOCATE_SEGMENT = 1
+    ALLOCATE_BUDDY = 2
+    ALLOCATE_SLAB = 3
+    ALLOCATE_PAGES = 4
+    DEALLOCATE = 5
+    COMPACT = 6
+    BATCH = 7
+
+
+MESSAGES = {
+    HistoryOp.RESET: "System Reset",
+    HistoryOp.ALLOCATE_SEGMENT: "Allocated segment for {pid}",
+    HistoryOp.ALLOCATE_BUDDY: "Allocated buddy block for {pid}",
+    HistoryOp.ALLOCATE_SLAB: "Allocated slab object for {pid}",
+    HistoryOp.ALLOCATE_PAGES: "Allocated pages for {pid}",
+    HistoryOp.DEALLOCATE: "Deallocated {pid}",
+    HistoryOp.COMPACT: "Compacted memory ({size} units moved)",
+    HistoryOp.BATCH: "Applied batch of {size} operations",
+}
+
+
+def read_history(path):
+    """Loads a spill or export file written by HistoryLog"""
+    with open(path, 'rb') as file:
+        if file.read(len(HISTORY_MAGIC)) != HISTORY_MAGIC:
+            raise ValueError(f"{path} is not a history file")
+        return np.fromfile(file, dtype=HISTORY_DTYPE)
+
+
+class HistoryLog:
+    """Fixed-capacity ring buffer of HISTORY_DTYPE records.
+
+    Memory stays at capacity records however long a run is. With spill_path
+    set, each full buffer is appended to that file before being overwritten,
+    so the file plus the buffer always hold the complete history. Iterating
+    or indexing yields (message, details) tuples like the list it replaces;
+    records() and query() give the structured data for bulk work.
+
+    Integer pids are stored as-is; other pids (e.g. "P1") are stored as a
+    stable negative hash of their text, so spilled and exported files agree
+    on ids. Labels are only remembered while a buffered record uses them,
+    keeping memory constant however many distinct pids a run sees.
+    """
+
+    def __init__(self, capacity=10000, spill_path=None):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._records = np.zeros(capacity, dtype=HISTORY_DTYPE)
+        self.clear()
+
+    @staticmethod
+    def label_id(pid):
+        """The negative id a non-integer pid is stored as"""
+        digest = hashlib.blake2b(str(pid).encode(), digest_size=8).digest()
+        return -(int.from_bytes(digest, 'little') >> 1) - 1
+
+    def _encode_pid(self, pid):
+        if isinstance(pid, (int, np.integer)):
+            return int(pid)
+        label_id = self._label_ids.get(pid)
+        if label_id is None:
+            label_id = self._label_ids[pid] = self.label_id(pid)
+            self._labels[label_id] = pid
+        self._label_uses[label_id] = self._label_uses.get(label_id, 0) + 1
+        return label_id
+
+    def _forget_pid(self, value):
+        # Drops a label once no buffered record refers to it
+        uses = self._label_uses[value] - 1
+        if uses:
+            self._label_uses[value] = uses
+        else:
+            del self._label_uses[value], self._label_ids[self._labels.pop(value)]
+
+    def decode_pid(self, value):
+        """The original pid; labels of overwritten records stay as their negative id"""
+        value = int(value)
+        return self._labels.get(value, value) if value < 0 else value
+
+    def append(self, op, pid=0, start=-1, size=0, result=1):
+        index = self._appended % self.capacity
+        if self._appended >= self.capacity:
+            if index == 0 and self.spill_path is not None:
+                with open(self.spill_path, 'ab') as file:
+                    self._records.tofile(file)
+                self._spilled = self._appended
+            overwritten = int(self._records[index]['pid'])
+            if overwritten < 0:
+                self._forget_pid(overwritten)
+        self._records[index] = (time.time(), op, self._encode_pid(pid), start, size, result)
+        self._appended += 1
+
+    @property
+    def total(self):
+        """Records appended over the log's lifetime, including overwritten ones"""
+        return self._appended
+
+    def __len__(self):
+        return min(self._appended, self.capacity)
+
+    def records(self):
+        """Buffered records, oldest first (a copy)"""
+        if self._appended <= self.capacity:
+            return self._records[:self._appended].copy()
+        split = self._appended % self.capacity
+        return np.concatenate([self._records[split:], self._records[:split]])
+
+    def query(self, op=None, pid=None, since=None):
+        """Buffered records filtered by op, pid and/or minimum timestamp"""
+        records = self.records()
+        mask = np.ones(len(records), dtype=bool)
+        if op is not None:
+            mask &= records['op'] == op
+        if pid is not None:
+            if not isinstance(pid, (int, np.integer)):
+                pid = self.label_id(pid)
+            mask &= records['pid'] == pid
+        if since is not None:
+            mask &= records['timestamp'] >= since
+        return records[mask]
+
+    def describe(self, record):
+        """(message, details) for one record, as the list-based history stored them"""
+        op = HistoryOp(int(record['op']))
+        pid = self.decode_pid(record['pid'])
+        size = int(record['size'])
+        message = MESSAGES[op].format(pid=pid, size=size)
+        if op == HistoryOp.RESET:
+            details = None
+        elif op == HistoryOp.DEALLOCATE:
+            details = pid
+        elif op == HistoryOp.COMPACT:
+            details = {'moves': int(record['result']), 'units_moved': size}
+        elif op == HistoryOp.BATCH:
+            details = (int(record['result']), size - int(record['result']))
+        else:
+            details = (pid, int(record['start']), size)
+        return message, details
+
+    def __iter__(self):
+        return (self.describe(record) for record in self.records())
+
+    def __getitem__(self, key):
+        # Map positions (0 = oldest buffered record) to ring slots so only
+        # the selected records are read, not a copy of the whole ring
+        length = len(self)
+        oldest = self._appended % self.capacity if self._appended > self.capacity else 0
+        if isinstance(key, slice):
+            positions = np.arange(*key.indices(length))
+            return [self.describe(record) for record in self._records[(positions + oldest) % self.capacity]]
+        if not -length <= key < length:
+            raise IndexError("history index out of range")
+        return self.describe(self._records[(key % length + oldest) % self.capacity])
+
+    def clear(self):
+        """Empties the log, including the spill file"""
+        self._appended = 0
+        self._spilled = 0
+        self._labels = {}  # label id -> pid
+        self._label_ids = {}  # pid -> label id
+        self._label_uses = {}  # label id -> buffered records using it
+        if self.spill_path is not None:
+            with open(self.spill_path, 'wb') as file:
+                file.write(HISTORY_MAGIC)
+
+    def export(self, path):
+        """Writes every record still available (spilled and buffered) to one file"""
+        with open(path, 'wb') as file:
+            file.write(HISTORY_MAGIC)
+            if self.spill_path is not None:
+                read_history(self.spill_path).tofile(file)
+            records = self.records()
+            records[len(records) - (self._appended - self._spilled):].tofile(file)
@@ -0,0 +1,194 @@
+import functools
+import time
+from collections import Counter
+from .compaction import moved_units
+
+# Values below 2 * SUB_BUCKETS are exact; above that each power of two is
+# split into SUB_BUCKETS linear buckets, i.e. about 3% relative precision
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of non-negative integer values (nanoseconds).
+
+    Recording is a couple of integer operations and a list increment; memory
+    is fixed at a few thousand counters however many values are recorded.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (SUB_BUCKETS * 64)
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(value):
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value
+        return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+    @staticmethod
+    def bucket_value(index):
+        """Highest value that lands in bucket index"""
+        shift = (index >> SUB_BUCKET_BITS) - 1
+        if shift <= 0:
+            return index
+        mantissa = index - (shift << SUB_BUCKET_BITS)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        self.counts[self.bucket(value)] += 1
+        self.total += 1
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """Upper bound of the bucket holding the given percentile (0 when empty)"""
+        if not self.total:
+            return 0
+        rank = max(1, -(-self.total * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bucket_value(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.total,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class Instrumentation:
+    """Latency histograms keyed by (operation, strategy) plus allocator work counters"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = Counter()
+
+    def record(self, op, strategy, nanoseconds):
+        histogram = self.histograms.get((op, strategy))
+        if histogram is None:
+            histogram = self.histograms[op, strategy] = LatencyHistogram()
+        histogram.record(nanoseconds)
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def reset(self):
+        self.histograms.clear()
+        self.counters.clear()
+
+    def report(self):
+        """{'latency': {op: {strategy: summary}}, 'counters': {...}} with times in nanoseconds"""
+        latency = {}
+        for (op, strategy), histogram in sorted(self.histograms.items()):
+            latency.setdefault(op, {})[strategy] = histogram.summary()
+        return {'latency': latency, 'counters': dict(self.counters)}
+
+
+SIMULATOR_OPS = ("allocate_segment", "allocate_pages", "deallocate", "compact",
+                 "get_fragmentation", "get_utilization", "translate")
+MANAGER_OPS = ("allocate_memory", "free_memory", "compact", "get_fragmentation_info")
+WORK_HOOKS = ("_find_first_fit", "_find_best_fit", "_find_worst_fit", "_write", "_release_free",
+              "_apply_moves", "_merge_free_blocks")
+
+
+def _timed(instrumentation, op, method, strategy_of):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            instrumentation.record(op, strategy_of(), time.perf_counter_ns() - started)
+    return wrapper
+
+
+def instrument_simulator(simulator, instrumentation=None):
+    """Starts recording a MemorySimulator's operations; returns the Instrumentation.
+
+    Wrappers are installed on the instance only, so simulators that are not
+    instrumented (or have been uninstrumented) run the plain methods at no
+    extra cost.
+    """
+    instrumentation = instrumentation or Instrumentation()
+    uninstrument(simulator)
+    strategy_of = lambda: simulator.strategy.name
+    for op in SIMULATOR_OPS:
+        setattr(simulator, op, _timed(instrumentation, op, getattr(simulator, op), strategy_of))
+
+    write = simulator._write
+    release_free = simulator._release_free
+    apply_moves = simulator._apply_moves
+
+    def counted_search(find):
+        def search(size):
+            # The free-extent searches record how many tree nodes they visited
+            result = find(size)
+            instrumentation.count('holes_examined', simulator._free.visits)
+            return result
+        return search
+
+    def counted_write(process_id, start, size):
+        instrumentation.count('units_written', size)
+        return write(process_id, start, size)
+
+    def counted_apply_moves(moves):
+        # Compaction copies every moved segment to its new address
+        instrumentation.count('units_written', moved_units(moves))
+        return apply_moves(moves)
+
+    def counted_release(start, size):
+        before = len(simulator._free)
+        result = release_free(start, size)
+        instrumentation.count('blocks_merged', before + 1 - len(simulator._free))
+        return result
+
+    simulator._find_first_fit = counted_search(simulator._find_first_fit)
+    simulator._find_best_fit = counted_search(simulator._find_best_fit)
+    simulator._find_worst_fit = counted_search(simulator._find_worst_fit)
+    simulator._write = counted_write
+    simulator._release_free = counted_release
+    simulator._apply_moves = counted_apply_moves
+    return instrumentation
+
+
+def instrument_manager(manager, instrumentation=None):
+    """Same as instrument_simulator for memory_tracker's MemoryManager.
+
+    Every allocation scans the whole block list, so holes examined is the
+    number of free blocks at the time of the call.
+    """
+    instrumentation = instrumentation or Instrumentation()
+    uninstrument(manager)
+    strategy_of = lambda: "BEST_FIT"
+    for op in MANAGER_OPS:
+        setattr(manager, op, _timed(instrumentation, op, getattr(manager, op), strategy_of))
+
+    allocate = manager.allocate_memory
+    merge = manager._merge_free_blocks
+
+    def counted_allocate(process_id, size):
+        instrumentation.count('holes_examined', sum(1 for block in manager.memory_blocks if not block['used']))
+        return allocate(process_id, size)
+
+    def counted_merge():
+        before = len(manager.memory_blocks)
+        merge()
+        instrumentation.count('blocks_merged', before - len(manager.memory_blocks))
+
+    manager.allocate_memory = functools.wraps(allocate)(counted_allocate)
+    manager._merge_free_blocks = counted_merge
+    return instrumentation
+
+
+def uninstrument(target):
+    """Removes instance-level wrappers so the class methods run directly again"""
+    for name in set(SIMULATOR_OPS + MANAGER_OPS + WORK_HOOKS):
+        target.__dict__.pop(name, None)
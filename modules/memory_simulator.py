@@ -1,26 +1,138 @@
+import json
+import os
 import numpy as np
-from enum import Enum
+from enum import Enum, IntEnum
+from .buddy import BuddyAllocator
+from .compaction import plan_slide, plan_evacuation, moved_units
+from .free_extents import FreeExtents
+from .frames import FrameBitmap
+from .history import HistoryLog, HistoryOp
+from .slab import SlabAllocator
+from .storage import STORAGE_BACKENDS, DenseStorage, MemmapStorage
 
 class AllocationStrategy(Enum):
     FIRST_FIT = 1
     BEST_FIT = 2
     WORST_FIT = 3
+    BUDDY = 4
+    SLAB = 5
+
+class BatchOp(IntEnum):
+    ALLOCATE = 0
+    ALLOCATE_PAGES = 1
+    DEALLOCATE = 2
 
 class MemorySimulator:
-    def __init__(self, total_memory=2048, page_size=64):
+    def __init__(self, total_memory=2048, page_size=64, storage="compact",
+                 history_capacity=10000, history_path=None):
         self.total_memory = total_memory
         self.page_size = page_size
-        self.memory = np.zeros(total_memory, dtype=int)
+        # "compact" keeps one small interned handle per unit, "dense" the raw
+        # pid; "extent" scales to huge address spaces; pass a MemmapStorage
+        # instance for out-of-core runs
+        if isinstance(storage, str):
+            storage = STORAGE_BACKENDS[storage](total_memory)
+        self._storage = storage
         self.processes = {}
-        self.free_blocks = [(0, total_memory - 1)]
+        self._free = FreeExtents(total_memory)
+        self._frames = self._new_frame_bitmap()
+        self._buddy = None  # Built lazily from the free extents in BUDDY mode
+        self._requested = {}  # Requested sizes of buddy blocks, slab objects and pages
+        # Running totals behind get_utilization() and get_fragmentation()
+        self._used = 0
+        self._internal = 0
+        self._slab = SlabAllocator(slab_size=page_size * 8)
+        self._slab_objects = {}
+        self._batch = None  # Pending storage writes while a batch is running
         self.strategy = AllocationStrategy.FIRST_FIT
-        self.history = []
+        # Bounded structured log; iterates as (message, details) tuples
+        self.history = HistoryLog(history_capacity, history_path)
+        # Set by modules.timeline.Timeline to learn which processes each step changed
+        self.journal = None
+        # Automatic compaction: above this external fragmentation % after a
+        # free, and/or whenever a fit allocation fails
+        self.compaction_threshold = None
+        self.compact_on_failure = False
+
+    @property
+    def memory(self):
+        return self._storage.owners()
+
+    @property
+    def free_blocks(self):
+        return self._free.to_list()
         
     def reset(self):
-        self.memory.fill(0)
-        self.free_blocks = [(0, self.total_memory - 1)]
+        self._storage.clear_all()
+        self._free = FreeExtents(self.total_memory)
+        self._frames = self._new_frame_bitmap()
+        self._buddy = None
+        self._requested = {}
+        self._used = 0
+        self._internal = 0
+        self._slab = SlabAllocator(self._slab.size_classes, self._slab.slab_size)
+        self._slab_objects = {}
         self.processes = {}
-        self.history.append(("System Reset", None))
+        if self.journal is not None:
+            self.journal.touch_all()
+        self.history.append(HistoryOp.RESET)
+
+    def _write(self, process_id, start, size):
+        self._used += min(size, self.total_memory - start)
+        if self._batch is None:
+            self._storage.assign(start, size, process_id)
+        else:
+            self._batch['writes'].setdefault(process_id, []).append((start, size))
+
+    def _erase(self, process_id, start, size):
+        self._used -= min(size, self.total_memory - start)
+        if self._batch is None:
+            self._storage.clear(start, size)
+            return
+        # Ranges written within the batch were never stored, so just drop them
+        pending = self._batch['writes'].get(process_id)
+        if pending and (start, size) in pending:
+            pending.remove((start, size))
+            if not pending:
+                del self._batch['writes'][process_id]
+        else:
+            self._batch['clears'].append((start, size))
+
+    def _release_owner(self, process_id):
+        # Compact storage recycles the pid's handle once its units are cleared
+        if self._batch is None:
+            self._storage.release_owner(process_id)
+        else:
+            self._batch['released'].append(process_id)
+
+    def _touch(self, process_id):
+        if self.journal is not None:
+            self.journal.touch(process_id)
+
+    def _log(self, op, process_id=0, start=-1, size=0, result=1):
+        if self._batch is None:
+            self.history.append(op, process_id, start, size, result)
+
+    def _new_frame_bitmap(self):
+        # Frame flags cost 1/page_size of a dense array; skip them for extent storage
+        if isinstance(self._storage, DenseStorage):
+            return FrameBitmap(self.total_memory, self.page_size)
+        return None
+
+    def _take_free(self, start, size, from_buddy=False):
+        self._free.take(start, size)
+        if self._frames is not None:
+            self._frames.mark_used(start, size)
+        # Carving outside the buddy system leaves its free lists stale
+        if not from_buddy:
+            self._buddy = None
+
+    def _release_free(self, start, size):
+        merged = self._free.release(start, size)
+        if merged is not None and self._frames is not None:
+            self._frames.mark_free(*merged)
+        if self._buddy is not None:
+            self._buddy.add_range(start, min(start + size, self.total_memory) - 1)
         
     def set_strategy(self, strategy):
         self.strategy = strategy
@@ -29,54 +141,121 @@ class MemorySimulator:
         if process_id in self.processes:
             return False, "Process already exists"
             
-        if self.strategy == AllocationStrategy.FIRST_FIT:
-            block_index = self._find_first_fit(size)
-        elif self.strategy == AllocationStrategy.BEST_FIT:
-            block_index = self._find_best_fit(size)
-        else:  # WORST_FIT
-            block_index = self._find_worst_fit(size)
+        if self.strategy == AllocationStrategy.BUDDY:
+            return self._allocate_buddy(process_id, size)
+        if self.strategy == AllocationStrategy.SLAB:
+            cache = self._slab.cache_for(size)
+            if cache is not None:
+                return self._allocate_slab(process_id, size, cache)
+
+        start = self._find_fit(size)
+        if start == -1 and self.compact_on_failure:
+            self.compact(target=size)
+            start = self._find_fit(size)
             
-        if block_index == -1:
+        if start == -1:
             return False, "No suitable block found"
             
-        start, end = self.free_blocks[block_index]
-        self.memory[start:start+size] = process_id
-        
-        # Update free blocks
-        del self.free_blocks[block_index]
-        if start + size <= end:
-            self.free_blocks.insert(block_index, (start + size, end))
+        self._write(process_id, start, size)
+        self._take_free(start, size)
             
         self.processes[process_id] = (start, size)
-        self.history.append((f"Allocated segment for {process_id}", (process_id, start, size)))
+        self._touch(process_id)
+        self._log(HistoryOp.ALLOCATE_SEGMENT, process_id, start, size)
         return True, f"Allocated {size} units at {start}"
         
+    def _find_fit(self, size):
+        if self.strategy in (AllocationStrategy.FIRST_FIT, AllocationStrategy.SLAB):
+            # Requests above the largest slab class fall back to first fit
+            return self._find_first_fit(size)
+        if self.strategy == AllocationStrategy.BEST_FIT:
+            return self._find_best_fit(size)
+        return self._find_worst_fit(size)  # WORST_FIT
+
+    def _allocate_buddy(self, process_id, size):
+        if self._buddy is None:
+            self._buddy = BuddyAllocator(self.total_memory)
+            for start, end in self._free:
+                self._buddy.add_range(start, end)
+
+        block = self._buddy.alloc(size)
+        if block is None:
+            return False, "No suitable block found"
+
+        start, order = block
+        block_size = 1 << order
+        self._write(process_id, start, block_size)
+        self._take_free(start, block_size, from_buddy=True)
+
+        self.processes[process_id] = (start, block_size)
+        self._touch(process_id)
+        self._requested[process_id] = size
+        self._internal += block_size - size
+        self._log(HistoryOp.ALLOCATE_BUDDY, process_id, start, block_size)
+        return True, f"Allocated {size} units at {start} in a {block_size}-unit block"
+        
+    def _allocate_slab(self, process_id, size, cache):
+        allocation = cache.alloc(size)
+        if allocation is None:
+            # Carve a fresh slab out of the main extent allocator
+            slab_start = self._find_first_fit(cache.slab_size)
+            if slab_start == -1:
+                return False, "No suitable block found"
+            self._take_free(slab_start, cache.slab_size)
+            cache.add_slab(slab_start)
+            allocation = cache.alloc(size)
+
+        slab, slot = allocation
+        start = slab.start + slot * cache.object_size
+        self._write(process_id, start, cache.object_size)
+
+        self.processes[process_id] = (start, cache.object_size)
+        self._touch(process_id)
+        self._requested[process_id] = size
+        self._internal += cache.object_size - size
+        self._slab_objects[process_id] = (cache, slab, slot)
+        self._log(HistoryOp.ALLOCATE_SLAB, process_id, start, cache.object_size)
+        return True, f"Allocated {size} units at {start} in the {cache.object_size}-unit class"
+
+    def _free_slab_object(self, process_id):
+        cache, slab, slot = self._slab_objects.pop(process_id)
+        start, object_size = self.processes[process_id]
+        self._erase(process_id, start, object_size)
+        cache.free(slab, slot, self._requested[process_id])
+        for slab_start in cache.reclaim():
+            self._release_free(slab_start, cache.slab_size)
+
+    def get_slab_stats(self):
+        return self._slab.stats()
+        
     def allocate_pages(self, process_id, size):
         if process_id in self.processes:
             return False, "Process already exists"
             
         pages_needed = (size + self.page_size - 1) // self.page_size
-        free_pages = []
-        
-        # Find all free pages
-        for i in range(0, self.total_memory, self.page_size):
-            if np.all(self.memory[i:i+self.page_size] == 0):
-                free_pages.append(i)
-                if len(free_pages) == pages_needed:
-                    break
+        if self._frames is not None:
+            free_pages = self._frames.find(pages_needed)
+            if free_pages is None:
+                return False, "Not enough free pages"
+            free_pages = free_pages.tolist()
+        else:
+            free_pages = self._find_free_pages(pages_needed)
                     
         if len(free_pages) < pages_needed:
             return False, "Not enough free pages"
             
-        # Allocate pages
-        allocated = []
-        for page_start in free_pages:
-            self.memory[page_start:page_start+self.page_size] = process_id
-            allocated.append((page_start, self.page_size))
+        # Allocate pages, touching storage once per run of adjacent frames
+        allocated = [(page_start, self.page_size) for page_start in free_pages]
+        for run_start, run_size in self._page_runs(free_pages):
+            self._write(process_id, run_start, run_size)
+            self._take_free(run_start, run_size)
             
         self.processes[process_id] = allocated
-        self._update_free_blocks()
-        self.history.append((f"Allocated pages for {process_id}", (process_id, allocated)))
+        self._requested[process_id] = size
+        self._internal += len(allocated) * self.page_size - size
+        self._touch(process_id)
+        self._log(HistoryOp.ALLOCATE_PAGES, process_id, allocated[0][0] if allocated else -1,
+                  len(allocated) * self.page_size, len(allocated))
         return True, f"Allocated {pages_needed} pages"
         
     def deallocate(self, process_id):
@@ -85,91 +264,419 @@ class MemorySimulator:
             
         allocation = self.processes[process_id]
         
-        if isinstance(allocation, tuple):  # Segment
+        if process_id in self._slab_objects:
+            self._free_slab_object(process_id)
+        elif isinstance(allocation, tuple):  # Segment
             start, size = allocation
-            self.memory[start:start+size] = 0
+            self._erase(process_id, start, size)
+            self._release_free(start, size)
         else:  # Pages
-            for page_start, page_size in allocation:
-                self.memory[page_start:page_start+page_size] = 0
+            pages = [page_start for page_start, _ in allocation]
+            for run_start, run_size in self._page_runs(pages):
+                self._erase(process_id, run_start, run_size)
+                self._release_free(run_start, run_size)
                 
+        self._release_owner(process_id)
+        if process_id in self._requested:
+            self._internal -= self._block_size(allocation) - self._requested.pop(process_id)
         del self.processes[process_id]
-        self._update_free_blocks()
-        self.history.append((f"Deallocated {process_id}", process_id))
+        self._touch(process_id)
+        self._log(HistoryOp.DEALLOCATE, process_id)
+        if self.compaction_threshold is not None and self.get_fragmentation()[0] > self.compaction_threshold:
+            self.compact()
         return True, f"Deallocated {process_id}"
+
+    def _allocation_layout(self):
+        # (start, size, process_id, movable) in address order; only plain
+        # segments may move, slabs are pinned as whole reservations
+        layout = []
+        for process_id, allocation in self.processes.items():
+            if process_id in self._slab_objects:
+                continue
+            if isinstance(allocation, tuple):
+                layout.append((allocation[0], allocation[1], process_id, process_id not in self._requested))
+            else:
+                layout.extend((page_start, page_size, process_id, False) for page_start, page_size in allocation)
+        for cache in self._slab.caches:
+            for slabs in (cache.empty, cache.partial, cache.full):
+                layout.extend((slab_start, cache.slab_size, None, False) for slab_start in slabs)
+        layout.sort(key=lambda allocation: allocation[0])
+        return layout
+
+    def compact(self, mode='auto', target=None):
+        """Relocates segments to reduce external fragmentation.
+
+        'slide' packs every movable segment towards address 0; 'fill' opens a
+        single hole of target units (default: all free memory) by evacuating
+        the cheapest window into other holes; 'auto' picks whichever of the
+        two moves fewer units. Buddy blocks, slab objects and pages stay put.
+        Returns a report including the number of units copied.
+        """
+        largest_before = self._free.largest()
+        layout = self._allocation_layout()
+        plans = {}
+        if mode in ('slide', 'auto'):
+            plans['slide'] = plan_slide(layout, self.total_memory)
+        if mode in ('fill', 'auto'):
+            if target is None:
+                target = sum(end - start + 1 for start, end in self._free)
+            if largest_before < target:
+                moves = plan_evacuation(layout, self._free.to_list(), self.total_memory, target)
+            else:
+                moves = []
+            if moves is not None:
+                plans['fill'] = moves
+        if not plans:
+            return {'mode': mode, 'moves': 0, 'units_moved': 0,
+                    'largest_free_before': largest_before, 'largest_free_after': largest_before}
+
+        chosen = min(plans, key=lambda name: moved_units(plans[name]))
+        moves = plans[chosen]
+        self._apply_moves(moves)
+        report = {
+            'mode': chosen,
+            'moves': len(moves),
+            'units_moved': moved_units(moves),
+            'largest_free_before': largest_before,
+            'largest_free_after': self._free.largest(),
+        }
+        if moves:
+            self._log(HistoryOp.COMPACT, size=report['units_moved'], result=report['moves'])
+        return report
+
+    def _apply_moves(self, moves):
+        if not moves:
+            return
+        if self._batch is not None:
+            # Land pending batch writes first so the moves see real ownership
+            self._flush_batch(self._batch)
+
+        process_ids, old_starts, new_starts, sizes = (np.array(column) for column in zip(*moves))
+        self._storage.clear_many(old_starts, sizes)
+        self._storage.assign_many(new_starts, sizes, process_ids)
+        # Vacate everything before claiming, since sliding targets overlap sources
+        for process_id, old_start, new_start, size in moves:
+            self._release_free(old_start, size)
+        for process_id, old_start, new_start, size in moves:
+            self._take_free(new_start, size)
+            self.processes[process_id] = (new_start, size)
+            self._touch(process_id)
         
-    def _update_free_blocks(self):
-        # Rebuild free blocks by finding contiguous zeros
-        self.free_blocks = []
-        in_block = False
-        start = 0
+    def _page_runs(self, pages):
+        # Groups page starts into (start, size) runs of adjacent frames
+        runs = []
+        for page_start in sorted(pages):
+            if runs and runs[-1][0] + runs[-1][1] == page_start:
+                runs[-1][1] += self.page_size
+            else:
+                runs.append([page_start, self.page_size])
+        return runs
+
+    def _find_free_pages(self, pages_needed):
+        # Walk free extents in address order collecting whole page frames
+        free_pages = []
+        for start, end in self._free:
+            page_start = -(-start // self.page_size) * self.page_size
+            while page_start <= end and len(free_pages) < pages_needed:
+                if min(page_start + self.page_size, self.total_memory) - 1 > end:
+                    break
+                free_pages.append(page_start)
+                page_start += self.page_size
+            if len(free_pages) == pages_needed:
+                break
+        return free_pages
         
-        for i in range(self.total_memory):
-            if self.memory[i] == 0 and not in_block:
-                in_block = True
-                start = i
-            elif self.memory[i] != 0 and in_block:
-                in_block = False
-                self.free_blocks.append((start, i-1))
-                
-        if in_block:
-            self.free_blocks.append((start, self.total_memory-1))
-            
+    def allocate_many(self, process_ids, sizes, paged=False):
+        op = BatchOp.ALLOCATE_PAGES if paged else BatchOp.ALLOCATE
+        ops = np.full(len(process_ids), op, dtype=np.int8)
+        return self.apply_ops(ops, process_ids, sizes)
+
+    def deallocate_many(self, process_ids):
+        ops = np.full(len(process_ids), BatchOp.DEALLOCATE, dtype=np.int8)
+        succeeded, _ = self.apply_ops(ops, process_ids)
+        return succeeded
+
+    def apply_ops(self, ops, process_ids, sizes=None):
+        """Runs a sequence of BatchOp codes in one pass.
+
+        Storage writes and history are deferred until the end of the batch, so
+        allocations freed within the batch are never written at all. Returns a
+        success mask and the start address of each allocation (-1 otherwise).
+        Unknown op codes raise ValueError before anything is applied.
+        """
+        ops = np.asarray(ops).tolist()
+        unknown = set(ops).difference(op.value for op in BatchOp)
+        if unknown:
+            raise ValueError(f"Unknown batch op codes: {sorted(unknown)}")
+        process_ids = np.asarray(process_ids).tolist()
+        sizes = [0] * len(ops) if sizes is None else np.asarray(sizes).tolist()
+        succeeded = np.zeros(len(ops), dtype=bool)
+        starts = np.full(len(ops), -1, dtype=np.int64)
+
+        self._batch = {'writes': {}, 'clears': [], 'released': []}
+        try:
+            for i, (op, process_id, size) in enumerate(zip(ops, process_ids, sizes)):
+                if op == BatchOp.DEALLOCATE:
+                    succeeded[i] = self.deallocate(process_id)[0]
+                    continue
+                if op == BatchOp.ALLOCATE:
+                    ok = self.allocate_segment(process_id, size)[0]
+                else:
+                    ok = self.allocate_pages(process_id, size)[0]
+                if ok:
+                    allocation = self.processes[process_id]
+                    succeeded[i] = True
+                    starts[i] = allocation[0] if isinstance(allocation, tuple) else allocation[0][0]
+        finally:
+            batch, self._batch = self._batch, None
+            self._flush_batch(batch)
+
+        self.history.append(HistoryOp.BATCH, size=len(ops), result=int(succeeded.sum()))
+        return succeeded, starts
+
+    def _flush_batch(self, batch):
+        # Clear freed ranges first; every surviving write then lands on free units
+        if batch['clears']:
+            starts, sizes = np.array(batch['clears'], dtype=np.int64).T
+            self._storage.clear_many(starts, sizes)
+        for process_id in batch['released']:
+            self._storage.release_owner(process_id)
+        writes = [(start, size, process_id)
+                  for process_id, ranges in batch['writes'].items()
+                  for start, size in ranges]
+        if writes:
+            self._storage.assign_many(*zip(*writes))
+        # Empty the batch so a later flush of it cannot apply anything twice
+        batch['writes'], batch['clears'], batch['released'] = {}, [], []
+
+    # The finders return the start address of the chosen free block, or -1
     def _find_first_fit(self, size):
-        for i, (start, end) in enumerate(self.free_blocks):
-            block_size = end - start + 1
-            if block_size >= size:
-                return i
-        return -1
+        return self._free.first_fit(size)
         
     def _find_best_fit(self, size):
-        best_index = -1
-        min_diff = float('inf')
-        
-        for i, (start, end) in enumerate(self.free_blocks):
-            block_size = end - start + 1
-            if block_size >= size and (block_size - size) < min_diff:
-                min_diff = block_size - size
-                best_index = i
-                
-        return best_index
+        return self._free.best_fit(size)
         
     def _find_worst_fit(self, size):
-        worst_index = -1
-        max_size = -1
+        return self._free.worst_fit(size)
         
-        for i, (start, end) in enumerate(self.free_blocks):
-            block_size = end - start + 1
-            if block_size >= size and block_size > max_size:
-                max_size = block_size
-                worst_index = i
-                
-        return worst_index
+    def get_memory_state(self, start=0, stop=None):
+        # Dense copy of [start, stop); pass a window for very large address spaces
+        if stop is None:
+            stop = self.total_memory
+        return self._storage.window(start, stop)
         
-    def get_memory_state(self):
-        return self.memory.copy()
+    def page_table(self, process_id):
+        """Frame number of each virtual page of a paged process, for modules.tlb"""
+        allocation = self.processes[process_id]
+        if isinstance(allocation, tuple):
+            raise ValueError(f"{process_id} holds a segment, not pages")
+        return np.array([start for start, _ in allocation], dtype=np.int64) // self.page_size
+
+    def translate(self, addresses, process_id):
+        """Maps a batch of virtual addresses to physical ones.
+
+        Segments are checked against their base and limit; paged processes
+        split each address into page number and offset. Returns
+        (physical addresses, fault mask) with -1 wherever the access faults;
+        every access of an unknown process faults.
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        allocation = self.processes.get(process_id)
+        if allocation is None:
+            return np.full(len(addresses), -1, dtype=np.int64), np.ones(len(addresses), dtype=bool)
+        if isinstance(allocation, tuple):
+            base, limit = allocation
+            faults = (addresses < 0) | (addresses >= limit)
+            return np.where(faults, -1, addresses + base), faults
+        frames = self.page_table(process_id)
+        pages, offsets = np.divmod(addresses, self.page_size)
+        faults = (addresses < 0) | (pages >= len(frames))
+        if not len(frames):
+            return np.full(len(addresses), -1, dtype=np.int64), faults
+        physical = frames[np.where(faults, 0, pages)] * self.page_size + offsets
+        return np.where(faults, -1, physical), faults
+
+    def export_state(self):
+        """JSON-serialisable description of the allocator state (not the unit array)"""
+        processes = []
+        for process_id, allocation in self.processes.items():
+            if isinstance(allocation, tuple):
+                processes.append([process_id, 'segment', list(allocation)])
+            else:
+                processes.append([process_id, 'pages', [list(page) for page in allocation]])
+        return {
+            'total_memory': self.total_memory,
+            'page_size': self.page_size,
+            'strategy': self.strategy.name,
+            'processes': processes,
+            'requested': [[process_id, size] for process_id, size in self._requested.items()],
+            'slab_classes': list(self._slab.size_classes),
+            'slab_size': self._slab.slab_size,
+            'slabs': [[cache.object_size, start]
+                      for cache in self._slab.caches
+                      for slabs in (cache.empty, cache.partial, cache.full)
+                      for start in slabs],
+            'slab_objects': [[process_id, cache.object_size, slab.start, slot]
+                             for process_id, (cache, slab, slot) in self._slab_objects.items()],
+            'compaction_threshold': self.compaction_threshold,
+            'compact_on_failure': self.compact_on_failure,
+        }
+
+    def restore_state(self, state, rebuild_storage=True):
+        """Loads export_state() output; rebuild_storage=False trusts the unit array as is"""
+        if rebuild_storage:
+            self._storage.clear_all()
+        self._free = FreeExtents(self.total_memory)
+        self._frames = self._new_frame_bitmap()
+        self._buddy = None
+        self._slab = SlabAllocator(state['slab_classes'], state['slab_size'])
+        self._slab_objects = {}
+        self.strategy = AllocationStrategy[state['strategy']]
+        self.compaction_threshold = state['compaction_threshold']
+        self.compact_on_failure = state['compact_on_failure']
+
+        self.processes = {}
+        writes = []
+        for process_id, kind, allocation in state['processes']:
+            if kind == 'segment':
+                self.processes[process_id] = tuple(allocation)
+                writes.append((allocation[0], allocation[1], process_id))
+            else:
+                self.processes[process_id] = [tuple(page) for page in allocation]
+                writes.extend((start, size, process_id) for start, size in allocation)
+        self._requested = {process_id: size for process_id, size in state['requested']}
+        self._used = sum(min(size, self.total_memory - start) for start, size, _ in writes)
+        self._internal = sum(self._block_size(self.processes[process_id]) - size
+                             for process_id, size in self._requested.items())
+
+        caches = {cache.object_size: cache for cache in self._slab.caches}
+        for object_size, start in state['slabs']:
+            caches[object_size].add_slab(start)
+            self._take_free(start, self._slab.slab_size)
+        for process_id, object_size, slab_start, slot in state['slab_objects']:
+            cache = caches[object_size]
+            slab = cache.claim(slab_start, slot, self._requested[process_id])
+            self._slab_objects[process_id] = (cache, slab, slot)
+        for start, size, process_id in writes:
+            if process_id not in self._slab_objects:
+                self._take_free(start, size)
+
+        if rebuild_storage and writes:
+            self._storage.assign_many(*zip(*writes))
+        if self.journal is not None:
+            self.journal.touch_all()
+
+    def checkpoint(self, state_path=None):
+        """Flushes memmap storage and writes the allocator state beside it"""
+        if not isinstance(self._storage, MemmapStorage):
+            raise ValueError("Checkpointing requires MemmapStorage")
+        self._storage.flush()
+        state_path = state_path or f"{self._storage.path}.json"
+        tmp_path = f"{state_path}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(self.export_state(), file)
+        os.replace(tmp_path, state_path)
+        return state_path
+
+    @classmethod
+    def resume(cls, path, state_path=None):
+        """Reopens a checkpointed memmap simulation without rewriting its array"""
+        with open(state_path or f"{path}.json") as file:
+            state = json.load(file)
+        storage = MemmapStorage(state['total_memory'], path, mode='r+')
+        simulator = cls(state['total_memory'], state['page_size'], storage=storage)
+        simulator.restore_state(state, rebuild_storage=False)
+        return simulator
+
+    def get_memory_view(self, start=0, stop=None):
+        # Read-only view of [start, stop); no copy for dense storage
+        if stop is None:
+            stop = self.total_memory
+        return self._storage.view(start, stop)
+
+    def get_memory_runs(self, start=0, stop=None):
+        """(start, size, owner) runs covering [start, stop); owner 0 is free"""
+        if stop is None:
+            stop = self.total_memory
+        return self._storage.runs(start, min(stop, self.total_memory))
+
+    def get_owners_at(self, addresses):
+        """Owner of each address (0 for free units)"""
+        return self._storage.owners_at(addresses)
+
+    def snapshot(self):
+        """Cheap copy-on-write image of memory plus the process table.
+
+        Call release() on snapshots that are no longer needed so later writes
+        stop preserving chunks for them.
+        """
+        snapshot = self._storage.snapshot()
+        snapshot.processes = dict(self.processes)
+        return snapshot
         
     def get_fragmentation(self):
-        total_free = sum(end - start + 1 for start, end in self.free_blocks)
-        if not self.free_blocks:
-            return 0, 0
-            
-        # External fragmentation (percentage of free memory that can't be used for a request)
-        max_block = max(end - start + 1 for start, end in self.free_blocks)
+        """(external %, internal units), read from running totals in O(1).
+
+        External fragmentation is the percentage of free memory outside the
+        largest hole; internal is the rounding waste of buddy blocks, slab
+        objects and the last page of each paged allocation.
+        """
+        total_free = self._free.free_units
         if total_free == 0:
             external = 0
         else:
-            external = (1 - max_block / total_free) * 100
-            
-        # Internal fragmentation (for pages)
-        internal = 0
-        for process_id, allocation in self.processes.items():
-            if isinstance(allocation, list):  # Paged allocation
-                for page_start, page_size in allocation:
-                    used = np.count_nonzero(self.memory[page_start:page_start+page_size] == process_id)
-                    internal += page_size - used
-                    
-        return external, internal
-        
+            external = (1 - self._free.largest() / total_free) * 100
+        return external, self._internal
+
     def get_utilization(self):
-        used = np.count_nonzero(self.memory)
-        return (used / self.total_memory) * 100
\ No newline at end of file
+        return (self._used / self.total_memory) * 100
+
+    def largest_free_block(self):
+        return self._free.largest()
+
+    @staticmethod
+    def _block_size(allocation):
+        if isinstance(allocation, tuple):
+            return allocation[1]
+        return sum(page_size for _, page_size in allocation)
+
+    def fragmentation_index(self, size):
+        """Fraction (0-1) of free memory sitting in holes too small for size units"""
+        holes = self._free.sizes()
+        if not len(holes):
+            return 0.0
+        unusable = holes[:np.searchsorted(holes, size)].sum()
+        return float(unusable / self._free.free_units)
+
+    def get_fragmentation_stats(self, sizes=None):
+        """Detailed fragmentation report, computed on demand from the hole sizes.
+
+        'hole_histogram' counts holes per power-of-two size class: entry k
+        holds holes of 2**k to 2**(k+1) - 1 units. 'fragmentation_index' maps
+        each request size in sizes (default: powers of two up to the memory
+        size) to fragmentation_index(size).
+        """
+        holes = self._free.sizes()
+        if sizes is None:
+            sizes = 1 << np.arange(int(self.total_memory).bit_length())
+        sizes = np.asarray(sizes, dtype=np.int64)
+        if len(holes):
+            histogram = np.bincount(np.log2(holes).astype(np.int64))
+            unusable = np.concatenate(([0], np.cumsum(holes)))[np.searchsorted(holes, sizes)]
+            index = unusable / self._free.free_units
+        else:
+            histogram = np.zeros(0, dtype=np.int64)
+            index = np.zeros(len(sizes))
+        external, internal = self.get_fragmentation()
+        return {
+            'used': self._used,
+            'free': self._free.free_units,
+            'holes': len(holes),
+            'largest_hole': self._free.largest(),
+            'mean_hole': float(holes.mean()) if len(holes) else 0.0,
+            'external': external,
+            'internal': internal,
+            'utilization': self.get_utilization(),
+            'hole_histogram': histogram.tolist(),
+            'fragmentation_index': dict(zip(sizes.tolist(), index.tolist())),
+        }
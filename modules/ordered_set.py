@@ -0,0 +1,192 @@
+import random
+
+
+class _Node:
+    __slots__ = ("key", "priority", "left", "right")
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.priority = priority
+        self.left = None
+        self.right = None
+
+
+def _split(node, key):
+    """Splits a treap into (keys < key, keys >= key)"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        return node, right
+    left, node.left = _split(node.left, key)
+    return left, node
+
+
+def _clone(node):
+    if node is None:
+        return None
+    copy = _Node(node.key, node.priority)
+    copy.left = _clone(node.left)
+    copy.right = _clone(node.right)
+    return copy
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return left
+    right.left = _merge(left, right.left)
+    return right
+
+
+class OrderedSet:
+    """Set of mutually comparable keys kept in a treap.
+
+    add, remove and the ordered searches (ceiling, floor, min, max) take
+    O(log n) expected time, unlike a sorted list whose inserts and deletes
+    shift every later entry. visits holds the number of nodes the last
+    search (ceiling, floor, min or max) examined.
+    """
+
+    def __init__(self, keys=(), seed=None):
+        self._root = None
+        self._count = 0
+        self._random = random.Random(seed)
+        self.visits = 0
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return self.irange()
+
+    def __contains__(self, key):
+        node = self._root
+        while node is not None:
+            if key == node.key:
+                return True
+            node = node.left if key < node.key else node.right
+        return False
+
+    def irange(self, start=None):
+        """Keys >= start (all keys when start is None) in ascending order"""
+        stack = []
+        node = self._root
+        while node is not None:
+            if start is None or not node.key < start:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        while stack:
+            node = stack.pop()
+            yield node.key
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def add(self, key):
+        node = _Node(key, self._random.random())
+        parent = None
+        current = self._root
+        while current is not None and current.priority > node.priority:
+            parent = current
+            current = current.left if key < current.key else current.right
+        node.left, node.right = _split(current, key)
+        if parent is None:
+            self._root = node
+        elif key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        self._count += 1
+
+    def remove(self, key):
+        parent = None
+        current = self._root
+        while current is not None and current.key != key:
+            parent = current
+            current = current.left if key < current.key else current.right
+        if current is None:
+            raise KeyError(key)
+        replacement = _merge(current.left, current.right)
+        if parent is None:
+            self._root = replacement
+        elif parent.left is current:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+        self._count -= 1
+
+    def clear(self):
+        self._root = None
+        self._count = 0
+
+    def copy(self):
+        """Independent set with the same keys, built in O(n) from the tree"""
+        other = OrderedSet()
+        other._root = _clone(self._root)
+        other._count = self._count
+        other._random.setstate(self._random.getstate())
+        return other
+
+    def ceiling(self, key):
+        """Smallest key >= key, or None"""
+        node = self._root
+        found = None
+        visits = 0
+        while node is not None:
+            visits += 1
+            if node.key < key:
+                node = node.right
+            else:
+                found = node
+                node = node.left
+        self.visits = visits
+        return None if found is None else found.key
+
+    def floor(self, key):
+        """Largest key <= key, or None"""
+        node = self._root
+        found = None
+        visits = 0
+        while node is not None:
+            visits += 1
+            if key < node.key:
+                node = node.left
+            else:
+                found = node
+                node = node.right
+        self.visits = visits
+        return None if found is None else found.key
+
+    def min(self):
+        node = self._root
+        if node is None:
+            self.visits = 0
+            return None
+        visits = 1
+        while node.left is not None:
+            node = node.left
+            visits += 1
+        self.visits = visits
+        return node.key
+
+    def max(self):
+        node = self._root
+        if node is None:
+            self.visits = 0
+            return None
+        visits = 1
+        while node.right is not None:
+            node = node.right
+            visits += 1
+        self.visits = visits
+        return node.key
@@ -0,0 +1,229 @@
+import argparse
+import heapq
+from collections import OrderedDict, deque
+import numpy as np
+
+
+def reference_string(addresses, page_size):
+    """Page numbers touched by a sequence of virtual addresses"""
+    return np.asarray(addresses, dtype=np.int64) // page_size
+
+
+def next_use_index(refs):
+    """For every reference, the position of the next reference to the same page (len(refs) if none).
+
+    One stable argsort groups equal pages in time order, so each element's
+    successor within its group is its next use: O(n log n) overall.
+    """
+    refs = np.asarray(refs)
+    n = len(refs)
+    next_use = np.full(n, n, dtype=np.int64)
+    if n < 2:
+        return next_use
+    order = np.argsort(refs, kind='stable')
+    grouped = refs[order]
+    same_page = grouped[1:] == grouped[:-1]
+    next_use[order[:-1][same_page]] = order[1:][same_page]
+    return next_use
+
+
+def simulate_fifo(refs, frames):
+    resident = set()
+    queue = deque()
+    faults = np.zeros(len(refs), dtype=bool)
+    for i, page in enumerate(np.asarray(refs).tolist()):
+        if page in resident:
+            continue
+        faults[i] = True
+        if len(resident) == frames:
+            resident.remove(queue.popleft())
+        resident.add(page)
+        queue.append(page)
+    return faults
+
+
+def simulate_lru(refs, frames):
+    resident = OrderedDict()
+    faults = np.zeros(len(refs), dtype=bool)
+    for i, page in enumerate(np.asarray(refs).tolist()):
+        if page in resident:
+            resident.move_to_end(page)
+            continue
+        faults[i] = True
+        if len(resident) == frames:
+            resident.popitem(last=False)
+        resident[page] = None
+    return faults
+
+
+def simulate_clock(refs, frames):
+    """Frames in a circle; the hand clears reference bits until it finds a clear one"""
+    pages = [None] * frames
+    referenced = [False] * frames
+    slot_of = {}
+    hand = 0
+    faults = np.zeros(len(refs), dtype=bool)
+    for i, page in enumerate(np.asarray(refs).tolist()):
+        slot = slot_of.get(page)
+        if slot is not None:
+            referenced[slot] = True
+            continue
+        faults[i] = True
+        while referenced[hand]:
+            referenced[hand] = False
+            hand = (hand + 1) % frames
+        if pages[hand] is not None:
+            del slot_of[pages[hand]]
+        pages[hand] = page
+        slot_of[page] = hand
+        referenced[hand] = False
+        hand = (hand + 1) % frames
+    return faults
+
+
+def simulate_second_chance(refs, frames):
+    """FIFO queue where a referenced victim is moved to the back instead of evicted"""
+    referenced = {}
+    queue = deque()
+    faults = np.zeros(len(refs), dtype=bool)
+    for i, page in enumerate(np.asarray(refs).tolist()):
+        if page in referenced:
+            referenced[page] = True
+            continue
+        faults[i] = True
+        if len(queue) == frames:
+            while True:
+                victim = queue.popleft()
+                if not referenced[victim]:
+                    break
+                referenced[victim] = False
+                queue.append(victim)
+            del referenced[victim]
+        referenced[page] = False
+        queue.append(page)
+    return faults
+
+
+def simulate_opt(refs, frames):
+    """Belady's optimal policy: evict the page whose next use is furthest away.
+
+    Uses the precomputed next_use_index and a max-heap with lazy deletion,
+    so the whole string is processed in O(n log n).
+    """
+    refs = np.asarray(refs)
+    next_use = next_use_index(refs).tolist()
+    resident = {}  # page -> position of its next use
+    heap = []
+    faults = np.zeros(len(refs), dtype=bool)
+    for i, page in enumerate(refs.tolist()):
+        if page not in resident:
+            faults[i] = True
+            if len(resident) == frames:
+                while True:
+                    negative_next, victim = heapq.heappop(heap)
+                    # Skip entries superseded by a later reference
+                    if resident.get(victim) == -negative_next:
+                        break
+                del resident[victim]
+        resident[page] = next_use[i]
+        heapq.heappush(heap, (-next_use[i], page))
+    return faults
+
+
+REPLACEMENT_POLICIES = {
+    "fifo": simulate_fifo,
+    "lru": simulate_lru,
+    "clock": simulate_clock,
+    "second_chance": simulate_second_chance,
+    "opt": simulate_opt,
+}
+
+
+def count_faults(refs, frames, policy="lru"):
+    if frames <= 0:
+        raise ValueError("frames must be positive")
+    return int(np.count_nonzero(REPLACEMENT_POLICIES[policy](refs, frames)))
+
+
+def lru_stack_distances(refs):
+    """LRU stack distance of every reference in one pass (0 for a first touch).
+
+    A page's distance is the number of distinct pages touched since its last
+    use, plus one. A Fenwick tree over time marks only each page's latest
+    reference, so the distance is a prefix-sum difference: O(n log n).
+    """
+    refs = np.asarray(refs).tolist()
+    n = len(refs)
+    tree = [0] * (n + 1)
+    last_seen = {}
+    distances = [0] * n
+    # The tree updates are inlined; this loop dominates for long strings
+    for i, page in enumerate(refs):
+        previous = last_seen.get(page)
+        if previous is not None:
+            # Marked positions in (previous, i)
+            count = 1
+            position = i
+            while position > 0:
+                count += tree[position]
+                position &= position - 1
+            position = previous + 1
+            while position > 0:
+                count -= tree[position]
+                position &= position - 1
+            distances[i] = count
+            position = previous + 1
+            while position <= n:
+                tree[position] -= 1
+                position += position & -position
+        position = i + 1
+        while position <= n:
+            tree[position] += 1
+            position += position & -position
+        last_seen[page] = i
+    return np.array(distances, dtype=np.int64)
+
+
+def fault_curve(refs, frame_counts, policy="lru"):
+    """{frames: faults} for every frame count.
+
+    LRU is a stack algorithm, so all frame counts come from one pass of
+    stack distances: a reference faults with k frames exactly when its
+    distance is 0 or greater than k. Other policies are simulated per count.
+    """
+    frame_counts = list(frame_counts)
+    if policy != "lru":
+        return {frames: count_faults(refs, frames, policy) for frames in frame_counts}
+    distances = lru_stack_distances(refs)
+    cold = int(np.count_nonzero(distances == 0))
+    # hits_within[k] = references with 1 <= distance <= k
+    hits_within = np.cumsum(np.bincount(distances, minlength=max(frame_counts, default=0) + 1))
+    hits_within -= cold
+    return {frames: len(distances) - int(hits_within[min(frames, len(hits_within) - 1)])
+            for frames in frame_counts}
+
+
+def load_reference_string(path):
+    if path.endswith('.npy'):
+        return np.load(path)
+    return np.loadtxt(path, dtype=np.int64, ndmin=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Page fault rates for a reference string across frame counts")
+    parser.add_argument('refs', help=".npy array or whitespace-separated page numbers")
+    parser.add_argument('--frames', type=int, nargs='+', default=[4, 8, 16, 32, 64])
+    parser.add_argument('--policies', nargs='+', default=list(REPLACEMENT_POLICIES),
+                        choices=list(REPLACEMENT_POLICIES))
+    args = parser.parse_args(argv)
+
+    refs = load_reference_string(args.refs)
+    print("policy".ljust(14) + "".join(f"{frames:>10}" for frames in args.frames))
+    for policy in args.policies:
+        curve = fault_curve(refs, args.frames, policy)
+        rates = (curve[frames] / len(refs) * 100 if len(refs) else 0.0 for frames in args.frames)
+        print(policy.ljust(14) + "".join(f"{rate:>9.2f}%" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
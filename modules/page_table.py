@@ -0,0 +1,154 @@
+import numpy as np
+
+ENTRY_BYTES = 8
+
+
+class MultiLevelPageTable:
+    """Hierarchical page table where only subtables that map something exist.
+
+    A virtual page number is split into levels fields of bits_per_level bits,
+    root first; the defaults (4 x 9 bits with 4 KiB pages) cover a 48-bit
+    virtual address space like x86-64. Tables are kept per level in dicts
+    keyed by the vpn prefix that selects them, so memory grows with the
+    number of mapped regions rather than the size of the address space.
+    """
+
+    def __init__(self, levels=4, bits_per_level=9, page_size=4096):
+        if not 2 <= levels <= 4:
+            raise ValueError("levels must be between 2 and 4")
+        self.levels = levels
+        self.bits_per_level = bits_per_level
+        self.page_size = page_size
+        self.entries_per_table = 1 << bits_per_level
+        self.max_vpn = 1 << (levels * bits_per_level)
+        # _tables[level][prefix]: leaf tables hold frame numbers (-1 unmapped),
+        # upper tables flag which child tables exist
+        self._tables = [{} for _ in range(levels)]
+        self._tables[0][0] = self._new_table(0)
+        self.mapped = 0
+
+    @property
+    def virtual_bits(self):
+        return self.levels * self.bits_per_level + int(self.page_size).bit_length() - 1
+
+    def _new_table(self, level):
+        if level == self.levels - 1:
+            return np.full(self.entries_per_table, -1, dtype=np.int64)
+        return np.zeros(self.entries_per_table, dtype=bool)
+
+    def _prefix(self, vpns, level):
+        """Key of the level-`level` table on each vpn's walk"""
+        return vpns >> (self.bits_per_level * (self.levels - level))
+
+    def _index(self, vpns, level):
+        return (vpns >> (self.bits_per_level * (self.levels - 1 - level))) & (self.entries_per_table - 1)
+
+    @staticmethod
+    def _groups(prefixes):
+        """(prefix, positions) for each distinct prefix, via one stable sort"""
+        order = np.argsort(prefixes, kind='stable')
+        unique, starts = np.unique(prefixes[order], return_index=True)
+        return zip(unique.tolist(), np.split(order, starts[1:]))
+
+    def _check(self, vpns):
+        vpns = np.atleast_1d(np.asarray(vpns, dtype=np.int64))
+        if len(vpns) and (vpns.min() < 0 or vpns.max() >= self.max_vpn):
+            raise ValueError(f"Virtual page numbers must be below {self.max_vpn}")
+        return vpns
+
+    def map(self, vpns, frames):
+        """Maps each vpn to its frame, creating missing subtables along the way"""
+        vpns = self._check(vpns)
+        frames = np.broadcast_to(np.asarray(frames, dtype=np.int64), vpns.shape)
+        if len(frames) and frames.min() < 0:
+            raise ValueError("Frame numbers must be non-negative")
+        for level in range(1, self.levels):
+            tables = self._tables[level]
+            for prefix in np.unique(self._prefix(vpns, level)).tolist():
+                if prefix not in tables:
+                    tables[prefix] = self._new_table(level)
+                    parent = self._tables[level - 1][prefix >> self.bits_per_level]
+                    parent[prefix & (self.entries_per_table - 1)] = True
+
+        leaves = self._tables[-1]
+        indexes = self._index(vpns, self.levels - 1)
+        for prefix, positions in self._groups(self._prefix(vpns, self.levels - 1)):
+            table = leaves[prefix]
+            slots = indexes[positions]
+            self.mapped += int(np.count_nonzero(table[np.unique(slots)] < 0))
+            table[slots] = frames[positions]
+        return self
+
+    def unmap(self, vpns):
+        """Clears mappings and frees subtables left empty"""
+        vpns = self._check(vpns)
+        leaves = self._tables[-1]
+        indexes = self._index(vpns, self.levels - 1)
+        emptied = []
+        for prefix, positions in self._groups(self._prefix(vpns, self.levels - 1)):
+            table = leaves.get(prefix)
+            if table is None:
+                continue
+            slots = np.unique(indexes[positions])
+            self.mapped -= int(np.count_nonzero(table[slots] >= 0))
+            table[slots] = -1
+            if not np.any(table >= 0):
+                emptied.append(prefix)
+
+        # Free empty tables bottom-up; the root always stays
+        for level in range(self.levels - 1, 0, -1):
+            parents = set()
+            for prefix in emptied:
+                del self._tables[level][prefix]
+                parent = self._tables[level - 1][prefix >> self.bits_per_level]
+                parent[prefix & (self.entries_per_table - 1)] = False
+                if level > 1 and not parent.any():
+                    parents.add(prefix >> self.bits_per_level)
+            emptied = parents
+        return self
+
+    def lookup(self, vpns):
+        """Returns (frames, walk lengths) for a batch of vpns.
+
+        Unmapped pages get frame -1. The walk length is the number of table
+        entries read, stopping at the first level whose entry is empty.
+        """
+        vpns = self._check(vpns)
+        walks = np.ones(len(vpns), dtype=np.int64)
+        present = np.ones(len(vpns), dtype=bool)
+        for level in range(1, self.levels):
+            prefixes = self._prefix(vpns, level)
+            unique, inverse = np.unique(prefixes, return_inverse=True)
+            exists = np.fromiter((prefix in self._tables[level] for prefix in unique.tolist()),
+                                 dtype=bool, count=len(unique))
+            present &= exists[inverse.reshape(-1)]
+            walks += present
+
+        frames = np.full(len(vpns), -1, dtype=np.int64)
+        leaves = self._tables[-1]
+        walked = np.flatnonzero(present)
+        indexes = self._index(vpns[walked], self.levels - 1)
+        for prefix, positions in self._groups(self._prefix(vpns[walked], self.levels - 1)):
+            frames[walked[positions]] = leaves[prefix][indexes[positions]]
+        return frames, walks
+
+    def table_count(self):
+        return sum(len(tables) for tables in self._tables)
+
+    def overhead_bytes(self):
+        """Memory the tables would occupy with ENTRY_BYTES-sized entries"""
+        return self.table_count() * self.entries_per_table * ENTRY_BYTES
+
+    def flat_overhead_bytes(self):
+        """Size of a single-level table covering the same address space"""
+        return self.max_vpn * ENTRY_BYTES
+
+    def stats(self):
+        return {
+            'levels': self.levels,
+            'mapped_pages': self.mapped,
+            'tables': self.table_count(),
+            'tables_per_level': [len(tables) for tables in self._tables],
+            'overhead_bytes': self.overhead_bytes(),
+            'flat_overhead_bytes': self.flat_overhead_bytes(),
+        }
@@ -0,0 +1,119 @@
+from bisect import bisect_left
+
+DEFAULT_SIZE_CLASSES = (8, 16, 32, 64, 128)
+
+
+class Slab:
+    __slots__ = ("start", "free_slots", "in_use")
+
+    def __init__(self, start, capacity):
+        self.start = start
+        self.free_slots = list(range(capacity - 1, -1, -1))  # Lowest slot on top
+        self.in_use = 0
+
+
+class SlabCache:
+    """Objects of one size class carved out of fixed-size slabs.
+
+    Slabs move between the empty, partial and full dicts as objects come and
+    go, so allocating and freeing an object are both O(1).
+    """
+
+    def __init__(self, object_size, slab_size):
+        self.object_size = object_size
+        self.slab_size = slab_size
+        self.objects_per_slab = slab_size // object_size
+        self.empty = {}
+        self.partial = {}
+        self.full = {}
+        self.objects_in_use = 0
+        self.requested_units = 0
+
+    def add_slab(self, start):
+        self.empty[start] = Slab(start, self.objects_per_slab)
+
+    def claim(self, start, slot, size):
+        """Marks a specific slot of an existing slab as in use (used when restoring)"""
+        slab = self.empty.pop(start, None) or self.partial.pop(start)
+        slab.free_slots.remove(slot)
+        slab.in_use += 1
+        if slab.free_slots:
+            self.partial[start] = slab
+        else:
+            self.full[start] = slab
+        self.objects_in_use += 1
+        self.requested_units += size
+        return slab
+
+    def alloc(self, size):
+        """Returns (slab, slot) for a new object, or None if a slab must be added"""
+        if self.partial:
+            slab = next(reversed(self.partial.values()))
+        elif self.empty:
+            _, slab = self.empty.popitem()
+            self.partial[slab.start] = slab
+        else:
+            return None
+
+        slot = slab.free_slots.pop()
+        slab.in_use += 1
+        if not slab.free_slots:
+            del self.partial[slab.start]
+            self.full[slab.start] = slab
+        self.objects_in_use += 1
+        self.requested_units += size
+        return slab, slot
+
+    def free(self, slab, slot, size):
+        if not slab.free_slots:
+            del self.full[slab.start]
+            self.partial[slab.start] = slab
+        slab.free_slots.append(slot)
+        slab.in_use -= 1
+        if slab.in_use == 0:
+            del self.partial[slab.start]
+            self.empty[slab.start] = slab
+        self.objects_in_use -= 1
+        self.requested_units -= size
+
+    def reclaim(self, keep=1):
+        """Drops empty slabs beyond keep and returns their start addresses"""
+        starts = []
+        while len(self.empty) > keep:
+            start, _ = self.empty.popitem()
+            starts.append(start)
+        return starts
+
+    def stats(self):
+        slabs = len(self.empty) + len(self.partial) + len(self.full)
+        capacity = slabs * self.objects_per_slab
+        in_use = self.objects_in_use
+        return {
+            'object_size': self.object_size,
+            'slabs': slabs,
+            'empty_slabs': len(self.empty),
+            'partial_slabs': len(self.partial),
+            'full_slabs': len(self.full),
+            'objects_in_use': in_use,
+            'capacity': capacity,
+            'occupancy_percentage': (in_use / capacity * 100) if capacity else 0,
+            # Unused slots, slab tails and rounding of requests up to the class size
+            'waste': slabs * self.slab_size - self.requested_units,
+        }
+
+
+class SlabAllocator:
+    def __init__(self, size_classes=DEFAULT_SIZE_CLASSES, slab_size=512):
+        self.size_classes = sorted(size for size in size_classes if size <= slab_size)
+        self.slab_size = slab_size
+        self.caches = [SlabCache(size, slab_size) for size in self.size_classes]
+
+    def cache_for(self, size):
+        """Smallest size class holding size units, or None for large requests"""
+        index = bisect_left(self.size_classes, size)
+        if index == len(self.caches):
+            return None
+        return self.caches[index]
+
+    def stats(self):
+        return [cache.stats() for cache in self.caches]
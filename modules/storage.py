@@ -0,0 +1,574 @@
+import heapq
+import weakref
+import numpy as np
+from .ordered_set import OrderedSet
+
+# Narrowest first; CompactStorage widens its handle array only when it must
+OWNER_DTYPES = (np.uint8, np.uint16, np.uint32)
+
+
+class DenseSnapshot:
+    """Copy-on-write image of a DenseStorage at one point in time.
+
+    Nothing is copied up front; the storage saves a chunk's old contents into
+    every live snapshot just before it first overwrites that chunk, and the
+    same saved copy is shared by all snapshots that still need it.
+    """
+
+    def __init__(self, storage, version):
+        self._storage = storage
+        self.version = version
+        self.chunks = {}
+        storage._snapshots.add(self)
+
+    def _chunk(self, chunk):
+        saved = self.chunks.get(chunk)
+        if saved is not None:
+            return saved
+        size = self._storage.CHUNK_SIZE
+        return self._storage.array[chunk*size:(chunk+1)*size]
+
+    def _decode(self, values):
+        return values
+
+    def window(self, start=0, stop=None):
+        if stop is None:
+            stop = self._storage.total_memory
+        out = self._storage.array[start:stop].copy()
+        size = self._storage.CHUNK_SIZE
+        for chunk in range(start // size, (stop - 1) // size + 1) if stop > start else ():
+            saved = self.chunks.get(chunk)
+            if saved is not None:
+                lo, hi = max(start, chunk * size), min(stop, chunk * size + len(saved))
+                out[lo-start:hi-start] = saved[lo-chunk*size:hi-chunk*size]
+        return self._decode(out)
+
+    def diff(self, other=None):
+        """Addresses whose owner differs from other (default: the live storage)"""
+        chunks = set(self.chunks) | (set(other.chunks) if other is not None else set())
+        size = self._storage.CHUNK_SIZE
+        changed = []
+        for chunk in sorted(chunks):
+            if other is not None:
+                theirs = other._decode(other._chunk(chunk))
+            else:
+                theirs = self._storage.decode(self._storage.array[chunk*size:(chunk+1)*size])
+            changed.append(np.flatnonzero(self._decode(self._chunk(chunk)) != theirs) + chunk * size)
+        return np.concatenate(changed) if changed else np.empty(0, dtype=np.intp)
+
+    @property
+    def nbytes(self):
+        return sum(saved.nbytes for saved in self.chunks.values())
+
+    def release(self):
+        self._storage._snapshots.discard(self)
+        self.chunks = {}
+
+
+class CompactSnapshot(DenseSnapshot):
+    """DenseSnapshot of a CompactStorage; keeps the handle table of its moment"""
+
+    def __init__(self, storage, version):
+        super().__init__(storage, version)
+        self._table = storage.owner_table()
+
+    def _decode(self, values):
+        return self._table[values]
+
+
+class OwnerView:
+    """Live, read-only view of a CompactStorage range that reads as process ids.
+
+    Indexing decodes only the selected units; whole-range operations
+    (comparisons, np.asarray, copy) decode the range once.
+    """
+
+    def __init__(self, storage, start, stop):
+        self._storage = storage
+        self._start = start
+        self._stop = min(stop, storage.total_memory)
+
+    def _handles(self):
+        # Looked up on every access since widening replaces the array
+        return self._storage.array[self._start:self._stop]
+
+    def __len__(self):
+        return max(self._stop - self._start, 0)
+
+    @property
+    def shape(self):
+        return (len(self),)
+
+    def __getitem__(self, key):
+        return self._storage.decode(self._handles()[key])
+
+    def __setitem__(self, key, value):
+        raise ValueError("assignment destination is read-only")
+
+    def __array__(self, dtype=None, copy=None):
+        values = self._storage.decode(self._handles())
+        return values if dtype is None else values.astype(dtype)
+
+    def __iter__(self):
+        return iter(self.copy())
+
+    def __eq__(self, other):
+        return self.copy() == other
+
+    def __ne__(self, other):
+        return self.copy() != other
+
+    def copy(self):
+        """Decoded array of the range, detached from the storage"""
+        return self._storage.decode(self._handles())
+
+
+class ExtentSnapshot:
+    """Frozen copy of an ExtentStorage's extent list"""
+
+    def __init__(self, storage, version):
+        self.version = version
+        self._live = storage
+        self._storage = ExtentStorage(storage.total_memory)
+        self._storage._starts = storage._starts.copy()
+        self._storage._extents = dict(storage._extents)
+        self._storage._used = storage._used
+
+    def window(self, start=0, stop=None):
+        if stop is None:
+            stop = self._storage.total_memory
+        return self._storage.window(start, stop)
+
+    def diff(self, other=None):
+        """Addresses whose owner differs from other (default: the live storage).
+
+        Both extent lists are already sorted, so they are merged run by run
+        and only the differing ranges are expanded into addresses.
+        """
+        theirs = (other._storage if other is not None else self._live).runs(0, self._storage.total_memory)
+        ours = self._storage.runs(0, self._storage.total_memory)
+        changed = []
+        i = j = 0
+        position = 0
+        while i < len(ours) and j < len(theirs):
+            our_start, our_size, our_owner = ours[i]
+            their_start, their_size, their_owner = theirs[j]
+            end = min(our_start + our_size, their_start + their_size)
+            if our_owner != their_owner:
+                changed.append(np.arange(position, end))
+            position = end
+            if end == our_start + our_size:
+                i += 1
+            if end == their_start + their_size:
+                j += 1
+        return np.concatenate(changed) if changed else np.empty(0, dtype=np.intp)
+
+    def release(self):
+        self._storage.clear_all()
+
+
+class DenseStorage:
+    """Ownership kept as one integer per memory unit (0 = free)"""
+
+    SCATTER_LIMIT = 4096
+    CHUNK_SIZE = 4096  # Copy-on-write granularity for snapshots
+
+    def __init__(self, total_memory):
+        self.total_memory = total_memory
+        self.array = np.zeros(total_memory, dtype=int)
+        self.version = 0
+        self._snapshots = weakref.WeakSet()
+
+    def _preserve(self, first_chunk, last_chunk):
+        # Save chunks about to change into every live snapshot lacking them
+        self.version += 1
+        if not self._snapshots:
+            return
+        snapshots = list(self._snapshots)
+        for chunk in range(first_chunk, last_chunk + 1):
+            saved = None
+            for snapshot in snapshots:
+                if chunk not in snapshot.chunks:
+                    if saved is None:
+                        saved = self.array[chunk*self.CHUNK_SIZE:(chunk+1)*self.CHUNK_SIZE].copy()
+                    snapshot.chunks[chunk] = saved
+
+    def _preserve_range(self, start, size):
+        if size > 0:
+            self._preserve(start // self.CHUNK_SIZE, (start + size - 1) // self.CHUNK_SIZE)
+
+    def assign(self, start, size, owner):
+        self._preserve_range(start, min(size, self.total_memory - start))
+        self.array[start:start+size] = owner
+
+    def clear(self, start, size):
+        self._preserve_range(start, min(size, self.total_memory - start))
+        self.array[start:start+size] = 0
+
+    def clear_all(self):
+        self._preserve_range(0, self.total_memory)
+        self.array.fill(0)
+
+    def assign_many(self, starts, sizes, owners):
+        starts = np.asarray(starts, dtype=np.int64)
+        sizes = np.minimum(np.asarray(sizes, dtype=np.int64), self.total_memory - starts)
+        owners = np.asarray(owners)
+        self.version += 1
+        if self._snapshots:
+            written = sizes > 0
+            first = starts[written] // self.CHUNK_SIZE
+            last = (starts[written] + sizes[written] - 1) // self.CHUNK_SIZE
+            for chunk_first, chunk_last in set(zip(first.tolist(), last.tolist())):
+                self._preserve(chunk_first, chunk_last)
+
+        # Long ranges are cheapest as slices; short ones go in one scatter
+        long_ranges = sizes > self.SCATTER_LIMIT
+        for start, size, owner in zip(starts[long_ranges], sizes[long_ranges], owners[long_ranges]):
+            self.array[start:start+size] = owner
+        short = ~long_ranges & (sizes > 0)
+        starts, sizes, owners = starts[short], sizes[short], owners[short]
+        if len(starts):
+            offsets = np.cumsum(sizes) - sizes
+            index = np.arange(int(sizes.sum())) + np.repeat(starts - offsets, sizes)
+            self.array[index] = np.repeat(owners, sizes)
+
+    def clear_many(self, starts, sizes):
+        self.assign_many(starts, sizes, np.zeros(len(starts), dtype=int))
+
+    def window(self, start, stop):
+        return self.array[start:stop].copy()
+
+    def view(self, start, stop):
+        view = self.array[start:stop]
+        view.flags.writeable = False
+        return view
+
+    def snapshot(self):
+        return DenseSnapshot(self, self.version)
+
+    def runs(self, start, stop):
+        """(start, size, owner) for each run of equal ownership in [start, stop).
+
+        Boundaries are found on the raw array and only one value per run is
+        decoded, so renderers never materialise a per-unit owner array.
+        """
+        values = self.array[start:stop]
+        if not len(values):
+            return []
+        run_starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+        sizes = np.diff(np.append(run_starts, len(values)))
+        owners = self.decode(values[run_starts])
+        return list(zip((run_starts + start).tolist(), sizes.tolist(), owners.tolist()))
+
+    def owners_at(self, addresses):
+        return self.decode(self.array[np.asarray(addresses, dtype=np.int64)])
+
+    def count_used(self):
+        return int(np.count_nonzero(self.array))
+
+    def owners(self):
+        """The ownership array with process ids as values"""
+        return self.array
+
+    def decode(self, values):
+        return values
+
+    def release_owner(self, owner):
+        pass
+
+
+class CompactStorage(DenseStorage):
+    """DenseStorage holding small interned handles instead of process ids.
+
+    Any hashable process id (e.g. "P1") is interned to a handle 1..n, and
+    the array starts as uint8, widening to uint16/uint32 only while that
+    many owners are live, so whole-array passes touch 1-4 bytes per unit
+    instead of 8. Released handles are reused lowest first; when the live
+    count falls well below a narrower type's range the handles are
+    renumbered and the array narrowed again.
+    """
+
+    def __init__(self, total_memory):
+        self.total_memory = total_memory
+        self.version = 0
+        self._snapshots = weakref.WeakSet()
+        self._reset_handles()
+
+    def _reset_handles(self):
+        self.array = np.zeros(self.total_memory, dtype=OWNER_DTYPES[0])
+        self._handles = {}  # owner -> handle
+        self._owners = [0]  # handle -> owner, 0 for free/unused handles
+        self._free_handles = []
+        self._table = None
+
+    def _intern(self, owner):
+        handle = self._handles.get(owner)
+        if handle is not None:
+            return handle
+        if self._free_handles:
+            handle = heapq.heappop(self._free_handles)
+            self._owners[handle] = owner
+        else:
+            handle = len(self._owners)
+            self._owners.append(owner)
+            if handle > np.iinfo(self.array.dtype).max:
+                self._set_dtype(next(dtype for dtype in OWNER_DTYPES if np.iinfo(dtype).max >= handle))
+        self._handles[owner] = handle
+        self._table = None
+        return handle
+
+    def _set_dtype(self, dtype):
+        # Snapshots read unsaved chunks from the live array, so give them copies first
+        self._preserve_range(0, self.total_memory)
+        self.array = self.array.astype(dtype)
+
+    def release_owner(self, owner):
+        """Frees owner's handle; its units must already be cleared"""
+        handle = self._handles.pop(owner, None)
+        if handle is None:
+            return
+        self._owners[handle] = 0
+        heapq.heappush(self._free_handles, handle)
+        self._table = None
+        narrower = OWNER_DTYPES[max(OWNER_DTYPES.index(self.array.dtype.type) - 1, 0)]
+        if narrower != self.array.dtype.type and len(self._handles) <= np.iinfo(narrower).max // 2:
+            self._renumber(narrower)
+
+    def _renumber(self, dtype):
+        owners = list(self._handles)
+        mapping = np.zeros(len(self._owners), dtype=dtype)
+        mapping[[self._handles[owner] for owner in owners]] = np.arange(1, len(owners) + 1)
+        self._preserve_range(0, self.total_memory)
+        self.array = mapping[self.array]
+        self._handles = {owner: handle for handle, owner in enumerate(owners, 1)}
+        self._owners = [0] + owners
+        self._free_handles = []
+        self._table = None
+
+    def owner_table(self):
+        """Array mapping each handle to its owner"""
+        if self._table is None:
+            try:
+                self._table = np.array(self._owners, dtype=np.int64)
+            except (TypeError, ValueError):
+                self._table = np.empty(len(self._owners), dtype=object)
+                self._table[:] = self._owners
+        return self._table
+
+    def decode(self, values):
+        return self.owner_table()[values]
+
+    def assign(self, start, size, owner):
+        super().assign(start, size, self._intern(owner))
+
+    def assign_many(self, starts, sizes, owners):
+        handles = [self._intern(owner) for owner in np.asarray(owners).tolist()]
+        super().assign_many(starts, sizes, np.array(handles, dtype=self.array.dtype))
+
+    def clear_many(self, starts, sizes):
+        super().assign_many(starts, sizes, np.zeros(len(starts), dtype=self.array.dtype))
+
+    def clear_all(self):
+        self._preserve_range(0, self.total_memory)
+        self._reset_handles()
+
+    def window(self, start, stop):
+        return self.decode(self.array[start:stop])
+
+    def view(self, start, stop):
+        return OwnerView(self, start, stop)
+
+    def owners(self):
+        # Lazy and read-only: sim.memory[i] decodes one unit, not the whole array
+        return self.view(0, self.total_memory)
+
+    def snapshot(self):
+        return CompactSnapshot(self, self.version)
+
+
+class MemmapStorage(DenseStorage):
+    """Dense ownership array kept in a memory-mapped file.
+
+    Address spaces larger than RAM work because whole-array passes are done
+    in chunks, letting the OS page the file in and out as needed. Opening an
+    existing file with mode='r+' resumes from its contents.
+    """
+
+    PASS_CHUNK = 1 << 22
+
+    def __init__(self, total_memory, path, mode='w+'):
+        self.total_memory = total_memory
+        self.path = path
+        self.array = np.memmap(path, dtype=np.int64, mode=mode, shape=(total_memory,))
+        self.version = 0
+        self._snapshots = weakref.WeakSet()
+
+    def clear_all(self):
+        self._preserve_range(0, self.total_memory)
+        for start in range(0, self.total_memory, self.PASS_CHUNK):
+            self.array[start:start+self.PASS_CHUNK] = 0
+
+    def count_used(self):
+        return sum(int(np.count_nonzero(self.array[start:start+self.PASS_CHUNK]))
+                   for start in range(0, self.total_memory, self.PASS_CHUNK))
+
+    def flush(self):
+        self.array.flush()
+
+
+class ExtentStorage:
+    """Ownership kept as sorted (start, end, owner) extents.
+
+    Extent starts live in an OrderedSet, so adding, removing and locating
+    an extent take O(log extents) time however many allocations exist.
+    Memory use is proportional to the number of allocations rather than the
+    size of the address space, so very large spaces (2^40 units and beyond)
+    can be simulated. Dense arrays are only built for a requested window.
+    """
+
+    def __init__(self, total_memory):
+        self.total_memory = total_memory
+        self._starts = OrderedSet(seed=total_memory)
+        self._extents = {}  # start -> (end, owner)
+        self._used = 0
+        self.version = 0
+
+    @property
+    def array(self):
+        raise ValueError("Extent storage has no dense array; use window(start, stop)")
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __iter__(self):
+        for start in self._starts:
+            end, owner = self._extents[start]
+            yield start, end - start + 1, owner
+
+    def _add(self, start, end, owner):
+        self.version += 1
+        self._starts.add(start)
+        self._extents[start] = (end, owner)
+        self._used += end - start + 1
+
+    def _pop(self, start):
+        self.version += 1
+        self._starts.remove(start)
+        end, owner = self._extents.pop(start)
+        self._used -= end - start + 1
+        return start, end, owner
+
+    def _overlapping(self, start, stop):
+        """Starts of the extents overlapping [start, stop), in address order"""
+        first = self._starts.floor(start)
+        if first is None or self._extents[first][0] < start:
+            first = start
+        for s in self._starts.irange(first):
+            if s >= stop:
+                return
+            yield s
+
+    def assign(self, start, size, owner):
+        size = min(size, self.total_memory - start)
+        if size <= 0:
+            return
+        self.clear(start, size)
+        end = start + size - 1
+
+        # Merge with same-owner neighbours so adjacent pages stay one extent
+        right = self._starts.ceiling(start)
+        if right is not None:
+            right_end, right_owner = self._extents[right]
+            if right == end + 1 and right_owner == owner:
+                self._pop(right)
+                end = right_end
+        left = self._starts.floor(start)
+        if left is not None:
+            left_end, left_owner = self._extents[left]
+            if left_end == start - 1 and left_owner == owner:
+                self._pop(left)
+                start = left
+        self._add(start, end, owner)
+
+    def clear(self, start, size):
+        size = min(size, self.total_memory - start)
+        if size <= 0:
+            return
+        end = start + size - 1
+        for s in list(self._overlapping(start, end + 1)):
+            s, e, owner = self._pop(s)
+            if s < start:
+                self._add(s, start - 1, owner)
+            if e > end:
+                self._add(end + 1, e, owner)
+
+    def clear_all(self):
+        self._starts.clear()
+        self._extents = {}
+        self._used = 0
+        self.version += 1
+
+    def assign_many(self, starts, sizes, owners):
+        for start, size, owner in zip(starts, sizes, owners):
+            self.assign(int(start), int(size), owner)
+
+    def clear_many(self, starts, sizes):
+        for start, size in zip(starts, sizes):
+            self.clear(int(start), int(size))
+
+    def window(self, start, stop):
+        out = np.zeros(max(stop - start, 0), dtype=int)
+        for s in self._overlapping(start, stop):
+            e, owner = self._extents[s]
+            out[max(s, start) - start:min(e + 1, stop) - start] = owner
+        return out
+
+    def view(self, start, stop):
+        # No dense array to alias, so the window is built and frozen
+        view = self.window(start, stop)
+        view.flags.writeable = False
+        return view
+
+    def snapshot(self):
+        return ExtentSnapshot(self, self.version)
+
+    def runs(self, start, stop):
+        runs = []
+        position = start
+        for s in self._overlapping(start, stop):
+            e, owner = self._extents[s]
+            s, e = max(s, start), min(e, stop - 1)
+            if s > position:
+                runs.append((position, s - position, 0))
+            runs.append((s, e - s + 1, owner))
+            position = e + 1
+        if position < stop:
+            runs.append((position, stop - position, 0))
+        return runs
+
+    def owners_at(self, addresses):
+        owners = []
+        for address in np.asarray(addresses, dtype=np.int64).tolist():
+            start = self._starts.floor(address)
+            owner = 0
+            if start is not None:
+                end, candidate = self._extents[start]
+                owner = candidate if end >= address else 0
+            owners.append(owner)
+        return np.array(owners)
+
+    def count_used(self):
+        return self._used
+
+    def owners(self):
+        return self.array
+
+    def release_owner(self, owner):
+        pass
+
+
+STORAGE_BACKENDS = {
+    "compact": CompactStorage,
+    "dense": DenseStorage,
+    "extent": ExtentStorage,
+}
@@ -0,0 +1,147 @@
+import hashlib
+import itertools
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .compare import run_shared_config, share_workload
+from .memory_simulator import AllocationStrategy
+
+DEFAULT_CACHE_DIR = ".sweep_cache"
+# Simulator arguments a grid may vary, with the values used when a grid omits them
+CONFIG_DEFAULTS = {'page_size': 64, 'storage': 'compact'}
+RELATIVE_IMPORT = re.compile(rb"^from \.(\w+) import", re.MULTILINE)
+
+
+def simulation_sources(entry="compare"):
+    """Sorted names of the package modules entry imports, directly or indirectly"""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    seen = set()
+    pending = [entry]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        with open(os.path.join(package_dir, f"{name}.py"), 'rb') as file:
+            pending.extend(module.decode() for module in RELATIVE_IMPORT.findall(file.read()))
+    return sorted(seen)
+
+
+def code_version():
+    """Hash of the modules a sweep cell runs, so editing e.g. the GUI keeps cached results"""
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in simulation_sources():
+        digest.update(name.encode())
+        with open(os.path.join(package_dir, f"{name}.py"), 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def complete_config(config):
+    """config with defaults filled in, so omitting a parameter and passing its default share a cache key"""
+    unknown = set(config) - set(CONFIG_DEFAULTS) - {'total_memory'}
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    if 'total_memory' not in config:
+        raise ValueError("Sweep configs need a total_memory")
+    return dict(CONFIG_DEFAULTS, **config)
+
+
+def workload_hash(workload):
+    digest = hashlib.sha256()
+    for array in workload[:3]:
+        array = np.ascontiguousarray(array, dtype=np.int64)
+        digest.update(array.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def expand_grid(grid):
+    """{'total_memory': [a, b], 'page_size': [c]} -> list of config dicts"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def cache_key(config, workload_id, strategy, version, sample_every):
+    payload = json.dumps({
+        'config': config,
+        'workload': workload_id,
+        'strategy': strategy.name,
+        'code': version,
+        'sample_every': sample_every,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _load(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _store(path, result):
+    # Write then rename so an interrupted sweep never leaves a torn entry
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(result, file)
+    os.replace(tmp_path, path)
+
+
+def run_sweep(grid, workloads, strategies=None, cache_dir=DEFAULT_CACHE_DIR,
+              sample_every=10000, max_workers=None):
+    """Evaluates every (config, workload, strategy) cell, reusing cached results.
+
+    grid maps MemorySimulator arguments (total_memory, page_size, storage) to
+    lists of values and workloads maps names to (ops, pids, sizes) arrays.
+    Each cell is cached on disk under a hash of its config, the workload
+    contents, the strategy and the simulator source, so only cells that are
+    new or whose inputs changed are recomputed across all cores.
+    """
+    strategies = list(strategies or AllocationStrategy)
+    configs = [complete_config(config) for config in expand_grid(grid)]
+    version = code_version()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    rows = []
+    missing = []
+    for workload_name, workload in workloads.items():
+        workload_id = workload_hash(workload)
+        for config in configs:
+            for strategy in strategies:
+                key = cache_key(config, workload_id, strategy, version, sample_every)
+                path = os.path.join(cache_dir, f"{key}.json")
+                row = dict(config, workload=workload_name)
+                rows.append(row)
+                result = _load(path)
+                if result is None:
+                    missing.append((row, workload_name, config, strategy, path))
+                else:
+                    row.update(result, cached=True)
+
+    if missing:
+        shared = {}
+        try:
+            for _, workload_name, _, _, _ in missing:
+                if workload_name not in shared:
+                    shared[workload_name] = share_workload(workloads[workload_name])
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    (row, path, executor.submit(
+                        run_shared_config, shared[workload_name].name, len(workloads[workload_name][0]),
+                        config['total_memory'], config['page_size'], strategy.name,
+                        config['storage'], sample_every))
+                    for row, workload_name, config, strategy, path in missing
+                ]
+                for row, path, future in futures:
+                    result = future.result()
+                    _store(path, result)
+                    row.update(result, cached=False)
+        finally:
+            for shm in shared.values():
+                shm.close()
+                shm.unlink()
+    return rows
@@ -0,0 +1,165 @@
+import json
+import zlib
+from bisect import bisect_right
+
+
+class ChangeJournal:
+    """Process ids a MemorySimulator touched since the last clear().
+
+    full is set by reset() and restore_state(), after which only a complete
+    keyframe describes the state.
+    """
+
+    def __init__(self):
+        self.pids = set()
+        self.full = False
+
+    def touch(self, process_id):
+        self.pids.add(process_id)
+
+    def touch_all(self):
+        self.full = True
+
+    def clear(self):
+        self.pids = set()
+        self.full = False
+
+
+def _process_row(simulator, process_id):
+    """(kind, allocation, requested size, slab object) or None once freed"""
+    allocation = simulator.processes.get(process_id)
+    if allocation is None:
+        return None
+    if isinstance(allocation, tuple):
+        row = ['segment', list(allocation)]
+    else:
+        row = ['pages', [list(page) for page in allocation]]
+    slab_object = simulator._slab_objects.get(process_id)
+    if slab_object is not None:
+        cache, slab, slot = slab_object
+        slab_object = [cache.object_size, slab.start, slot]
+    return row + [simulator._requested.get(process_id), slab_object]
+
+
+def _slab_rows(simulator):
+    return [[cache.object_size, start]
+            for cache in simulator._slab.caches
+            for slabs in (cache.empty, cache.partial, cache.full)
+            for start in slabs]
+
+
+def _settings(simulator):
+    return [simulator.strategy.name, simulator.compaction_threshold, simulator.compact_on_failure]
+
+
+class Timeline:
+    """Step-by-step record of a simulator's allocator state for rewinding.
+
+    Every keyframe_interval steps (and after a reset or restore) the whole
+    export_state() is stored zlib-compressed; the steps in between keep
+    only the rows of processes that changed, plus the slab list and
+    settings when those differ from the step before. Rebuilding any step
+    therefore decodes one keyframe and applies fewer than keyframe_interval
+    deltas, however long the run is.
+
+    Call record() after each operation; step 0 is the state at creation.
+    """
+
+    def __init__(self, simulator, keyframe_interval=256):
+        if keyframe_interval <= 0:
+            raise ValueError("keyframe_interval must be positive")
+        self.simulator = simulator
+        self.keyframe_interval = keyframe_interval
+        self.labels = []
+        self._deltas = []  # None at keyframe steps
+        self._keyframe_steps = []
+        self._keyframes = []
+        self._last_slabs = None
+        self._last_settings = None
+        simulator.journal = ChangeJournal()
+        simulator.journal.touch_all()
+        self.record("Start")
+
+    def __len__(self):
+        return len(self.labels)
+
+    def record(self, label=""):
+        """Appends the simulator's current state as the next step; returns its index"""
+        simulator = self.simulator
+        journal = simulator.journal
+        step = len(self.labels)
+        slabs = _slab_rows(simulator)
+        settings = _settings(simulator)
+        if journal.full or step - self._keyframe_steps[-1] >= self.keyframe_interval:
+            state = json.dumps(simulator.export_state()).encode()
+            self._keyframe_steps.append(step)
+            self._keyframes.append(zlib.compress(state))
+            self._deltas.append(None)
+        else:
+            changes = [(process_id, _process_row(simulator, process_id)) for process_id in journal.pids]
+            self._deltas.append((changes,
+                                 slabs if slabs != self._last_slabs else None,
+                                 settings if settings != self._last_settings else None))
+        self._last_slabs = slabs
+        self._last_settings = settings
+        self.labels.append(label)
+        journal.clear()
+        return step
+
+    def state_at(self, step):
+        """export_state() as it was after the given step"""
+        if not -len(self.labels) <= step < len(self.labels):
+            raise IndexError(f"Step {step} is not on the timeline")
+        step %= len(self.labels)
+        index = bisect_right(self._keyframe_steps, step) - 1
+        state = json.loads(zlib.decompress(self._keyframes[index]))
+        if self._keyframe_steps[index] == step:
+            return state
+
+        processes = {process_id: (kind, allocation) for process_id, kind, allocation in state['processes']}
+        requested = dict(state['requested'])
+        slab_objects = {process_id: rest for process_id, *rest in state['slab_objects']}
+        for changes, slabs, settings in self._deltas[self._keyframe_steps[index] + 1:step + 1]:
+            for process_id, row in changes:
+                processes.pop(process_id, None)
+                requested.pop(process_id, None)
+                slab_objects.pop(process_id, None)
+                if row is None:
+                    continue
+                kind, allocation, size, slab_object = row
+                processes[process_id] = (kind, allocation)
+                if size is not None:
+                    requested[process_id] = size
+                if slab_object is not None:
+                    slab_objects[process_id] = slab_object
+            if slabs is not None:
+                state['slabs'] = slabs
+            if settings is not None:
+                state['strategy'], state['compaction_threshold'], state['compact_on_failure'] = settings
+
+        state['processes'] = [[process_id, kind, allocation] for process_id, (kind, allocation) in processes.items()]
+        state['requested'] = [[process_id, size] for process_id, size in requested.items()]
+        state['slab_objects'] = [[process_id] + rest for process_id, rest in slab_objects.items()]
+        return state
+
+    def restore(self, simulator, step):
+        """Loads the given step into simulator (e.g. a second one used for previews)"""
+        simulator.restore_state(self.state_at(step))
+        return simulator
+
+    def rewind(self, step):
+        """Returns the tracked simulator to step and forgets every later step"""
+        step %= len(self.labels)
+        self.simulator.restore_state(self.state_at(step))
+        kept = bisect_right(self._keyframe_steps, step)
+        del self._keyframe_steps[kept:], self._keyframes[kept:]
+        del self.labels[step + 1:], self._deltas[step + 1:]
+        self._last_slabs = _slab_rows(self.simulator)
+        self._last_settings = _settings(self.simulator)
+        self.simulator.journal.clear()
+
+    def memory_usage(self):
+        """Approximate bytes held: compressed keyframes plus delta row counts"""
+        keyframes = sum(len(keyframe) for keyframe in self._keyframes)
+        rows = sum(len(delta[0]) for delta in self._deltas if delta is not None)
+        return {'keyframes': len(self._keyframes), 'keyframe_bytes': keyframes, 'delta_rows': rows}
@@ -0,0 +1,145 @@
+import random
+from collections import OrderedDict
+import numpy as np
+
+TLB_REPLACEMENT = ("lru", "random")
+
+
+class TLB:
+    """Set-associative translation lookaside buffer tagged with address space ids.
+
+    Entries map (asid, virtual page number) to a frame number, so switching
+    between processes needs no flush. associativity=None makes the TLB fully
+    associative. Timing parameters feed effective_access_time(): a hit costs
+    hit_time + memory_time and a miss additionally walks walk_levels page
+    table levels in memory.
+    """
+
+    def __init__(self, entries=64, associativity=4, replacement="lru",
+                 hit_time=1.0, memory_time=100.0, walk_levels=1, seed=None):
+        associativity = associativity or entries
+        if entries <= 0 or entries % associativity:
+            raise ValueError("entries must be a positive multiple of associativity")
+        if replacement not in TLB_REPLACEMENT:
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        self.entries = entries
+        self.associativity = associativity
+        self.num_sets = entries // associativity
+        self.replacement = replacement
+        self.hit_time = hit_time
+        self.memory_time = memory_time
+        self.walk_levels = walk_levels
+        self._random = random.Random(seed)
+        self.sets = [OrderedDict() for _ in range(self.num_sets)]
+        self.hits = 0
+        self.misses = 0
+
+    def flush(self, asid=None):
+        """Drops every entry, or only those of one address space"""
+        for entries in self.sets:
+            if asid is None:
+                entries.clear()
+            else:
+                for key in [key for key in entries if key[0] == asid]:
+                    del entries[key]
+
+    def lookup_many(self, vpns, frames, asid=0):
+        """Runs a batch of translations; returns the hit mask.
+
+        frames[i] is the frame the page table maps vpns[i] to and is what gets
+        cached on a miss. An access to the same page as the access just
+        before it is always a hit that leaves the LRU order unchanged, so only
+        the first access of each run of repeats is simulated.
+        """
+        vpns = np.asarray(vpns, dtype=np.int64)
+        hits = np.ones(len(vpns), dtype=bool)
+        if not len(vpns):
+            return hits
+        firsts = np.flatnonzero(np.concatenate(([True], vpns[1:] != vpns[:-1])))
+
+        sets = self.sets
+        num_sets = self.num_sets
+        associativity = self.associativity
+        lru = self.replacement == "lru"
+        misses = []
+        for index, vpn, frame in zip(firsts.tolist(), vpns[firsts].tolist(),
+                                     np.asarray(frames)[firsts].tolist()):
+            entries = sets[vpn % num_sets]
+            key = (asid, vpn)
+            if key in entries:
+                if lru:
+                    entries.move_to_end(key)
+                continue
+            misses.append(index)
+            if len(entries) == associativity:
+                if lru:
+                    entries.popitem(last=False)
+                else:
+                    del entries[self._random.choice(list(entries))]
+            entries[key] = frame
+
+        hits[misses] = False
+        self.misses += len(misses)
+        self.hits += len(vpns) - len(misses)
+        return hits
+
+    def access(self, addresses, page_size, page_table, asid=0):
+        """Translates virtual addresses through the TLB and a page table.
+
+        page_table is either a flat array where page_table[vpn] is a frame
+        number (negative for unmapped pages) or a MultiLevelPageTable.
+        Returns (physical addresses, hit mask); unmapped addresses translate
+        to -1, count as misses and are never cached.
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        vpns, offsets = np.divmod(addresses, page_size)
+        frames = np.full(len(addresses), -1, dtype=np.int64)
+        if hasattr(page_table, 'lookup'):
+            mapped = (addresses >= 0) & (vpns < page_table.max_vpn)
+            frames[mapped] = page_table.lookup(vpns[mapped])[0]
+        else:
+            page_table = np.asarray(page_table, dtype=np.int64)
+            mapped = (addresses >= 0) & (vpns < len(page_table))
+            frames[mapped] = page_table[vpns[mapped]]
+        mapped &= frames >= 0
+
+        hits = np.zeros(len(addresses), dtype=bool)
+        hits[mapped] = self.lookup_many(vpns[mapped], frames[mapped], asid)
+        self.misses += int(np.count_nonzero(~mapped))
+        physical = np.where(mapped, frames * page_size + offsets, -1)
+        return physical, hits
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return (self.hits / total * 100) if total else 0.0
+
+    def effective_access_time(self):
+        hit_ratio = self.hit_rate() / 100
+        hit_cost = self.hit_time + self.memory_time
+        miss_cost = hit_cost + self.walk_levels * self.memory_time
+        return hit_ratio * hit_cost + (1 - hit_ratio) * miss_cost
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate(),
+            'effective_access_time': self.effective_access_time(),
+        }
+
+
+def compare_page_sizes(addresses, page_sizes, **tlb_options):
+    """TLB stats for one address stream under each page size, identity-mapped.
+
+    Larger pages cover more of the stream per entry; pair the hit rates with
+    MemorySimulator.get_fragmentation() to weigh translation cost against
+    internal fragmentation.
+    """
+    addresses = np.asarray(addresses, dtype=np.int64)
+    rows = []
+    for page_size in page_sizes:
+        tlb = TLB(**tlb_options)
+        vpns = addresses // page_size
+        tlb.lookup_many(vpns, vpns)
+        rows.append(dict(tlb.stats(), page_size=page_size))
+    return rows
@@ -0,0 +1,164 @@
+import argparse
+import csv
+import sys
+from itertools import islice
+import numpy as np
+from .memory_simulator import MemorySimulator, AllocationStrategy, BatchOp
+
+# Binary traces are a magic header followed by packed fixed-size records
+TRACE_MAGIC = b"MSTRACE1"
+TRACE_DTYPE = np.dtype([('op', 'u1'), ('pid', '<i8'), ('size', '<i8')])
+
+OP_NAMES = {
+    'alloc': BatchOp.ALLOCATE,
+    'allocate': BatchOp.ALLOCATE,
+    'pages': BatchOp.ALLOCATE_PAGES,
+    'free': BatchOp.DEALLOCATE,
+    'deallocate': BatchOp.DEALLOCATE,
+}
+CSV_OP_LABELS = {
+    BatchOp.ALLOCATE: 'alloc',
+    BatchOp.ALLOCATE_PAGES: 'pages',
+    BatchOp.DEALLOCATE: 'free',
+}
+
+
+def is_binary_trace(path):
+    with open(path, 'rb') as file:
+        return file.read(len(TRACE_MAGIC)) == TRACE_MAGIC
+
+
+def _parse_op(value):
+    value = value.strip().lower()
+    if value.isdigit():
+        return BatchOp(int(value))
+    if value not in OP_NAMES:
+        raise ValueError(f"Unknown trace op: {value!r}")
+    return OP_NAMES[value]
+
+
+def read_csv_trace(path, chunk_size=65536):
+    """Yields (ops, pids, sizes) arrays of at most chunk_size rows from an op,pid,size CSV"""
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        first = next(reader, None)
+        if first is None:
+            return
+        # The op,pid,size header line is optional
+        leading = [] if first[0].strip().lower() == 'op' else [first]
+        rows = (row for source in (leading, reader) for row in source if row)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            ops = np.fromiter((_parse_op(row[0]) for row in chunk), dtype=np.uint8, count=len(chunk))
+            pids = np.fromiter((int(row[1]) for row in chunk), dtype=np.int64, count=len(chunk))
+            sizes = np.fromiter((int(row[2]) if len(row) > 2 and row[2].strip() else 0 for row in chunk),
+                                dtype=np.int64, count=len(chunk))
+            yield ops, pids, sizes
+
+
+def read_binary_trace(path, chunk_size=65536):
+    """Yields (ops, pids, sizes) arrays of at most chunk_size records from a binary trace"""
+    with open(path, 'rb') as file:
+        if file.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a binary memory trace")
+        while True:
+            records = np.fromfile(file, dtype=TRACE_DTYPE, count=chunk_size)
+            if not len(records):
+                return
+            yield records['op'], records['pid'], records['size']
+
+
+def read_trace(path, chunk_size=65536):
+    if is_binary_trace(path):
+        return read_binary_trace(path, chunk_size)
+    return read_csv_trace(path, chunk_size)
+
+
+def write_trace(path, chunks, binary=True):
+    """Writes an iterable of (ops, pids, sizes) chunks; returns the record count"""
+    count = 0
+    if binary:
+        with open(path, 'wb') as file:
+            file.write(TRACE_MAGIC)
+            for ops, pids, sizes in chunks:
+                records = np.empty(len(ops), dtype=TRACE_DTYPE)
+                records['op'], records['pid'], records['size'] = ops, pids, sizes
+                records.tofile(file)
+                count += len(records)
+        return count
+
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['op', 'pid', 'size'])
+        for ops, pids, sizes in chunks:
+            labels = [CSV_OP_LABELS[BatchOp(op)] for op in np.asarray(ops).tolist()]
+            writer.writerows(zip(labels, np.asarray(pids).tolist(), np.asarray(sizes).tolist()))
+            count += len(labels)
+    return count
+
+
+def take_sample(simulator, ops_done, failures):
+    external, internal = simulator.get_fragmentation()
+    return {
+        'ops': ops_done,
+        'failures': failures,
+        'utilization': simulator.get_utilization(),
+        'external_fragmentation': external,
+        'internal_fragmentation': internal,
+    }
+
+
+def replay(simulator, chunks, sample_every=10000):
+    """Applies trace chunks to simulator, yielding a sample every sample_every ops.
+
+    Only one chunk is held at a time, so memory stays bounded however long the
+    trace is. A final sample is always emitted at the end of the trace.
+    """
+    if sample_every <= 0:
+        raise ValueError("sample_every must be positive")
+    ops_done = 0
+    failures = 0
+    next_sample = sample_every
+    for ops, pids, sizes in chunks:
+        position = 0
+        while position < len(ops):
+            stop = min(len(ops), position + next_sample - ops_done)
+            succeeded, _ = simulator.apply_ops(ops[position:stop], pids[position:stop], sizes[position:stop])
+            failures += len(succeeded) - int(np.count_nonzero(succeeded))
+            ops_done += stop - position
+            position = stop
+            if ops_done == next_sample:
+                yield take_sample(simulator, ops_done, failures)
+                next_sample += sample_every
+    if ops_done != next_sample - sample_every:
+        yield take_sample(simulator, ops_done, failures)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay an allocation trace through MemorySimulator")
+    parser.add_argument('trace', help="CSV (op,pid,size) or binary trace file")
+    parser.add_argument('--strategy', default='first_fit',
+                        choices=[strategy.name.lower() for strategy in AllocationStrategy])
+    parser.add_argument('--memory', type=int, default=1 << 20, help="Total memory units")
+    parser.add_argument('--page-size', type=int, default=64)
+    parser.add_argument('--storage', default='compact', choices=['compact', 'dense', 'extent'])
+    parser.add_argument('--every', type=int, default=10000, help="Operations between samples")
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    args = parser.parse_args(argv)
+    if args.every <= 0:
+        parser.error("--every must be positive")
+
+    simulator = MemorySimulator(args.memory, args.page_size, storage=args.storage)
+    simulator.set_strategy(AllocationStrategy[args.strategy.upper()])
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['ops', 'failures', 'utilization', 'external_fragmentation', 'internal_fragmentation'])
+    for sample in replay(simulator, read_trace(args.trace, args.chunk_size), args.every):
+        writer.writerow([sample['ops'], sample['failures'], f"{sample['utilization']:.2f}",
+                         f"{sample['external_fragmentation']:.2f}", sample['internal_fragmentation']])
+
+
+if __name__ == "__main__":
+    main()
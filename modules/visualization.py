@@ -1,9 +1,11 @@
+import numpy as np
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                             QPushButton, QLabel, QComboBox, 
-                            QSpinBox, QTextEdit, QTabWidget,QMainWindow)
+                            QSpinBox, QTextEdit, QTabWidget,QMainWindow, QSlider)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QColor, QPainter, QBrush, QFont, QPen
 from .memory_simulator import MemorySimulator, AllocationStrategy
+from .timeline import Timeline
 
 class MemoryVisualizer(QWidget):
     def __init__(self, simulator, parent=None):
@@ -28,72 +30,62 @@ class MemoryVisualizer(QWidget):
         painter.drawRect(self.margin, self.margin, round(width), height)
         
         # Draw memory blocks
-        memory = self.simulator.get_memory_state()
-        
         if self.show_paging:
-            self._draw_pages(painter, width, height, memory)
+            self._draw_pages(painter, width, height)
         else:
-            self._draw_segments(painter, width, height, memory)
+            self._draw_segments(painter, width, height)
             
         # Draw legend
         self._draw_legend(painter)
         
-    def _draw_segments(self, painter, width, height, memory):
+    def _draw_segments(self, painter, width, height):
         total_memory = self.simulator.total_memory
         unit_width = width / total_memory
 
-        current_val = memory[0]
-        start = 0
+        # Runs are found on the raw (compact) array; only one owner per run is decoded
+        for start, size, owner in self.simulator.get_memory_runs():
+            if owner != 0:
+                color = self._get_process_color(owner)
+                painter.fillRect(
+                    round(self.margin + start * unit_width),
+                    self.margin,
+                    round(size * unit_width),
+                    height,
+                    color
+                )
 
-        for i in range(1, total_memory):
-            if memory[i] != current_val or i == total_memory - 1:
-                end = i - 1
-                if current_val != 0:
-                    color = self._get_process_color(current_val)
-                    painter.fillRect(
+                # Draw process ID
+                if size * unit_width > 30:  # Only draw if wide enough
+                    painter.setPen(Qt.black)
+                    font = QFont()
+                    font.setPointSize(8)
+                    painter.setFont(font)
+                    painter.drawText(
                         round(self.margin + start * unit_width),
                         self.margin,
-                        round((end - start + 1) * unit_width),
+                        round(size * unit_width),
                         height,
-                        color
+                        Qt.AlignCenter,
+                        str(owner)
                     )
 
-                    # Draw process ID
-                    if (end - start + 1) * unit_width > 30:  # Only draw if wide enough
-                        painter.setPen(Qt.black)
-                        font = QFont()
-                        font.setPointSize(8)
-                        painter.setFont(font)
-                        painter.drawText(
-                            round(self.margin + start * unit_width),
-                            self.margin,
-                            round((end - start + 1) * unit_width),
-                            height,
-                            Qt.AlignCenter,
-                            str(current_val)
-                        )
-
-                # Draw block border
-                painter.setPen(Qt.black)
-                painter.drawRect(
-                    round(self.margin + start * unit_width),
-                    self.margin,
-                    round((end - start + 1) * unit_width),
-                    height
-                )
-
-                current_val = memory[i]
-                start = i
+            # Draw block border
+            painter.setPen(Qt.black)
+            painter.drawRect(
+                round(self.margin + start * unit_width),
+                self.margin,
+                round(size * unit_width),
+                height
+            )
                 
-    def _draw_pages(self, painter, width, height, memory):
+    def _draw_pages(self, painter, width, height):
         total_memory = self.simulator.total_memory
         page_size = self.simulator.page_size
         unit_width = width / total_memory
 
-        for page_start in range(0, total_memory, page_size):
-            page_end = min(page_start + page_size, total_memory) - 1
-            page_val = memory[page_start]
-
+        page_starts = np.arange(0, total_memory, page_size)
+        page_owners = self.simulator.get_owners_at(page_starts)
+        for page_start, page_val in zip(page_starts.tolist(), page_owners.tolist()):
             if page_val != 0:
                 color = self._get_process_color(page_val)
                 painter.fillRect(
@@ -169,6 +161,9 @@ class SimulationTab(QWidget):
     def __init__(self, simulator, parent=None):
         super().__init__(parent)
         self.simulator = simulator
+        self.timeline = Timeline(simulator)
+        # Past steps are rebuilt here so scrubbing never disturbs the live simulator
+        self.preview = MemorySimulator(simulator.total_memory, simulator.page_size)
         self.init_ui()
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_stats)
@@ -185,6 +180,8 @@ class SimulationTab(QWidget):
         self.strategy_combo.addItem("First Fit", AllocationStrategy.FIRST_FIT)
         self.strategy_combo.addItem("Best Fit", AllocationStrategy.BEST_FIT)
         self.strategy_combo.addItem("Worst Fit", AllocationStrategy.WORST_FIT)
+        self.strategy_combo.addItem("Buddy", AllocationStrategy.BUDDY)
+        self.strategy_combo.addItem("Slab", AllocationStrategy.SLAB)
         self.strategy_combo.currentIndexChanged.connect(self.change_strategy)
         control_layout.addWidget(QLabel("Strategy:"))
         control_layout.addWidget(self.strategy_combo)
@@ -225,6 +222,17 @@ class SimulationTab(QWidget):
         self.visualizer = MemoryVisualizer(self.simulator)
         layout.addWidget(self.visualizer)
         
+        # Timeline scrubber; the right end is the live state
+        timeline_layout = QHBoxLayout()
+        self.step_slider = QSlider(Qt.Horizontal)
+        self.step_slider.setRange(0, 0)
+        self.step_slider.valueChanged.connect(self.show_step)
+        timeline_layout.addWidget(QLabel("Timeline:"))
+        timeline_layout.addWidget(self.step_slider)
+        self.step_label = QLabel("Step 0 / 0")
+        timeline_layout.addWidget(self.step_label)
+        layout.addLayout(timeline_layout)
+        
         # Stats panel
         stats_layout = QHBoxLayout()
         
@@ -248,39 +256,77 @@ class SimulationTab(QWidget):
     def allocate_memory(self):
         process_id = self.process_id_spin.value()
         size = self.size_spin.value()
+        self._leave_past()
         
         if self.view_combo.currentIndex() == 0:  # Segmentation
             success, message = self.simulator.allocate_segment(process_id, size)
         else:  # Paging
             success, message = self.simulator.allocate_pages(process_id, size)
             
-        self.update_display()
+        self._record(message)
         self.visualizer.set_selected_process(process_id if success else None)
         
     def deallocate_memory(self):
         process_id = self.process_id_spin.value()
+        self._leave_past()
         success, message = self.simulator.deallocate(process_id)
-        self.update_display()
+        self._record(message)
         self.visualizer.set_selected_process(None)
         
     def reset_memory(self):
+        self._leave_past()
         self.simulator.reset()
-        self.update_display()
+        self._record("System Reset")
         self.visualizer.set_selected_process(None)
         
+    def _leave_past(self):
+        # Acting while scrubbed back branches the timeline from the shown step
+        step = self.step_slider.value()
+        if step < len(self.timeline) - 1:
+            self.timeline.rewind(step)
+            self.visualizer.simulator = self.simulator
+        
+    def _record(self, label):
+        step = self.timeline.record(label)
+        self.step_slider.blockSignals(True)
+        self.step_slider.setRange(0, step)
+        self.step_slider.setValue(step)
+        self.step_slider.blockSignals(False)
+        self.step_label.setText(f"Step {step} / {step}")
+        self.update_display()
+        
+    def show_step(self, step):
+        last = len(self.timeline) - 1
+        if step == last:
+            self.visualizer.simulator = self.simulator
+        else:
+            self.visualizer.simulator = self.timeline.restore(self.preview, step)
+        self.step_label.setText(f"Step {step} / {last}: {self.timeline.labels[step]}")
+        self.update_display()
+        
     def update_display(self):
         self.visualizer.update()
         self.update_stats()
         
     def update_stats(self):
-        utilization = self.simulator.get_utilization()
-        external_frag, internal_frag = self.simulator.get_fragmentation()
+        # Stats follow the step on screen; the history log stays live
+        simulator = self.visualizer.simulator
+        utilization = simulator.get_utilization()
+        external_frag, internal_frag = simulator.get_fragmentation()
         
         stats_text = (
             f"Memory Utilization: {utilization:.1f}%\n"
             f"External Fragmentation: {external_frag:.1f}%\n"
-            f"Internal Fragmentation: {internal_frag} units"
+            f"Internal Fragmentation: {internal_frag} units\n"
+            f"Largest Free Block: {simulator.largest_free_block()} units"
         )
+        for slab_class in simulator.get_slab_stats():
+            if slab_class['slabs']:
+                stats_text += (
+                    f"\nSlab {slab_class['object_size']}: "
+                    f"{slab_class['occupancy_percentage']:.0f}% of {slab_class['capacity']} objects, "
+                    f"{slab_class['waste']} units wasted"
+                )
         self.stats_label.setText(stats_text)
         
         # Update history
@@ -0,0 +1,95 @@
+import argparse
+import numpy as np
+from .memory_simulator import BatchOp
+from .trace_replay import write_trace
+
+
+def _draw_sizes(rng, count, distribution, params):
+    if distribution == 'uniform':
+        sizes = rng.integers(params.get('low', 1), params.get('high', 256) + 1, count)
+    elif distribution == 'exponential':
+        sizes = rng.exponential(params.get('mean', 64), count)
+    elif distribution == 'lognormal':
+        sizes = rng.lognormal(params.get('mean', 4.0), params.get('sigma', 1.0), count)
+    elif distribution == 'choice':
+        # A handful of fixed object sizes, e.g. {'sizes': [16, 64], 'weights': [0.8, 0.2]}
+        weights = params.get('weights')
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float) / np.sum(weights)
+        sizes = rng.choice(params['sizes'], count, p=weights)
+    else:
+        raise ValueError(f"Unknown size distribution: {distribution}")
+    return np.maximum(np.ceil(sizes), 1).astype(np.int64)
+
+
+def _draw_lifetimes(rng, count, distribution, mean, sigma):
+    if distribution == 'exponential':
+        return rng.exponential(mean, count)
+    if distribution == 'lognormal':
+        # Parameterised so the lifetimes still average to mean
+        return rng.lognormal(np.log(mean) - sigma ** 2 / 2, sigma, count)
+    raise ValueError(f"Unknown lifetime distribution: {distribution}")
+
+
+def generate_workload(num_processes, seed=None, arrival_rate=1.0,
+                      lifetime='exponential', mean_lifetime=50.0, lifetime_sigma=1.0,
+                      size_distribution='uniform', size_params=None,
+                      paged_fraction=0.0, first_pid=1, return_times=False):
+    """Builds a synthetic allocate/free trace entirely with NumPy.
+
+    Processes arrive as a Poisson process with the given rate and live for an
+    exponential or lognormal time; every arrival becomes an allocation and
+    every departure a deallocation, merged in time order. Returns
+    (ops, pids, sizes) arrays ready for MemorySimulator.apply_ops or
+    trace_replay.write_trace, plus the event times if return_times is set.
+    """
+    rng = np.random.default_rng(seed)
+    arrivals = np.cumsum(rng.exponential(1.0 / arrival_rate, num_processes))
+    departures = arrivals + _draw_lifetimes(rng, num_processes, lifetime, mean_lifetime, lifetime_sigma)
+    sizes = _draw_sizes(rng, num_processes, size_distribution, size_params or {})
+    pids = np.arange(first_pid, first_pid + num_processes, dtype=np.int64)
+
+    alloc_ops = np.where(rng.random(num_processes) < paged_fraction,
+                         BatchOp.ALLOCATE_PAGES, BatchOp.ALLOCATE).astype(np.uint8)
+    free_ops = np.full(num_processes, BatchOp.DEALLOCATE, dtype=np.uint8)
+
+    times = np.concatenate([arrivals, departures])
+    order = np.argsort(times, kind='stable')
+    ops = np.concatenate([alloc_ops, free_ops])[order]
+    event_pids = np.concatenate([pids, pids])[order]
+    event_sizes = np.concatenate([sizes, np.zeros(num_processes, dtype=np.int64)])[order]
+    if return_times:
+        return ops, event_pids, event_sizes, times[order]
+    return ops, event_pids, event_sizes
+
+
+def workload_chunks(workload, chunk_size=65536):
+    """Splits generated arrays into chunks for trace_replay.replay/write_trace"""
+    ops, pids, sizes = workload[:3]
+    for start in range(0, len(ops), chunk_size):
+        yield ops[start:start+chunk_size], pids[start:start+chunk_size], sizes[start:start+chunk_size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic allocation trace")
+    parser.add_argument('output', help="Trace file to write (.csv for CSV, anything else binary)")
+    parser.add_argument('--processes', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--arrival-rate', type=float, default=1.0)
+    parser.add_argument('--lifetime', default='exponential', choices=['exponential', 'lognormal'])
+    parser.add_argument('--mean-lifetime', type=float, default=50.0)
+    parser.add_argument('--min-size', type=int, default=1)
+    parser.add_argument('--max-size', type=int, default=256)
+    parser.add_argument('--paged-fraction', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    workload = generate_workload(args.processes, seed=args.seed, arrival_rate=args.arrival_rate,
+                                 lifetime=args.lifetime, mean_lifetime=args.mean_lifetime,
+                                 size_params={'low': args.min_size, 'high': args.max_size},
+                                 paged_fraction=args.paged_fraction)
+    count = write_trace(args.output, workload_chunks(workload), binary=not args.output.endswith('.csv'))
+    print(f"Wrote {count} events to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# tests/test_arenas.py
+import threading
+import unittest
+import numpy as np
+from modules.arenas import ArenaAllocator, stress
+
+class TestArenaAllocator(unittest.TestCase):
+    def test_arenas_partition_memory(self):
+        allocator = ArenaAllocator(1000, num_arenas=3)
+        self.assertEqual([(a.base, a.size) for a in allocator.arenas], [(0, 333), (333, 333), (666, 334)])
+
+    def test_spills_to_next_arena(self):
+        allocator = ArenaAllocator(400, num_arenas=2)
+        self.assertTrue(allocator.allocate_segment(1, 150)[0])
+        self.assertTrue(allocator.allocate_segment(2, 150)[0])
+        self.assertEqual(allocator.locate(1), (0, (0, 150)))
+        self.assertEqual(allocator.locate(2), (1, (200, 150)))
+        self.assertFalse(allocator.allocate_segment(3, 250)[0])
+        self.assertFalse(allocator.allocate_segment(1, 10)[0])
+        self.assertTrue(allocator.deallocate(1)[0])
+        self.assertIsNone(allocator.locate(1))
+        state = allocator.get_memory_state()
+        self.assertEqual(len(state), 400)
+        self.assertEqual(int(np.count_nonzero(state == 2)), 150)
+
+    def test_threads_get_distinct_home_arenas(self):
+        allocator = ArenaAllocator(400, num_arenas=4)
+        homes = []
+        threads = [threading.Thread(target=lambda: homes.append(allocator.home_arena().index)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(homes), [0, 1, 2, 3])
+
+    def test_stress_keeps_state_consistent(self):
+        allocator = ArenaAllocator(1 << 14, num_arenas=2)
+        report = stress(allocator, num_threads=4, ops_per_thread=500, seed=1)
+        self.assertEqual(report['acquisitions'], sum(a['acquisitions'] for a in report['arenas']))
+        self.assertGreaterEqual(report['operation_imbalance'], 1.0)
+        state = allocator.get_memory_state()
+        for pid, arena in list(allocator._owners.items()):
+            _, (start, size) = allocator.locate(pid)
+            self.assertTrue(np.all(state[start:start+size] == pid))
+        self.assertAlmostEqual(allocator.get_utilization(), np.count_nonzero(state) / len(state) * 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# tests/test_benchmark.py
+import os
+import tempfile
+import unittest
+from modules.benchmark import (run_benchmarks, find_regressions, save_results, load_results,
+                               prefilled_simulator, prefill_layout, BENCHMARKS)
+
+class TestBenchmark(unittest.TestCase):
+    def test_prefill_leaves_requested_holes(self):
+        simulator, next_pid = prefilled_simulator(64 * 200, 0.5)
+        self.assertEqual(next_pid, 101)
+        self.assertTrue(30 < len(simulator.processes) < 70)
+
+    def test_prefill_spans_large_memories(self):
+        count, block_size = prefill_layout(10_000_000)
+        self.assertEqual(count * block_size, 5_000_000 - 5_000_000 % count)
+        simulator, _ = prefilled_simulator(1 << 20, 0.5)
+        starts = [start for start, _ in simulator.processes.values()]
+        self.assertGreater(max(starts), (1 << 19) * 0.9)
+        self.assertEqual(type(simulator._storage).__name__, "CompactStorage")
+
+    def test_unfragmented_allocations_succeed(self):
+        simulator, next_pid = prefilled_simulator(1 << 20, 0.0)
+        self.assertTrue(simulator.allocate_segment(next_pid, prefill_layout(1 << 20)[1])[0])
+        self.assertTrue(simulator.allocate_pages(next_pid + 1, 4 * 64)[0])
+
+    def test_run_and_round_trip(self):
+        results = run_benchmarks(sizes=[2048], fragmentation_levels=[0.0, 0.5], ops=10, repeat=1)
+        self.assertEqual(len(results), len(BENCHMARKS) * 2)
+        self.assertTrue(all(result['ops_per_second'] > 0 for result in results))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            save_results(path, results)
+            self.assertEqual(load_results(path), results)
+
+    def test_find_regressions(self):
+        baseline = [{'benchmark': 'deallocate', 'memory': 1000, 'fragmentation': 0.5,
+                     'strategy': 'FIRST_FIT', 'ops_per_second': 1000.0}]
+        slower = [dict(baseline[0], ops_per_second=700.0)]
+        self.assertEqual(len(find_regressions(slower, baseline, tolerance=0.2)), 1)
+        self.assertEqual(find_regressions(slower, baseline, tolerance=0.5), [])
+
+if __name__ == '__main__':
+    unittest.main()
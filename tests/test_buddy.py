@@ -0,0 +1,41 @@
+# tests/test_buddy.py
+import unittest
+from modules.buddy import BuddyAllocator
+
+class TestBuddyAllocator(unittest.TestCase):
+    def setUp(self):
+        self.buddy = BuddyAllocator(256)
+        self.buddy.add_range(0, 255)
+
+    def test_order_for(self):
+        self.assertEqual(BuddyAllocator.order_for(1), 0)
+        self.assertEqual(BuddyAllocator.order_for(32), 5)
+        self.assertEqual(BuddyAllocator.order_for(33), 6)
+
+    def test_alloc_splits_block(self):
+        self.assertEqual(self.buddy.alloc(30), (0, 5))
+        # Remaining halves of 32, 64 and 128 units stay free
+        self.assertEqual(self.buddy.free_lists[5], {32: None})
+        self.assertEqual(self.buddy.free_lists[6], {64: None})
+        self.assertEqual(self.buddy.free_lists[7], {128: None})
+
+    def test_free_merges_with_buddy(self):
+        first = self.buddy.alloc(64)
+        second = self.buddy.alloc(64)
+        self.buddy.free(*first)
+        self.buddy.free(*second)
+        self.assertEqual(self.buddy.free_lists[8], {0: None})
+        self.assertEqual(self.buddy.free_block_count(), 1)
+
+    def test_alloc_too_large(self):
+        self.assertIsNone(self.buddy.alloc(257))
+
+    def test_non_power_of_two_memory(self):
+        buddy = BuddyAllocator(96)
+        buddy.add_range(0, 95)
+        self.assertEqual(buddy.free_lists[6], {0: None})
+        self.assertEqual(buddy.free_lists[5], {64: None})
+        self.assertIsNone(buddy.alloc(65))
+
+if __name__ == '__main__':
+    unittest.main()
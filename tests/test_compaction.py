@@ -0,0 +1,72 @@
+# tests/test_compaction.py
+import unittest
+import numpy as np
+from modules.compaction import plan_slide, plan_evacuation
+from modules.memory_simulator import MemorySimulator, AllocationStrategy
+
+class TestCompactionPlans(unittest.TestCase):
+    def test_slide_respects_pinned(self):
+        layout = [(10, 10, 1, True), (30, 10, 2, False), (50, 5, 3, True)]
+        self.assertEqual(plan_slide(layout, 100), [(1, 10, 0, 10), (3, 50, 40, 5)])
+
+    def test_evacuation_picks_cheapest_window(self):
+        # Holes: 0-9, 12-29, 80-99; one 2-unit segment separates the first two
+        layout = [(10, 2, 1, True), (30, 50, 2, True)]
+        free = [(0, 9), (12, 29), (80, 99)]
+        moves = plan_evacuation(layout, free, 100, 30)
+        self.assertEqual(moves, [(1, 10, 80, 2)])
+
+    def test_evacuation_fails_without_room(self):
+        layout = [(0, 50, 1, True), (50, 40, 2, False)]
+        self.assertIsNone(plan_evacuation(layout, [(90, 99)], 100, 20))
+
+class TestSimulatorCompaction(unittest.TestCase):
+    def setUp(self):
+        self.sim = MemorySimulator(total_memory=256, page_size=32)
+        for pid in range(1, 9):
+            self.sim.allocate_segment(pid, 32)
+        for pid in (1, 3, 5, 7):
+            self.sim.deallocate(pid)
+
+    def test_slide_compaction(self):
+        report = self.sim.compact(mode='slide')
+        self.assertEqual(report['units_moved'], 4 * 32)
+        self.assertEqual(report['largest_free_after'], 128)
+        self.assertEqual(self.sim.free_blocks, [(128, 255)])
+        self.assertEqual(self.sim.processes[2], (0, 32))
+        self.assertTrue(np.all(self.sim.memory[0:32] == 2))
+        self.assertTrue(np.all(self.sim.memory[128:] == 0))
+        self.assertEqual(self.sim.get_fragmentation()[0], 0)
+
+    def test_partial_fill_moves_less(self):
+        report = self.sim.compact(target=64)
+        self.assertEqual(report['mode'], 'fill')
+        self.assertEqual(report['units_moved'], 32)
+        self.assertGreaterEqual(report['largest_free_after'], 64)
+        state = self.sim.get_memory_state()
+        for pid, (start, size) in self.sim.processes.items():
+            self.assertTrue(np.all(state[start:start+size] == pid))
+        self.assertEqual(np.count_nonzero(state), 128)
+
+    def test_compact_on_failure(self):
+        self.assertFalse(self.sim.allocate_segment(20, 64)[0])
+        self.sim.compact_on_failure = True
+        success, _ = self.sim.allocate_segment(20, 64)
+        self.assertTrue(success)
+
+    def test_threshold_triggers_compaction(self):
+        self.sim.compaction_threshold = 50
+        self.sim.deallocate(8)
+        self.assertEqual(len(self.sim.free_blocks), 1)
+
+    def test_buddy_blocks_stay_put(self):
+        sim = MemorySimulator(total_memory=256, page_size=32)
+        sim.allocate_segment(1, 32)
+        sim.set_strategy(AllocationStrategy.BUDDY)
+        sim.allocate_segment(2, 32)
+        sim.deallocate(1)
+        sim.compact(mode='slide')
+        self.assertEqual(sim.processes[2], (32, 32))
+
+if __name__ == '__main__':
+    unittest.main()
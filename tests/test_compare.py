@@ -0,0 +1,36 @@
+# tests/test_compare.py
+import unittest
+from modules.compare import compare_strategies, format_table, run_config, TRACE_DTYPE
+from modules.memory_simulator import AllocationStrategy
+from modules.workload import generate_workload
+import numpy as np
+
+class TestCompare(unittest.TestCase):
+    def setUp(self):
+        self.workload = generate_workload(400, seed=2, arrival_rate=2.0, mean_lifetime=100.0,
+                                          size_params={'low': 8, 'high': 120}, paged_fraction=0.2)
+
+    def test_parallel_rows_match_serial_run(self):
+        rows = compare_strategies(self.workload, 4096, page_sizes=(32, 64), sample_every=100,
+                                  max_workers=2)
+        self.assertEqual(len(rows), 2 * len(AllocationStrategy))
+        self.assertEqual([(r['strategy'], r['page_size']) for r in rows[:2]],
+                         [('FIRST_FIT', 32), ('FIRST_FIT', 64)])
+
+        records = np.empty(len(self.workload[0]), dtype=TRACE_DTYPE)
+        records['op'], records['pid'], records['size'] = self.workload
+        serial = run_config(records, 4096, 64, AllocationStrategy.BEST_FIT, sample_every=100)
+        parallel = next(r for r in rows if r['strategy'] == 'BEST_FIT' and r['page_size'] == 64)
+        for key in ('utilization', 'external_fragmentation', 'failure_rate'):
+            self.assertAlmostEqual(serial[key], parallel[key])
+
+    def test_format_table(self):
+        rows = compare_strategies(self.workload, 4096, strategies=[AllocationStrategy.FIRST_FIT],
+                                  max_workers=1)
+        table = format_table(rows).splitlines()
+        self.assertEqual(len(table), 3)
+        self.assertIn("Strategy", table[0])
+        self.assertIn("FIRST_FIT", table[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+# tests/test_frames.py
+import unittest
+from modules.frames import FrameBitmap
+
+class TestFrameBitmap(unittest.TestCase):
+    def setUp(self):
+        self.frames = FrameBitmap(total_memory=256, page_size=32)
+
+    def test_initial_state(self):
+        self.assertEqual(self.frames.num_frames, 8)
+        self.assertEqual(self.frames.free_count, 8)
+
+    def test_mark_used_clears_overlapping_frames(self):
+        self.frames.mark_used(30, 4)  # Straddles frames 0 and 1
+        self.assertEqual(self.frames.free_count, 6)
+        self.assertEqual(list(self.frames.find(2)), [64, 96])
+
+    def test_mark_free_only_whole_frames(self):
+        self.frames.mark_used(0, 256)
+        self.frames.mark_free(10, 100)  # Frames 1 and 2 lie fully inside
+        self.assertEqual(self.frames.free_count, 2)
+        self.assertEqual(list(self.frames.find(2)), [32, 64])
+
+    def test_find_rejects_impossible_request(self):
+        self.frames.mark_used(0, 200)
+        self.assertIsNone(self.frames.find(3))
+
+    def test_partial_last_frame(self):
+        frames = FrameBitmap(total_memory=100, page_size=32)
+        frames.mark_used(0, 100)
+        frames.mark_free(96, 99)
+        self.assertEqual(list(frames.find(1)), [96])
+
+if __name__ == '__main__':
+    unittest.main()
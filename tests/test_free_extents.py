@@ -0,0 +1,97 @@
+# tests/test_free_extents.py
+import unittest
+from modules.free_extents import FreeExtents
+
+class TestFreeExtents(unittest.TestCase):
+    def setUp(self):
+        self.free = FreeExtents(100)
+
+    def test_take_splits_block(self):
+        self.free.take(10, 20)
+        self.assertEqual(self.free.to_list(), [(0, 9), (30, 99)])
+
+    def test_release_coalesces_both_neighbours(self):
+        self.free.take(0, 100)
+        self.free.release(0, 10)
+        self.free.release(20, 10)
+        self.assertEqual(self.free.to_list(), [(0, 9), (20, 29)])
+        self.free.release(10, 10)
+        self.assertEqual(self.free.to_list(), [(0, 29)])
+
+    def test_release_without_neighbours(self):
+        self.free.take(0, 100)
+        self.free.release(40, 5)
+        self.assertEqual(self.free.to_list(), [(40, 44)])
+
+    def test_take_used_range_raises(self):
+        self.free.take(0, 50)
+        with self.assertRaises(ValueError):
+            self.free.take(40, 20)
+
+    def test_find_containing(self):
+        self.free.take(10, 20)
+        self.assertEqual(self.free.find_containing(5), 0)
+        self.assertEqual(self.free.find_containing(15), -1)
+        self.assertEqual(self.free.find_containing(99), 30)
+
+    def _fragment(self):
+        # Holes of 10 @0, 5 @20, 30 @40, 5 @80; used elsewhere
+        self.free.take(10, 10)
+        self.free.take(25, 15)
+        self.free.take(70, 10)
+        self.free.take(85, 15)
+
+    def test_first_fit_lowest_address(self):
+        self._fragment()
+        self.assertEqual(self.free.first_fit(5), 0)
+        self.assertEqual(self.free.first_fit(11), 40)
+        self.assertEqual(self.free.first_fit(31), -1)
+
+    def test_best_fit_smallest_hole(self):
+        self._fragment()
+        self.assertEqual(self.free.best_fit(5), 20)
+        self.assertEqual(self.free.best_fit(6), 0)
+        self.assertEqual(self.free.best_fit(31), -1)
+
+    def test_worst_fit_largest_hole(self):
+        self._fragment()
+        self.assertEqual(self.free.worst_fit(1), 40)
+        self.assertEqual(self.free.worst_fit(31), -1)
+
+    def test_matches_linear_scan(self):
+        # Random take/release sequence checked against a brute-force scan
+        import random
+        rng = random.Random(7)
+        free = FreeExtents(1000)
+        used = []
+        for _ in range(500):
+            if used and rng.random() < 0.4:
+                start, size = used.pop(rng.randrange(len(used)))
+                free.release(start, size)
+            else:
+                size = rng.randint(1, 40)
+                start = free.first_fit(size)
+                if start != -1:
+                    free.take(start, size)
+                    used.append((start, size))
+            blocks = free.to_list()
+            for want in (1, 8, 33):
+                fits = [(e - s + 1, s) for s, e in blocks if e - s + 1 >= want]
+                self.assertEqual(free.first_fit(want), min((s for _, s in fits), default=-1))
+                self.assertEqual(free.best_fit(want), min(fits)[1] if fits else -1)
+            for (s1, e1), (s2, e2) in zip(blocks, blocks[1:]):
+                self.assertLess(e1 + 1, s2)
+
+    def test_size_index_searches_are_logarithmic(self):
+        # A sorted list would need O(holes) shifts per update; the size
+        # treap reaches any key in O(log holes) node visits
+        holes = 20_000
+        free = FreeExtents(2 * holes)
+        for start in range(0, 2 * holes, 2):
+            free.take(start, 1)
+        self.assertEqual(len(free), holes)
+        self.assertEqual(free.best_fit(1), 1)
+        self.assertLess(free._by_size.visits, 4 * holes.bit_length())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# tests/test_history.py
+import os
+import tempfile
+import unittest
+from modules.history import HistoryLog, HistoryOp, read_history
+from modules.memory_simulator import MemorySimulator
+
+class TestHistoryLog(unittest.TestCase):
+    def test_ring_keeps_latest_records(self):
+        log = HistoryLog(capacity=4)
+        for pid in range(1, 11):
+            log.append(HistoryOp.ALLOCATE_SEGMENT, pid, pid * 10, 5)
+        self.assertEqual(len(log), 4)
+        self.assertEqual(log.total, 10)
+        self.assertEqual(log.records()['pid'].tolist(), [7, 8, 9, 10])
+        self.assertEqual(log[-1], ("Allocated segment for 10", (10, 100, 5)))
+        self.assertEqual([message for message, _ in log[-2:]],
+                         ["Allocated segment for 9", "Allocated segment for 10"])
+
+    def test_indexing_reads_only_selected_slots(self):
+        log = HistoryLog(capacity=5)
+        for pid in range(1, 13):
+            log.append(HistoryOp.DEALLOCATE, pid)
+        expected = [details for _, details in log]
+        log.records = None  # Indexing must not copy the whole ring
+        for key in (slice(None), slice(-3, None), slice(1, 4), slice(None, None, -2), slice(4, 1, -1)):
+            self.assertEqual([details for _, details in log[key]], expected[key])
+        self.assertEqual([log[i][1] for i in range(-5, 5)], expected + expected)
+        with self.assertRaises(IndexError):
+            log[5]
+        self.assertEqual(HistoryLog(capacity=5)[-10:], [])
+
+    def test_string_pids_and_query(self):
+        log = HistoryLog()
+        log.append(HistoryOp.ALLOCATE_SEGMENT, "P1", 0, 8)
+        log.append(HistoryOp.ALLOCATE_SEGMENT, 2, 8, 8)
+        log.append(HistoryOp.DEALLOCATE, "P1")
+        self.assertEqual(list(log)[2], ("Deallocated P1", "P1"))
+        self.assertEqual(len(log.query(pid="P1")), 2)
+        self.assertEqual(len(log.query(op=HistoryOp.ALLOCATE_SEGMENT)), 2)
+        self.assertEqual(len(log.query(pid="missing")), 0)
+
+    def test_string_pid_labels_are_bounded(self):
+        log = HistoryLog(capacity=4)
+        for i in range(1000):
+            log.append(HistoryOp.DEALLOCATE, f"P{i}")
+        self.assertEqual(len(log._labels), 4)
+        self.assertEqual([details for _, details in log], ["P996", "P997", "P998", "P999"])
+        self.assertEqual(log.query(pid="P0")['pid'].size, 0)
+
+    def test_clear_truncates_spill(self):
+        with tempfile.TemporaryDirectory() as directory:
+            spill = os.path.join(directory, "history.spill")
+            log = HistoryLog(capacity=2, spill_path=spill)
+            for pid in range(1, 6):
+                log.append(HistoryOp.DEALLOCATE, "P1" if pid % 2 else pid)
+            log.clear()
+            log.append(HistoryOp.DEALLOCATE, 9)
+            exported = os.path.join(directory, "history.bin")
+            log.export(exported)
+            self.assertEqual(read_history(exported)['pid'].tolist(), [9])
+            self.assertEqual(log._labels, {})
+
+    def test_spill_and_export_keep_everything(self):
+        with tempfile.TemporaryDirectory() as directory:
+            spill = os.path.join(directory, "history.spill")
+            log = HistoryLog(capacity=3, spill_path=spill)
+            for pid in range(1, 9):
+                log.append(HistoryOp.DEALLOCATE, pid)
+            self.assertEqual(len(read_history(spill)), 6)
+            exported = os.path.join(directory, "history.bin")
+            log.export(exported)
+            self.assertEqual(read_history(exported)['pid'].tolist(), list(range(1, 9)))
+
+    def test_simulator_history_is_bounded(self):
+        sim = MemorySimulator(total_memory=256, page_size=32, history_capacity=5)
+        for pid in range(1, 20):
+            sim.allocate_segment(pid, 8)
+            sim.deallocate(pid)
+        sim.allocate_pages(99, 40)
+        self.assertEqual(len(sim.history), 5)
+        self.assertEqual(sim.history[-1], ("Allocated pages for 99", (99, 0, 64)))
+        self.assertEqual(sim.history.query(op=HistoryOp.ALLOCATE_PAGES)['result'].tolist(), [2])
+
+if __name__ == '__main__':
+    unittest.main()
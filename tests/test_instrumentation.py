@@ -0,0 +1,94 @@
+# tests/test_instrumentation.py
+import unittest
+from modules.instrumentation import LatencyHistogram, instrument_simulator, instrument_manager, uninstrument
+from modules.memory_simulator import MemorySimulator, AllocationStrategy
+from memory_tracker.src.memory_manager import MemoryManager
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_buckets_round_trip(self):
+        for value in [0, 1, 63, 64, 65, 1000, 123456789, 2**40]:
+            index = LatencyHistogram.bucket(value)
+            self.assertGreaterEqual(LatencyHistogram.bucket_value(index), value)
+            self.assertLessEqual(LatencyHistogram.bucket_value(index), value * 1.04 + 1)
+            self.assertEqual(LatencyHistogram.bucket(LatencyHistogram.bucket_value(index)), index)
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value)
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 1000)
+        self.assertAlmostEqual(summary['p50'], 500, delta=500 * 0.04)
+        self.assertAlmostEqual(summary['p99'], 990, delta=990 * 0.04)
+        self.assertEqual(summary['max'], 1000)
+        self.assertEqual(LatencyHistogram().percentile(50), 0)
+
+class TestInstrumentSimulator(unittest.TestCase):
+    def test_records_latency_and_work(self):
+        sim = MemorySimulator(total_memory=256, page_size=32)
+        instrumentation = instrument_simulator(sim)
+        sim.allocate_segment(1, 40)
+        sim.allocate_segment(2, 40)
+        sim.set_strategy(AllocationStrategy.BEST_FIT)
+        sim.allocate_pages(3, 64)
+        sim.deallocate(1)
+        sim.deallocate(2)
+        report = instrumentation.report()
+        self.assertEqual(report['latency']['allocate_segment']['FIRST_FIT']['count'], 2)
+        self.assertEqual(report['latency']['allocate_pages']['BEST_FIT']['count'], 1)
+        self.assertEqual(report['latency']['deallocate']['BEST_FIT']['count'], 2)
+        self.assertEqual(report['counters']['units_written'], 40 + 40 + 64)
+        self.assertEqual(report['counters']['holes_examined'], 2)
+        # Freeing 2 merges with the hole left by 1 and the free tail
+        self.assertEqual(report['counters']['blocks_merged'], 2)
+
+        uninstrument(sim)
+        sim.allocate_segment(4, 10)
+        self.assertNotIn('allocate_segment', sim.__dict__)
+        self.assertEqual(instrumentation.report()['latency']['allocate_segment']['FIRST_FIT']['count'], 2)
+
+    def test_batch_ops_are_counted(self):
+        sim = MemorySimulator(total_memory=256, page_size=32)
+        instrumentation = instrument_simulator(sim)
+        sim.allocate_many([1, 2, 3], [10, 20, 30])
+        self.assertEqual(instrumentation.report()['latency']['allocate_segment']['FIRST_FIT']['count'], 3)
+
+    def test_compaction_copies_are_written_units(self):
+        sim = MemorySimulator(total_memory=256, page_size=32)
+        sim.allocate_segment(1, 40)
+        sim.allocate_segment(2, 40)
+        sim.deallocate(1)
+        instrumentation = instrument_simulator(sim)
+        report = sim.compact(mode='slide')
+        self.assertEqual(report['units_moved'], 40)
+        self.assertEqual(instrumentation.report()['counters']['units_written'], 40)
+
+    def test_holes_examined_are_search_visits(self):
+        sim = MemorySimulator(total_memory=4096, page_size=32)
+        for process_id in range(100):
+            sim.allocate_segment(process_id, 8 + process_id % 7)
+        for process_id in range(0, 100, 2):
+            sim.deallocate(process_id)
+        for strategy in (AllocationStrategy.BEST_FIT, AllocationStrategy.WORST_FIT):
+            sim.set_strategy(strategy)
+            instrumentation = instrument_simulator(sim)
+            sim.allocate_segment(1000 + strategy.value, 10)
+            self.assertEqual(instrumentation.report()['counters']['holes_examined'], sim._free.visits)
+            self.assertGreater(sim._free.visits, 0)
+
+class TestInstrumentManager(unittest.TestCase):
+    def test_counts_merges(self):
+        manager = MemoryManager(100)
+        manager.memory_blocks.append({'start': 0, 'size': 100, 'process_id': None, 'used': False})
+        instrumentation = instrument_manager(manager)
+        manager.allocate_memory("P1", 30)
+        manager.allocate_memory("P2", 30)
+        manager.free_memory("P1")
+        manager.free_memory("P2")
+        report = instrumentation.report()
+        self.assertEqual(report['latency']['allocate_memory']['BEST_FIT']['count'], 2)
+        self.assertEqual(report['counters']['blocks_merged'], 2)
+        self.assertEqual(report['counters']['holes_examined'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
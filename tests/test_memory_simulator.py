@@ -1,7 +1,7 @@
 # tests/test_memory_simulator.py
 import unittest
 import numpy as np
-from modules.memory_simulator import MemorySimulator, AllocationStrategy
+from modules.memory_simulator import MemorySimulator, AllocationStrategy, BatchOp
 
 class TestMemorySimulator(unittest.TestCase):
     def setUp(self):
@@ -55,6 +55,46 @@ class TestMemorySimulator(unittest.TestCase):
         self.assertEqual(self.sim.processes[2], (64, 32))
         self.assertTrue(np.all(self.sim.memory[64:96] == 2))
 
+    def test_allocate_segment_buddy(self):
+        self.sim.set_strategy(AllocationStrategy.BUDDY)
+        success, msg = self.sim.allocate_segment(1, 40)  # Rounded up to 64
+        self.assertTrue(success)
+        self.assertEqual(self.sim.processes[1], (0, 64))
+        self.sim.allocate_segment(2, 20)  # Splits the 64-unit buddy
+        self.assertEqual(self.sim.processes[2], (64, 32))
+        external, internal = self.sim.get_fragmentation()
+        self.assertEqual(internal, (64 - 40) + (32 - 20))
+        self.sim.deallocate(1)
+        self.sim.deallocate(2)
+        self.assertEqual(self.sim.free_blocks, [(0, 255)])
+        self.assertEqual(self.sim.get_fragmentation(), (0, 0))
+
+    def test_buddy_after_fit_allocations(self):
+        # Buddy lists are rebuilt from holes left by the fit strategies
+        self.sim.allocate_segment(1, 10)
+        self.sim.set_strategy(AllocationStrategy.BUDDY)
+        self.sim.allocate_segment(2, 16)
+        self.assertEqual(self.sim.processes[2], (16, 16))
+        self.sim.deallocate(1)
+        self.sim.allocate_segment(3, 16)
+        self.assertEqual(self.sim.processes[3][1], 16)
+
+    def test_allocate_segment_slab(self):
+        self.sim.set_strategy(AllocationStrategy.SLAB)
+        self.sim.allocate_segment(1, 12)  # 16-unit class, carves a 256-unit slab
+        self.sim.allocate_segment(2, 16)
+        self.assertEqual(self.sim.processes[1], (0, 16))
+        self.assertEqual(self.sim.processes[2], (16, 16))
+        self.assertEqual(self.sim.free_blocks, [])
+        stats = {c['object_size']: c for c in self.sim.get_slab_stats()}
+        self.assertEqual(stats[16]['objects_in_use'], 2)
+        self.assertEqual(stats[16]['waste'], 256 - 28)
+        self.assertEqual(self.sim.get_fragmentation()[1], 4)
+        self.sim.deallocate(1)
+        self.sim.deallocate(2)
+        self.assertEqual(self.sim.get_slab_stats()[1]['objects_in_use'], 0)
+        self.assertTrue(np.all(self.sim.memory == 0))
+
     def test_allocate_pages(self):
         # Test page allocation
         success, msg = self.sim.allocate_pages(1, 40)  # Needs 2 pages (64 bytes)
@@ -63,6 +103,15 @@ class TestMemorySimulator(unittest.TestCase):
         self.assertTrue(np.all(self.sim.memory[0:32] == 1))
         self.assertTrue(np.all(self.sim.memory[32:64] == 1))
 
+    def test_allocate_pages_skips_partially_used_frames(self):
+        self.sim.allocate_segment(1, 40)  # Touches frames 0 and 1
+        success, msg = self.sim.allocate_pages(2, 64)
+        self.assertTrue(success)
+        self.assertEqual(self.sim.processes[2], [(64, 32), (96, 32)])
+        success, msg = self.sim.allocate_pages(3, 160)
+        self.assertFalse(success)
+        self.assertIn("Not enough free pages", msg)
+
     def test_deallocate_segment(self):
         # Test deallocation of segment
         self.sim.allocate_segment(1, 64)
@@ -72,6 +121,17 @@ class TestMemorySimulator(unittest.TestCase):
         self.assertTrue(np.all(self.sim.memory[0:64] == 0))
         self.assertEqual(self.sim.free_blocks, [(0, 255)])
 
+    def test_deallocate_coalesces_free_blocks(self):
+        # Freeing a middle segment merges with the holes on both sides
+        self.sim.allocate_segment(1, 32)
+        self.sim.allocate_segment(2, 32)
+        self.sim.allocate_segment(3, 32)
+        self.sim.deallocate(1)
+        self.sim.deallocate(3)
+        self.assertEqual(self.sim.free_blocks, [(0, 31), (64, 255)])
+        self.sim.deallocate(2)
+        self.assertEqual(self.sim.free_blocks, [(0, 255)])
+
     def test_deallocate_pages(self):
         # Test deallocation of pages
         self.sim.allocate_pages(1, 40)
@@ -100,6 +160,16 @@ class TestMemorySimulator(unittest.TestCase):
         self.assertTrue(np.all(state[0:64] == 1))
         self.assertTrue(np.all(state[64:] == 0))
 
+    def test_get_memory_view_and_snapshot(self):
+        self.sim.allocate_segment(1, 64)
+        snapshot = self.sim.snapshot()
+        view = self.sim.get_memory_view()
+        self.sim.deallocate(1)
+        self.assertTrue(np.all(view[0:64] == 0))
+        self.assertTrue(np.all(snapshot.window(0, 64) == 1))
+        self.assertEqual(snapshot.processes, {1: (0, 64)})
+        self.assertEqual(len(snapshot.diff()), 64)
+
     def test_get_fragmentation(self):
         # Test fragmentation calculation
         self.sim.allocate_segment(1, 64)
@@ -113,5 +183,133 @@ class TestMemorySimulator(unittest.TestCase):
         utilization = self.sim.get_utilization()
         self.assertEqual(utilization, (64 / 256) * 100)  # 25%
 
+    def test_running_metrics_match_recount(self):
+        rng = np.random.default_rng(3)
+        sim = MemorySimulator(total_memory=1024, page_size=32)
+        for step in range(400):
+            sim.set_strategy(list(AllocationStrategy)[step % 5])
+            pid = int(rng.integers(1, 40))
+            if pid in sim.processes:
+                sim.deallocate(pid)
+            elif step % 7 == 0:
+                sim.allocate_pages(pid, int(rng.integers(1, 100)))
+            else:
+                sim.allocate_segment(pid, int(rng.integers(1, 100)))
+            if step % 50 == 0:
+                sim.compact()
+            holes = [end - start + 1 for start, end in sim.free_blocks]
+            self.assertEqual(sim.get_utilization(), np.count_nonzero(sim.memory) / 1024 * 100)
+            self.assertEqual(sim.get_fragmentation_stats()['free'], sum(holes))
+            expected_external = (1 - max(holes) / sum(holes)) * 100 if holes else 0
+            self.assertAlmostEqual(sim.get_fragmentation()[0], expected_external)
+            self.assertEqual(sim.get_fragmentation()[1],
+                             sum(sim._block_size(sim.processes[pid]) - size
+                                 for pid, size in sim._requested.items()))
+
+    def test_pages_count_internal_waste(self):
+        self.sim.allocate_pages(1, 1)
+        self.sim.allocate_pages(2, 40)
+        self.assertEqual(self.sim.get_fragmentation()[1], (32 - 1) + (64 - 40))
+        restored = MemorySimulator(total_memory=256, page_size=32)
+        restored.restore_state(self.sim.export_state())
+        self.assertEqual(restored.get_fragmentation()[1], 31 + 24)
+        self.sim.deallocate(1)
+        self.assertEqual(self.sim.get_fragmentation()[1], 24)
+
+    def test_fragmentation_stats(self):
+        for pid in range(1, 9):
+            self.sim.allocate_segment(pid, 32)
+        for pid in (2, 5, 6):
+            self.sim.deallocate(pid)
+        stats = self.sim.get_fragmentation_stats(sizes=[32, 64, 65])
+        self.assertEqual(stats['holes'], 2)
+        self.assertEqual(stats['largest_hole'], 64)
+        self.assertEqual(stats['hole_histogram'], [0, 0, 0, 0, 0, 1, 1])
+        self.assertEqual(stats['fragmentation_index'], {32: 0.0, 64: 1 / 3, 65: 1.0})
+        self.assertEqual(self.sim.fragmentation_index(64), 1 / 3)
+
+    def test_apply_ops_compaction_keeps_reused_pid(self):
+        # Compaction flushes the batch midway; a pid freed and reallocated
+        # in the same batch must keep its new ownership afterwards
+        for pid in (1, 2, 3):
+            self.sim.allocate_segment(pid, 64)
+        self.sim.deallocate(2)
+        self.sim.compact_on_failure = True
+        succeeded, starts = self.sim.apply_ops(
+            [BatchOp.DEALLOCATE, BatchOp.ALLOCATE, BatchOp.ALLOCATE], [1, 1, 4], [0, 32, 100])
+        self.assertTrue(succeeded.all())
+        state = self.sim.get_memory_state()
+        for pid in (1, 3, 4):
+            start, size = self.sim.processes[pid]
+            self.assertTrue(np.all(state[start:start + size] == pid))
+        self.assertEqual(np.count_nonzero(state), 32 + 64 + 100)
+
+    def test_apply_ops_rejects_unknown_codes(self):
+        with self.assertRaises(ValueError):
+            self.sim.apply_ops([BatchOp.ALLOCATE, 9], [1, 2], [10, 100])
+        self.assertEqual(self.sim.processes, {})
+
+    def test_allocate_many(self):
+        succeeded, starts = self.sim.allocate_many([1, 2, 3], [64, 300, 32])
+        self.assertEqual(list(succeeded), [True, False, True])
+        self.assertEqual(list(starts), [0, -1, 64])
+        self.assertTrue(np.all(self.sim.memory[0:64] == 1))
+        self.assertTrue(np.all(self.sim.memory[64:96] == 3))
+        self.assertEqual(len(self.sim.history), 1)
+
+    def test_deallocate_many(self):
+        self.sim.allocate_many([1, 2], [64, 64])
+        succeeded = self.sim.deallocate_many([1, 5])
+        self.assertEqual(list(succeeded), [True, False])
+        self.assertTrue(np.all(self.sim.memory[0:64] == 0))
+        self.assertEqual(self.sim.free_blocks, [(0, 63), (128, 255)])
+
+    def test_apply_ops_matches_single_calls(self):
+        rng = np.random.default_rng(11)
+        ops, pids, sizes = [], [], []
+        live = []
+        for pid in range(1, 400):
+            if live and rng.random() < 0.45:
+                ops.append(BatchOp.DEALLOCATE)
+                pids.append(live.pop(int(rng.integers(len(live)))))
+                sizes.append(0)
+            else:
+                ops.append(BatchOp.ALLOCATE_PAGES if pid % 5 == 0 else BatchOp.ALLOCATE)
+                pids.append(pid)
+                sizes.append(int(rng.integers(1, 40)))
+                live.append(pid)
+
+        self.sim.allocate_segment(1000, 16)
+        single = MemorySimulator(total_memory=256, page_size=32)
+        single.allocate_segment(1000, 16)
+        ops.append(BatchOp.DEALLOCATE)
+        pids.append(1000)
+        sizes.append(0)
+
+        for op, pid, size in zip(ops, pids, sizes):
+            if op == BatchOp.DEALLOCATE:
+                single.deallocate(pid)
+            elif op == BatchOp.ALLOCATE:
+                single.allocate_segment(pid, size)
+            else:
+                single.allocate_pages(pid, size)
+        succeeded, _ = self.sim.apply_ops(ops, pids, sizes)
+        self.assertTrue(succeeded.any())
+        self.assertEqual(self.sim.processes, single.processes)
+        self.assertEqual(self.sim.free_blocks, single.free_blocks)
+        self.assertTrue(np.array_equal(self.sim.memory, single.memory))
+
+    def test_translate(self):
+        self.sim.allocate_segment(1, 50)
+        self.sim.allocate_pages(2, 40)
+        physical, faults = self.sim.translate([0, 49, 50, -1], 1)
+        self.assertEqual(physical.tolist(), [0, 49, -1, -1])
+        self.assertEqual(faults.tolist(), [False, False, True, True])
+        # Pages land in frames 2 and 3, after the segment
+        physical, faults = self.sim.translate([0, 17, 35, 63, 64], 2)
+        self.assertEqual(physical.tolist(), [64, 81, 99, 127, -1])
+        self.assertEqual(faults.tolist(), [False, False, False, False, True])
+        self.assertTrue(self.sim.translate([0], 99)[1].all())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,53 @@
+# tests/test_ordered_set.py
+import random
+import unittest
+from bisect import bisect_left, bisect_right, insort
+from modules.ordered_set import OrderedSet
+
+class TestOrderedSet(unittest.TestCase):
+    def test_matches_sorted_list(self):
+        rng = random.Random(4)
+        keys = OrderedSet(seed=1)
+        expected = []
+        for _ in range(3000):
+            key = (rng.randint(0, 50), rng.randint(0, 50))
+            if key in keys:
+                keys.remove(key)
+                expected.remove(key)
+            else:
+                keys.add(key)
+                insort(expected, key)
+            probe = (rng.randint(0, 50), -1)
+            index = bisect_left(expected, probe)
+            self.assertEqual(keys.ceiling(probe), expected[index] if index < len(expected) else None)
+            index = bisect_right(expected, probe) - 1
+            self.assertEqual(keys.floor(probe), expected[index] if index >= 0 else None)
+        self.assertEqual(list(keys), expected)
+        self.assertEqual(len(keys), len(expected))
+        self.assertEqual((keys.min(), keys.max()), (expected[0], expected[-1]))
+        self.assertEqual(list(keys.irange((25, 0))), expected[bisect_left(expected, (25, 0)):])
+
+    def test_sorted_inserts_stay_balanced(self):
+        keys = OrderedSet(range(100_000), seed=2)
+
+        def height(node):
+            return 0 if node is None else 1 + max(height(node.left), height(node.right))
+        self.assertLess(height(keys._root), 4 * (100_000).bit_length())
+        keys.ceiling(99_999)
+        self.assertLess(keys.visits, 4 * (100_000).bit_length())
+
+    def test_remove_missing_key(self):
+        with self.assertRaises(KeyError):
+            OrderedSet([1, 2]).remove(3)
+
+    def test_copy_is_independent(self):
+        keys = OrderedSet([3, 1, 2])
+        copy = keys.copy()
+        copy.remove(2)
+        keys.add(4)
+        self.assertEqual(list(keys), [1, 2, 3, 4])
+        self.assertEqual(list(copy), [1, 3])
+        self.assertEqual(len(copy), 2)
+
+if __name__ == '__main__':
+    unittest.main()
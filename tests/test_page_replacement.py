@@ -0,0 +1,46 @@
+# tests/test_page_replacement.py
+import unittest
+import numpy as np
+from modules.page_replacement import (next_use_index, count_faults, lru_stack_distances,
+                                      fault_curve, reference_string, REPLACEMENT_POLICIES)
+
+TEXTBOOK = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+
+class TestPageReplacement(unittest.TestCase):
+    def test_textbook_fault_counts(self):
+        self.assertEqual(count_faults(TEXTBOOK, 3, "fifo"), 15)
+        self.assertEqual(count_faults(TEXTBOOK, 3, "lru"), 12)
+        self.assertEqual(count_faults(TEXTBOOK, 3, "opt"), 9)
+
+    def test_belady_anomaly(self):
+        refs = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+        self.assertEqual(count_faults(refs, 3, "fifo"), 9)
+        self.assertEqual(count_faults(refs, 4, "fifo"), 10)
+
+    def test_clock_matches_second_chance(self):
+        refs = np.random.default_rng(3).integers(0, 20, 2000)
+        for frames in (1, 4, 9):
+            self.assertEqual(count_faults(refs, frames, "clock"), count_faults(refs, frames, "second_chance"))
+
+    def test_opt_is_lower_bound(self):
+        refs = np.random.default_rng(4).zipf(1.5, 3000) % 50
+        for frames in (2, 8, 16):
+            optimal = count_faults(refs, frames, "opt")
+            for policy in REPLACEMENT_POLICIES:
+                self.assertLessEqual(optimal, count_faults(refs, frames, policy))
+
+    def test_next_use_index(self):
+        self.assertEqual(next_use_index([1, 2, 1, 3, 2]).tolist(), [2, 4, 5, 5, 5])
+
+    def test_lru_curve_from_stack_distances(self):
+        self.assertEqual(lru_stack_distances([1, 2, 1, 1, 3, 2]).tolist(), [0, 0, 2, 1, 0, 3])
+        refs = np.random.default_rng(5).integers(0, 40, 5000)
+        frame_counts = [1, 3, 10, 39, 40, 100]
+        curve = fault_curve(refs, frame_counts)
+        self.assertEqual(curve, {frames: count_faults(refs, frames, "lru") for frames in frame_counts})
+
+    def test_reference_string(self):
+        self.assertEqual(reference_string([0, 63, 64, 200], 64).tolist(), [0, 0, 1, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# tests/test_page_table.py
+import unittest
+import numpy as np
+from modules.page_table import MultiLevelPageTable, ENTRY_BYTES
+from modules.tlb import TLB
+
+class TestMultiLevelPageTable(unittest.TestCase):
+    def test_map_and_lookup(self):
+        table = MultiLevelPageTable()
+        table.map([0, 1, 5 << 27], [7, 8, 9])
+        frames, walks = table.lookup([0, 1, 2, 5 << 27, 3 << 27])
+        self.assertEqual(frames.tolist(), [7, 8, -1, 9, -1])
+        self.assertEqual(walks.tolist(), [4, 4, 4, 4, 1])
+        self.assertEqual(table.mapped, 3)
+        # Root, two tables on each lower level
+        self.assertEqual(table.stats()['tables_per_level'], [1, 2, 2, 2])
+        self.assertEqual(table.overhead_bytes(), 7 * 512 * ENTRY_BYTES)
+
+    def test_unmap_frees_empty_tables(self):
+        table = MultiLevelPageTable(levels=3, bits_per_level=4, page_size=64)
+        table.map([1, 2, 300], 1)
+        table.unmap([300])
+        self.assertEqual(table.stats()['tables_per_level'], [1, 1, 1])
+        table.unmap([1, 2, 3])
+        self.assertEqual(table.table_count(), 1)
+        self.assertEqual(table.mapped, 0)
+        self.assertEqual(table.lookup([1])[1].tolist(), [1])
+
+    def test_48_bit_space_scales_with_mapped_pages(self):
+        table = MultiLevelPageTable()
+        self.assertEqual(table.virtual_bits, 48)
+        vpns = np.random.default_rng(0).choice(table.max_vpn, 2000, replace=False)
+        table.map(vpns, np.arange(2000))
+        self.assertEqual(table.lookup(vpns)[0].tolist(), list(range(2000)))
+        self.assertLessEqual(table.table_count(), 1 + 3 * 2000)
+        self.assertLess(table.overhead_bytes(), table.flat_overhead_bytes() / 1e4)
+        with self.assertRaises(ValueError):
+            table.map([table.max_vpn], [0])
+
+    def test_tlb_walks_multilevel_table(self):
+        table = MultiLevelPageTable(page_size=4096)
+        table.map([1 << 30], [3])
+        tlb = TLB(entries=4, walk_levels=table.levels)
+        physical, hits = tlb.access([(1 << 42) + 5, (1 << 42) + 6, 12], 4096, table)
+        self.assertEqual(physical.tolist(), [3 * 4096 + 5, 3 * 4096 + 6, -1])
+        self.assertEqual(hits.tolist(), [False, True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# tests/test_slab.py
+import unittest
+from modules.slab import SlabAllocator, SlabCache
+
+class TestSlabCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SlabCache(object_size=32, slab_size=128)
+
+    def test_needs_slab_before_alloc(self):
+        self.assertIsNone(self.cache.alloc(20))
+
+    def test_slab_moves_between_lists(self):
+        self.cache.add_slab(0)
+        objects = [self.cache.alloc(32) for _ in range(4)]
+        self.assertEqual([slot for _, slot in objects], [0, 1, 2, 3])
+        self.assertEqual(list(self.cache.full), [0])
+        self.cache.free(*objects[0], 32)
+        self.assertEqual(list(self.cache.partial), [0])
+        for slab, slot in objects[1:]:
+            self.cache.free(slab, slot, 32)
+        self.assertEqual(list(self.cache.empty), [0])
+
+    def test_stats_and_reclaim(self):
+        self.cache.add_slab(0)
+        self.cache.add_slab(128)
+        self.cache.alloc(20)
+        stats = self.cache.stats()
+        self.assertEqual(stats['objects_in_use'], 1)
+        self.assertEqual(stats['capacity'], 8)
+        self.assertEqual(stats['waste'], 256 - 20)
+        self.assertEqual(self.cache.reclaim(), [])
+        self.cache.add_slab(256)
+        self.assertEqual(len(self.cache.reclaim()), 1)
+
+class TestSlabAllocator(unittest.TestCase):
+    def test_cache_for(self):
+        allocator = SlabAllocator(size_classes=(16, 64), slab_size=256)
+        self.assertEqual(allocator.cache_for(10).object_size, 16)
+        self.assertEqual(allocator.cache_for(16).object_size, 16)
+        self.assertEqual(allocator.cache_for(17).object_size, 64)
+        self.assertIsNone(allocator.cache_for(65))
+
+if __name__ == '__main__':
+    unittest.main()
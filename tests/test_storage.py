@@ -0,0 +1,258 @@
+# tests/test_storage.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from modules.storage import DenseStorage, ExtentStorage, MemmapStorage, CompactStorage
+from modules.memory_simulator import MemorySimulator, AllocationStrategy
+
+class TestExtentStorage(unittest.TestCase):
+    def setUp(self):
+        self.storage = ExtentStorage(100)
+
+    def test_assign_and_window(self):
+        self.storage.assign(10, 5, 3)
+        window = self.storage.window(8, 18)
+        self.assertEqual(list(window), [0, 0, 3, 3, 3, 3, 3, 0, 0, 0])
+        self.assertEqual(self.storage.count_used(), 5)
+
+    def test_adjacent_same_owner_merges(self):
+        self.storage.assign(0, 10, 1)
+        self.storage.assign(10, 10, 1)
+        self.storage.assign(20, 10, 2)
+        self.assertEqual(list(self.storage), [(0, 20, 1), (20, 10, 2)])
+
+    def test_partial_clear_splits_extent(self):
+        self.storage.assign(0, 30, 1)
+        self.storage.clear(10, 10)
+        self.assertEqual(list(self.storage), [(0, 10, 1), (20, 10, 1)])
+        self.assertEqual(self.storage.count_used(), 20)
+
+    def test_matches_dense_storage(self):
+        rng = np.random.default_rng(3)
+        dense = DenseStorage(500)
+        storage = ExtentStorage(500)
+        for _ in range(300):
+            start, size, owner = int(rng.integers(500)), int(rng.integers(1, 40)), int(rng.integers(4))
+            if owner:
+                dense.assign(start, size, owner)
+                storage.assign(start, size, owner)
+            else:
+                dense.clear(start, size)
+                storage.clear(start, size)
+            self.assertEqual(storage.window(0, 500).tolist(), dense.window(0, 500).tolist())
+        self.assertEqual(storage.count_used(), dense.count_used())
+        self.assertEqual(storage.runs(0, 500), dense.runs(0, 500))
+
+    def test_extent_lookups_are_logarithmic(self):
+        # Every other unit is its own extent; locating one walks the
+        # start treap rather than shifting a sorted list
+        extents = 20_000
+        storage = ExtentStorage(2 * extents)
+        for start in range(0, 2 * extents, 2):
+            storage.assign(start, 1, 1 + start % 3)
+        self.assertEqual(len(storage), extents)
+        self.assertEqual(storage.owners_at([2 * extents - 2]).tolist(), [1 + (2 * extents - 2) % 3])
+        self.assertLess(storage._starts.visits, 4 * extents.bit_length())
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.storage = DenseStorage(10000)
+        self.storage.assign(0, 100, 1)
+
+    def test_view_is_read_only_and_live(self):
+        view = self.storage.view(0, 200)
+        with self.assertRaises(ValueError):
+            view[0] = 5
+        self.storage.assign(100, 50, 2)
+        self.assertEqual(view[120], 2)
+        self.assertTrue(self.storage.array.flags.writeable)
+
+    def test_snapshot_copies_only_written_chunks(self):
+        snapshot = self.storage.snapshot()
+        self.assertEqual(snapshot.nbytes, 0)
+        self.storage.assign(5000, 10, 3)
+        self.assertEqual(list(snapshot.chunks), [1])
+        self.assertEqual(snapshot.window(4999, 5002).tolist(), [0, 0, 0])
+        self.assertEqual(self.storage.window(4999, 5002).tolist(), [0, 3, 3])
+        self.assertEqual(snapshot.window(0, 2).tolist(), [1, 1])
+
+    def test_snapshots_share_saved_chunks_and_diff(self):
+        first = self.storage.snapshot()
+        second = self.storage.snapshot()
+        self.storage.clear(0, 10)
+        self.assertIs(first.chunks[0], second.chunks[0])
+        third = self.storage.snapshot()
+        self.storage.assign(9000, 3, 4)
+        self.assertEqual(first.diff(third).tolist(), list(range(10)))
+        self.assertEqual(third.diff().tolist(), [9000, 9001, 9002])
+        first.release()
+        self.storage.assign(20, 1, 7)
+        self.assertEqual(first.chunks, {})
+
+    def test_extent_snapshot(self):
+        storage = ExtentStorage(100)
+        storage.assign(0, 10, 1)
+        snapshot = storage.snapshot()
+        storage.clear(0, 10)
+        self.assertEqual(snapshot.window(0, 3).tolist(), [1, 1, 1])
+        self.assertEqual(snapshot.diff().tolist(), list(range(10)))
+        storage.assign(5, 10, 2)
+        later = storage.snapshot()
+        self.assertEqual(snapshot.diff(later).tolist(), list(range(15)))
+        self.assertEqual(later.diff().tolist(), [])
+
+class TestExtentBackedSimulator(unittest.TestCase):
+    def test_matches_dense_backend(self):
+        dense = MemorySimulator(total_memory=512, page_size=32)
+        extent = MemorySimulator(total_memory=512, page_size=32, storage="extent")
+        rng = np.random.default_rng(3)
+        for pid in range(1, 60):
+            size = int(rng.integers(1, 60))
+            for sim in (dense, extent):
+                if pid % 3 == 0:
+                    sim.allocate_pages(pid, size)
+                else:
+                    sim.allocate_segment(pid, size)
+                if pid % 4 == 0:
+                    sim.deallocate(pid - 2)
+        self.assertTrue(np.array_equal(dense.get_memory_state(), extent.get_memory_state()))
+        self.assertEqual(dense.free_blocks, extent.free_blocks)
+        self.assertEqual(dense.get_utilization(), extent.get_utilization())
+
+    def test_huge_address_space(self):
+        sim = MemorySimulator(total_memory=2**40, page_size=4096, storage="extent")
+        sim.set_strategy(AllocationStrategy.BEST_FIT)
+        self.assertTrue(sim.allocate_segment(1, 2**30)[0])
+        self.assertTrue(sim.allocate_pages(2, 10000)[0])
+        self.assertEqual(sim.processes[2][0], (2**30, 4096))
+        window = sim.get_memory_state(2**30 - 2, 2**30 + 2)
+        self.assertEqual(list(window), [1, 1, 2, 2])
+        sim.deallocate(1)
+        self.assertEqual(sim.free_blocks[0], (0, 2**30 - 1))
+
+class TestCompactStorage(unittest.TestCase):
+    def setUp(self):
+        self.storage = CompactStorage(4096)
+
+    def test_interns_arbitrary_pids(self):
+        self.storage.assign(0, 10, "P1")
+        self.storage.assign(10, 5, 1000000)
+        self.assertEqual(self.storage.array.dtype, np.uint8)
+        self.assertEqual(self.storage.window(8, 12).tolist(), ["P1", "P1", 1000000, 1000000])
+        self.assertEqual(self.storage.count_used(), 15)
+
+    def test_widens_and_narrows_with_live_owners(self):
+        starts = np.arange(300) * 10
+        self.storage.assign_many(starts, np.full(300, 10), np.arange(1, 301) * 7)
+        self.assertEqual(self.storage.array.dtype, np.uint16)
+        snapshot = self.storage.snapshot()
+        for pid in range(1, 251):
+            self.storage.clear(starts[pid - 1], 10)
+            self.storage.release_owner(pid * 7)
+        self.assertEqual(self.storage.array.dtype, np.uint8)
+        self.assertEqual(self.storage.window(2990, 2992).tolist(), [2100, 2100])
+        self.assertEqual(snapshot.window(0, 1).tolist(), [7])
+        self.assertEqual(len(snapshot.diff()), 2500)
+
+    def test_released_handles_are_reused(self):
+        self.storage.assign(0, 10, 5)
+        snapshot = self.storage.snapshot()
+        self.storage.clear(0, 10)
+        self.storage.release_owner(5)
+        self.storage.assign(0, 10, 6)
+        self.assertEqual(self.storage.array[0], 1)
+        self.assertEqual(snapshot.window(0, 1).tolist(), [5])
+        self.assertEqual(len(snapshot.diff()), 10)
+
+    def test_view_is_live_and_read_only(self):
+        view = self.storage.view(0, 100)
+        self.storage.assign(10, 5, "A")
+        self.assertEqual(view[12], "A")
+        with self.assertRaises(ValueError):
+            view[0] = 1
+        self.assertEqual(len(np.asarray(view)), 100)
+
+    def test_simulator_matches_dense_backend(self):
+        rng = np.random.default_rng(2)
+        dense = MemorySimulator(4096, 32, storage="dense")
+        compact = MemorySimulator(4096, 32)
+        ops = rng.integers(0, 3, 600)
+        pids = rng.integers(1, 400, 600)
+        sizes = rng.integers(1, 100, 600)
+        for sim in (dense, compact):
+            sim.apply_ops(ops[:300], pids[:300], sizes[:300])
+            for op, pid, size in zip(ops[300:], pids[300:], sizes[300:]):
+                if op == 2:
+                    sim.deallocate(int(pid))
+                else:
+                    sim.allocate_segment(int(pid), int(size))
+        self.assertTrue(np.array_equal(dense.memory, compact.memory))
+        self.assertEqual(len(compact._storage._handles), len(compact.processes))
+        with self.assertRaises(ValueError):
+            compact.memory[0] = 5
+        self.assertEqual(compact.memory[0], dense.memory[0])
+        runs = compact.get_memory_runs()
+        self.assertEqual(runs, dense.get_memory_runs())
+        self.assertEqual(sum(size for _, size, _ in runs), 4096)
+        pages = np.arange(0, 4096, 32)
+        self.assertTrue(np.array_equal(compact.get_owners_at(pages), dense.memory[pages]))
+
+    def test_runs_decode_one_value_per_run(self):
+        self.storage.assign(4, 6, "P1")
+        self.storage.assign(10, 2, "P2")
+        self.assertEqual(self.storage.runs(0, 16), [(0, 4, 0), (4, 6, "P1"), (10, 2, "P2"), (12, 4, 0)])
+        self.assertEqual(self.storage.owners_at([0, 5, 11]).tolist(), [0, "P1", "P2"])
+
+    def test_extent_runs_fill_gaps(self):
+        extent = ExtentStorage(100)
+        extent.assign(10, 20, 1)
+        extent.assign(30, 5, 2)
+        self.assertEqual(extent.runs(5, 40), [(5, 5, 0), (10, 20, 1), (30, 5, 2), (35, 5, 0)])
+        self.assertEqual(extent.owners_at([0, 12, 34, 99]).tolist(), [0, 1, 2, 0])
+
+class TestMemmapStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "memory.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_checkpoint_and_resume(self):
+        sim = MemorySimulator(total_memory=4096, page_size=64, storage=MemmapStorage(4096, self.path))
+        sim.set_strategy(AllocationStrategy.SLAB)
+        sim.allocate_segment(1, 300)
+        sim.allocate_pages(2, 100)
+        sim.allocate_segment(3, 12)
+        sim.allocate_segment(4, 12)
+        sim.deallocate(1)
+        sim.checkpoint()
+        expected = sim.get_memory_state().copy()
+        del sim
+
+        resumed = MemorySimulator.resume(self.path)
+        self.assertTrue(np.array_equal(resumed.get_memory_state(), expected))
+        self.assertEqual(resumed.strategy, AllocationStrategy.SLAB)
+        self.assertEqual(sorted(resumed.processes), [2, 3, 4])
+        self.assertTrue(resumed.allocate_segment(5, 300)[0])
+        self.assertEqual(resumed.processes[5], (0, 300))
+        resumed.deallocate(3)
+        resumed.deallocate(4)
+        self.assertEqual(resumed.get_slab_stats()[1]['objects_in_use'], 0)
+
+    def test_restore_state_rebuilds_storage(self):
+        sim = MemorySimulator(total_memory=1024, page_size=32)
+        sim.allocate_segment(1, 100)
+        sim.allocate_pages(2, 70)
+        copy = MemorySimulator(total_memory=1024, page_size=32)
+        copy.restore_state(sim.export_state())
+        self.assertTrue(np.array_equal(copy.get_memory_state(), sim.get_memory_state()))
+        self.assertEqual(copy.free_blocks, sim.free_blocks)
+
+    def test_checkpoint_requires_memmap(self):
+        with self.assertRaises(ValueError):
+            MemorySimulator(total_memory=64).checkpoint()
+
+if __name__ == '__main__':
+    unittest.main()
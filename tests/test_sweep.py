@@ -0,0 +1,61 @@
+# tests/test_sweep.py
+import os
+import tempfile
+import unittest
+from modules.memory_simulator import AllocationStrategy
+from modules.sweep import expand_grid, run_sweep, simulation_sources
+from modules.workload import generate_workload
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.workloads = {'small': generate_workload(200, seed=4, size_params={'low': 8, 'high': 64})}
+        self.strategies = [AllocationStrategy.FIRST_FIT, AllocationStrategy.BEST_FIT]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_expand_grid(self):
+        configs = expand_grid({'total_memory': [1024, 2048], 'page_size': [32]})
+        self.assertEqual(configs, [{'page_size': 32, 'total_memory': 1024},
+                                   {'page_size': 32, 'total_memory': 2048}])
+
+    def test_only_new_cells_are_computed(self):
+        grid = {'total_memory': [1024]}
+        first = run_sweep(grid, self.workloads, self.strategies, self.tmpdir.name, max_workers=2)
+        self.assertEqual([row['cached'] for row in first], [False, False])
+        self.assertEqual(len(os.listdir(self.tmpdir.name)), 2)
+
+        grid['total_memory'].append(2048)
+        second = run_sweep(grid, self.workloads, self.strategies, self.tmpdir.name, max_workers=2)
+        self.assertEqual([row['cached'] for row in second], [True, True, False, False])
+        self.assertEqual(second[0]['failure_rate'], first[0]['failure_rate'])
+        self.assertEqual(second[2]['total_memory'], 2048)
+        self.assertEqual(second[0]['workload'], 'small')
+
+    def test_added_parameter_reuses_default_cells(self):
+        run_sweep({'total_memory': [1024]}, self.workloads, self.strategies[:1], self.tmpdir.name, max_workers=1)
+        rows = run_sweep({'total_memory': [1024], 'page_size': [64, 128]}, self.workloads,
+                         self.strategies[:1], self.tmpdir.name, max_workers=1)
+        self.assertEqual([(row['page_size'], row['cached']) for row in rows], [(64, True), (128, False)])
+
+    def test_unknown_parameter_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run_sweep({'total_memory': [1024], 'pagesize': [64]}, self.workloads,
+                      self.strategies[:1], self.tmpdir.name, max_workers=1)
+
+    def test_version_covers_only_simulation_modules(self):
+        sources = simulation_sources()
+        self.assertIn('history', sources)
+        self.assertIn('compaction', sources)
+        self.assertNotIn('visualization', sources)
+        self.assertNotIn('benchmark', sources)
+
+    def test_changed_workload_misses_cache(self):
+        run_sweep({'total_memory': [1024]}, self.workloads, self.strategies[:1], self.tmpdir.name, max_workers=1)
+        other = {'small': generate_workload(200, seed=5, size_params={'low': 8, 'high': 64})}
+        rows = run_sweep({'total_memory': [1024]}, other, self.strategies[:1], self.tmpdir.name, max_workers=1)
+        self.assertFalse(rows[0]['cached'])
+
+if __name__ == '__main__':
+    unittest.main()
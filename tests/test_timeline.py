@@ -0,0 +1,66 @@
+# tests/test_timeline.py
+import json
+import unittest
+import numpy as np
+from modules.memory_simulator import MemorySimulator, AllocationStrategy
+from modules.timeline import Timeline
+
+def normalized(state):
+    state = json.loads(json.dumps(state))
+    for key in ('processes', 'requested', 'slabs', 'slab_objects'):
+        state[key] = sorted(state[key], key=str)
+    return state
+
+class TestTimeline(unittest.TestCase):
+    def setUp(self):
+        self.sim = MemorySimulator(total_memory=1024, page_size=32)
+        self.timeline = Timeline(self.sim, keyframe_interval=8)
+        self.states = [normalized(self.sim.export_state())]
+        self.memories = [self.sim.memory.copy()]
+        rng = np.random.default_rng(5)
+        for step in range(120):
+            self.sim.set_strategy(list(AllocationStrategy)[(step // 10) % 5])
+            pid = int(rng.integers(1, 30))
+            if step == 60:
+                self.sim.reset()
+            elif step % 25 == 0:
+                self.sim.compact()
+            elif pid in self.sim.processes:
+                self.sim.deallocate(pid)
+            elif step % 6 == 0:
+                self.sim.allocate_pages(pid, int(rng.integers(1, 90)))
+            else:
+                self.sim.allocate_segment(pid, int(rng.integers(1, 90)))
+            self.timeline.record(f"step {step}")
+            self.states.append(normalized(self.sim.export_state()))
+            self.memories.append(self.sim.memory.copy())
+
+    def test_every_step_reconstructs(self):
+        self.assertEqual(len(self.timeline), 121)
+        preview = MemorySimulator(total_memory=1024, page_size=32)
+        for step, state in enumerate(self.states):
+            self.assertEqual(normalized(self.timeline.state_at(step)), state)
+            self.timeline.restore(preview, step)
+            self.assertTrue(np.array_equal(preview.memory, self.memories[step]))
+
+    def test_keyframes_are_bounded(self):
+        steps = self.timeline._keyframe_steps
+        self.assertIn(61, steps)  # Reset forces a keyframe
+        self.assertTrue(all(later - earlier <= 8 for earlier, later in zip(steps, steps[1:])))
+        self.assertEqual(self.timeline.memory_usage()['keyframes'], len(steps))
+
+    def test_rewind_branches(self):
+        self.timeline.rewind(40)
+        self.assertEqual(len(self.timeline), 41)
+        self.assertEqual(normalized(self.sim.export_state()), self.states[40])
+        self.assertTrue(np.array_equal(self.sim.memory, self.memories[40]))
+        self.sim.set_strategy(AllocationStrategy.FIRST_FIT)
+        self.sim.allocate_segment(99, 5)
+        self.timeline.record("branch")
+        self.assertIn(99, dict((row[0], row) for row in self.timeline.state_at(-1)['processes']))
+        self.assertEqual(normalized(self.timeline.state_at(40)), self.states[40])
+        with self.assertRaises(IndexError):
+            self.timeline.state_at(42)
+
+if __name__ == '__main__':
+    unittest.main()
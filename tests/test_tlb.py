@@ -0,0 +1,55 @@
+# tests/test_tlb.py
+import unittest
+import numpy as np
+from modules.tlb import TLB, compare_page_sizes
+from modules.memory_simulator import MemorySimulator
+
+class TestTLB(unittest.TestCase):
+    def test_lru_eviction_within_set(self):
+        tlb = TLB(entries=2, associativity=2)
+        hits = tlb.lookup_many([1, 2, 1, 3, 2, 1], [10, 20, 10, 30, 20, 10])
+        self.assertEqual(hits.tolist(), [False, False, True, False, False, False])
+        self.assertEqual((tlb.hits, tlb.misses), (1, 5))
+
+    def test_sets_are_independent(self):
+        tlb = TLB(entries=4, associativity=1)
+        hits = tlb.lookup_many([0, 1, 2, 3, 0, 4, 1, 0], range(8))
+        # 0 and 4 collide in set 0; the others keep their sets
+        self.assertEqual(hits.tolist(), [False, False, False, False, True, False, True, False])
+
+    def test_repeated_pages_hit(self):
+        tlb = TLB(entries=8, replacement="random", seed=1)
+        hits = tlb.lookup_many([5, 5, 5, 6, 6, 5], [0] * 6)
+        self.assertEqual(hits.tolist(), [False, True, True, False, True, True])
+
+    def test_asids_do_not_share_entries(self):
+        tlb = TLB(entries=8)
+        tlb.lookup_many([1], [1], asid=1)
+        self.assertFalse(tlb.lookup_many([1], [1], asid=2)[0])
+        self.assertTrue(tlb.lookup_many([1], [1], asid=1)[0])
+        tlb.flush(asid=1)
+        self.assertFalse(tlb.lookup_many([1], [1], asid=1)[0])
+        self.assertTrue(tlb.lookup_many([1], [1], asid=2)[0])
+
+    def test_access_through_simulator_page_table(self):
+        sim = MemorySimulator(total_memory=1024, page_size=64)
+        sim.allocate_segment(1, 100)
+        sim.allocate_pages(2, 150)
+        table = sim.page_table(2)
+        self.assertEqual(table.tolist(), [2, 3, 4])
+        tlb = TLB(entries=4, hit_time=1, memory_time=100, walk_levels=2)
+        physical, hits = tlb.access([0, 65, 130, 10, 500], 64, table, asid=2)
+        self.assertEqual(physical.tolist(), [128, 193, 258, 138, -1])
+        self.assertEqual(hits.tolist(), [False, False, False, True, False])
+        self.assertAlmostEqual(tlb.hit_rate(), 20.0)
+        self.assertAlmostEqual(tlb.effective_access_time(), 0.2 * 101 + 0.8 * 301)
+        with self.assertRaises(ValueError):
+            sim.page_table(1)
+
+    def test_larger_pages_raise_hit_rate(self):
+        addresses = np.random.default_rng(0).integers(0, 1 << 16, 5000)
+        rows = compare_page_sizes(addresses, [256, 4096], entries=16)
+        self.assertLess(rows[0]['hit_rate'], rows[1]['hit_rate'])
+
+if __name__ == '__main__':
+    unittest.main()
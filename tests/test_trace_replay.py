@@ -0,0 +1,72 @@
+# tests/test_trace_replay.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from modules.memory_simulator import MemorySimulator, BatchOp
+from modules.trace_replay import read_trace, write_trace, replay, main
+
+class TestTraceReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ops = np.array([BatchOp.ALLOCATE, BatchOp.ALLOCATE_PAGES, BatchOp.DEALLOCATE,
+                             BatchOp.ALLOCATE, BatchOp.ALLOCATE], dtype=np.uint8)
+        self.pids = np.array([1, 2, 1, 3, 4])
+        self.sizes = np.array([64, 40, 0, 32, 500])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _roundtrip(self, name, binary):
+        path = os.path.join(self.tmpdir.name, name)
+        write_trace(path, [(self.ops, self.pids, self.sizes)], binary=binary)
+        chunks = list(read_trace(path, chunk_size=2))
+        self.assertEqual([len(ops) for ops, _, _ in chunks], [2, 2, 1])
+        ops, pids, sizes = (np.concatenate(parts) for parts in zip(*chunks))
+        self.assertTrue(np.array_equal(ops, self.ops))
+        self.assertTrue(np.array_equal(pids, self.pids))
+        self.assertTrue(np.array_equal(sizes, self.sizes))
+
+    def test_binary_roundtrip(self):
+        self._roundtrip("trace.bin", binary=True)
+
+    def test_csv_roundtrip(self):
+        self._roundtrip("trace.csv", binary=False)
+
+    def test_csv_without_header(self):
+        path = os.path.join(self.tmpdir.name, "plain.csv")
+        with open(path, "w") as file:
+            file.write("alloc,1,10\nfree,1\n0,2,5\n")
+        ops, pids, sizes = next(read_trace(path))
+        self.assertEqual(list(ops), [BatchOp.ALLOCATE, BatchOp.DEALLOCATE, BatchOp.ALLOCATE])
+        self.assertEqual(list(sizes), [10, 0, 5])
+
+    def test_csv_rejects_unknown_ops(self):
+        for line in ("7,1,10\n", "grow,1,10\n"):
+            path = os.path.join(self.tmpdir.name, "bad.csv")
+            with open(path, "w") as file:
+                file.write(line)
+            with self.assertRaises(ValueError):
+                next(read_trace(path))
+
+    def test_replay_samples(self):
+        sim = MemorySimulator(total_memory=256, page_size=32)
+        chunks = [(self.ops[:3], self.pids[:3], self.sizes[:3]),
+                  (self.ops[3:], self.pids[3:], self.sizes[3:])]
+        samples = list(replay(sim, chunks, sample_every=2))
+        self.assertEqual([s['ops'] for s in samples], [2, 4, 5])
+        self.assertEqual(samples[-1]['failures'], 1)
+        self.assertEqual(samples[-1]['utilization'], (64 + 32) / 256 * 100)
+        self.assertEqual(sorted(sim.processes), [2, 3])
+
+    def test_replay_rejects_non_positive_interval(self):
+        sim = MemorySimulator(total_memory=256, page_size=32)
+        with self.assertRaises(ValueError):
+            list(replay(sim, [(self.ops, self.pids, self.sizes)], sample_every=0))
+        path = os.path.join(self.tmpdir.name, "trace.bin")
+        write_trace(path, [(self.ops, self.pids, self.sizes)])
+        with self.assertRaises(SystemExit):
+            main([path, "--every", "0"])
+
+if __name__ == '__main__':
+    unittest.main()
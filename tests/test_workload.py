@@ -0,0 +1,40 @@
+# tests/test_workload.py
+import unittest
+import numpy as np
+from modules.memory_simulator import MemorySimulator, BatchOp
+from modules.workload import generate_workload, workload_chunks
+
+class TestWorkload(unittest.TestCase):
+    def test_every_process_allocated_then_freed(self):
+        ops, pids, sizes = generate_workload(1000, seed=1)
+        self.assertEqual(len(ops), 2000)
+        alloc_index = {pid: i for i, (op, pid) in enumerate(zip(ops, pids)) if op != BatchOp.DEALLOCATE}
+        free_index = {pid: i for i, (op, pid) in enumerate(zip(ops, pids)) if op == BatchOp.DEALLOCATE}
+        self.assertEqual(set(alloc_index), set(range(1, 1001)))
+        self.assertTrue(all(alloc_index[pid] < free_index[pid] for pid in alloc_index))
+        self.assertTrue(np.all(sizes[ops == BatchOp.DEALLOCATE] == 0))
+
+    def test_seeded_output_is_reproducible(self):
+        first = generate_workload(500, seed=42, lifetime='lognormal', size_distribution='lognormal')
+        second = generate_workload(500, seed=42, lifetime='lognormal', size_distribution='lognormal')
+        for a, b in zip(first, second):
+            self.assertTrue(np.array_equal(a, b))
+
+    def test_choice_sizes_and_paged_fraction(self):
+        ops, _, sizes = generate_workload(2000, seed=3, size_distribution='choice',
+                                          size_params={'sizes': [16, 64]}, paged_fraction=1.0)
+        allocs = ops != BatchOp.DEALLOCATE
+        self.assertEqual(set(sizes[allocs].tolist()), {16, 64})
+        self.assertTrue(np.all(ops[allocs] == BatchOp.ALLOCATE_PAGES))
+
+    def test_times_sorted_and_feeds_simulator(self):
+        ops, pids, sizes, times = generate_workload(300, seed=5, return_times=True)
+        self.assertTrue(np.all(np.diff(times) >= 0))
+        sim = MemorySimulator(total_memory=4096, page_size=64)
+        for chunk in workload_chunks((ops, pids, sizes), chunk_size=100):
+            sim.apply_ops(*chunk)
+        self.assertEqual(sim.processes, {})
+        self.assertEqual(sim.free_blocks, [(0, 4095)])
+
+if __name__ == '__main__':
+    unittest.main()